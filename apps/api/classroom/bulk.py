@@ -0,0 +1,228 @@
+import csv
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+from rest_framework import serializers
+
+from . import search
+from .cache import invalidate_on_commit
+from .models import Aluno, Matricula, Turma
+from .serializers import AlunoImportacaoSerializer, AlunoSerializer
+from .signals import DEPENDENCIAS, tocar
+
+BATCH_SIZE = 1000
+
+
+def ler_linhas(request):
+    """
+    Linhas de uma requisição em lote: lista JSON ou arquivo CSV (campo
+    `arquivo` em multipart/form-data, com cabeçalho).
+    """
+    arquivo = request.FILES.get("arquivo")
+    if arquivo is not None:
+        texto = io.TextIOWrapper(arquivo.file, encoding="utf-8-sig")
+        return list(csv.DictReader(texto))
+
+    if isinstance(request.data, list):
+        return request.data
+
+    raise serializers.ValidationError(
+        "Envie uma lista JSON ou um arquivo CSV no campo 'arquivo'."
+    )
+
+
+def _inteiro(valor):
+    try:
+        return int(valor)
+    except (TypeError, ValueError):
+        return None
+
+
+def matricular_em_lote(linhas):
+    """
+    Cria matrículas a partir de pares (aluno, turma).
+
+    Alunos, turmas e matrículas existentes são verificados com uma query cada,
+    e as novas matrículas são inseridas com `bulk_create` em lotes, dentro de
+    uma única transação. Retorna o resultado de cada linha.
+    """
+    pares = []
+    for linha in linhas:
+        if not isinstance(linha, dict):
+            pares.append((None, None))
+            continue
+        pares.append((_inteiro(linha.get("aluno")), _inteiro(linha.get("turma"))))
+
+    aluno_ids = {aluno for aluno, _ in pares if aluno is not None}
+    turma_ids = {turma for _, turma in pares if turma is not None}
+
+    alunos_existentes = set(
+        Aluno.objects.filter(id__in=aluno_ids).values_list("id", flat=True)
+    )
+    turmas_existentes = set(
+        Turma.objects.filter(id__in=turma_ids).values_list("id", flat=True)
+    )
+    ja_matriculados = set(
+        Matricula.objects.filter(
+            aluno_id__in=alunos_existentes, turma_id__in=turmas_existentes
+        ).values_list("aluno_id", "turma_id")
+    )
+
+    resultados = []
+    novas = []
+    for numero, (aluno, turma) in enumerate(pares, start=1):
+        resultado = {"linha": numero, "aluno": aluno, "turma": turma}
+
+        if aluno is None or turma is None:
+            resultado.update(status="erro", erro="Informe 'aluno' e 'turma'.")
+        elif aluno not in alunos_existentes:
+            resultado.update(status="erro", erro="Aluno não encontrado.")
+        elif turma not in turmas_existentes:
+            resultado.update(status="erro", erro="Turma não encontrada.")
+        elif (aluno, turma) in ja_matriculados:
+            resultado.update(
+                status="duplicado",
+                erro="Este aluno já está matriculado nesta turma.",
+            )
+        else:
+            resultado["status"] = "criado"
+            ja_matriculados.add((aluno, turma))
+            novas.append(Matricula(aluno_id=aluno, turma_id=turma))
+
+        resultados.append(resultado)
+
+    with transaction.atomic():
+        Matricula.objects.bulk_create(
+            novas, batch_size=BATCH_SIZE, ignore_conflicts=True
+        )
+        tocar(Turma, {matricula.turma_id for matricula in novas})
+
+    if novas:
+        invalidate_on_commit(*DEPENDENCIAS[Matricula])
+
+    return resultados
+
+
+def _hash_senhas(senhas, progresso=None):
+    """
+    Gera os hashes em paralelo. O PBKDF2 do `hashlib` (e o Argon2) liberam o
+    GIL, então um pool de threads usa todos os núcleos; um pool de processos
+    teria de iniciar outro ambiente Django (ou fazer fork do worker) a cada
+    importação.
+    """
+    hashes = []
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+        for numero, senha_hash in enumerate(pool.map(make_password, senhas), 1):
+            hashes.append(senha_hash)
+            if progresso and numero % BATCH_SIZE == 0:
+                progresso(numero, len(senhas))
+
+    return hashes
+
+
+def importar_alunos(linhas, progresso=None):
+    """
+    Cria usuários e alunos em lote.
+
+    Os e-mails do lote são verificados contra `User.username` e `Aluno.email`
+    com uma única query, as senhas padrão são geradas em paralelo e as
+    inserções usam `bulk_create` em lotes, dentro de uma única transação.
+    Retorna o resultado de cada linha.
+    """
+    linhas_validas = []
+    resultados = []
+    for numero, linha in enumerate(linhas, start=1):
+        serializer = AlunoImportacaoSerializer(data=linha)
+        if serializer.is_valid():
+            linhas_validas.append((numero, serializer.validated_data))
+        else:
+            resultados.append(
+                {"linha": numero, "status": "erro", "erro": serializer.errors}
+            )
+
+    emails = {dados["email"] for _, dados in linhas_validas}
+    existentes = set(
+        User.objects.filter(username__in=emails)
+        .order_by()
+        .values_list("username", flat=True)
+        .union(
+            Aluno.objects.filter(email__in=emails)
+            .order_by()
+            .values_list("email", flat=True)
+        )
+    )
+
+    novos = []
+    for numero, dados in linhas_validas:
+        resultado = {"linha": numero, "email": dados["email"]}
+        if dados["email"] in existentes:
+            resultado.update(
+                status="duplicado",
+                erro="Já existe um usuário/aluno com este e-mail.",
+            )
+        else:
+            resultado["status"] = "criado"
+            existentes.add(dados["email"])
+            novos.append(dados)
+
+        resultados.append(resultado)
+
+    resultados.sort(key=lambda resultado: resultado["linha"])
+
+    senhas = [AlunoSerializer._gerar_senha_padrao(dados["nome"]) for dados in novos]
+    hashes = _hash_senhas(senhas, progresso)
+
+    with transaction.atomic():
+        User.objects.bulk_create(
+            [
+                User(
+                    username=dados["email"],
+                    email=dados["email"],
+                    first_name=dados["nome"],
+                    password=senha_hash,
+                )
+                for dados, senha_hash in zip(novos, hashes)
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        user_ids = dict(
+            User.objects.filter(
+                username__in=[dados["email"] for dados in novos]
+            ).values_list("username", "id")
+        )
+        alunos = Aluno.objects.bulk_create(
+            [
+                Aluno(
+                    user_id=user_ids[dados["email"]],
+                    nome=dados["nome"],
+                    email=dados["email"],
+                    telefone=dados.get("telefone"),
+                )
+                for dados in novos
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        # `bulk_create` não dispara `post_save`
+        search.indexar(Aluno, alunos)
+
+    if novos:
+        invalidate_on_commit(*DEPENDENCIAS[Aluno])
+
+    return resultados
+
+
+def resumo(resultados):
+    contagem = {"criado": 0, "duplicado": 0, "erro": 0}
+    for resultado in resultados:
+        contagem[resultado["status"]] += 1
+
+    return {
+        "criados": contagem["criado"],
+        "duplicados": contagem["duplicado"],
+        "erros": contagem["erro"],
+        "resultados": resultados,
+    }
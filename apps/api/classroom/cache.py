@@ -0,0 +1,212 @@
+import functools
+import hashlib
+import threading
+import uuid
+from datetime import date
+
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+from rest_framework.response import Response
+
+from core import metrics
+
+CACHE_ALIAS = "classroom"
+
+
+class CacheStats:
+    """
+    Contadores do cache de respostas, por processo. Também são exportados
+    em `/metrics`, somados entre os workers.
+    """
+
+    campos = ("hits", "misses", "invalidations")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def incr(self, campo, valor=1):
+        with self._lock:
+            self._valores[campo] += valor
+        metrics.count_cache_event(campo, valor)
+
+    def reset(self):
+        with self._lock:
+            self._valores = dict.fromkeys(self.campos, 0)
+
+    def as_dict(self):
+        with self._lock:
+            return dict(self._valores)
+
+
+stats = CacheStats()
+
+
+def _generation_key(basename):
+    return f"classroom:gen:{basename}"
+
+
+def get_generation(basename):
+    """
+    Geração atual das respostas de um endpoint.
+
+    A geração é um token aleatório: se for removida pelo LRU, a próxima
+    leitura cria um token novo e as entradas antigas deixam de ser usadas.
+    """
+    cache = caches[CACHE_ALIAS]
+    key = _generation_key(basename)
+
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, uuid.uuid4().hex, timeout=None)
+        generation = cache.get(key)
+
+    return generation
+
+
+async def aget_generation(basename):
+    """
+    Versão assíncrona de `get_generation`.
+    """
+    cache = caches[CACHE_ALIAS]
+    key = _generation_key(basename)
+
+    generation = await cache.aget(key)
+    if generation is None:
+        await cache.aadd(key, uuid.uuid4().hex, timeout=None)
+        generation = await cache.aget(key)
+
+    return generation
+
+
+def invalidate(*basenames):
+    """
+    Invalida todas as respostas em cache dos endpoints informados.
+    """
+    caches[CACHE_ALIAS].set_many(
+        {_generation_key(basename): uuid.uuid4().hex for basename in basenames},
+        timeout=None,
+    )
+    stats.incr("invalidations", len(basenames))
+
+
+def invalidate_on_commit(*basenames):
+    """
+    `invalidate` depois do commit da transação atual (na hora, fora de uma).
+    Antes do commit, uma leitura concorrente ainda veria os dados antigos e
+    os guardaria sob a geração nova.
+    """
+    transaction.on_commit(functools.partial(invalidate, *basenames))
+
+
+def _response_cache_key(request, basename, generation):
+    if request.user.is_staff:
+        papel, usuario = "staff", "*"
+    else:
+        # A visibilidade dos recursos para o aluno depende da data
+        papel, usuario = "aluno", f"{request.user.pk}:{date.today()}"
+
+    url = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+
+    return f"classroom:resp:{basename}:{generation}:{papel}:{usuario}:{url}"
+
+
+def response_cache_key(request, basename):
+    """
+    Chave da resposta: endpoint, geração, papel do usuário, usuário e data
+    (alunos) e URL completa com query string.
+    """
+    return _response_cache_key(request, basename, get_generation(basename))
+
+
+async def aresponse_cache_key(request, basename):
+    return _response_cache_key(request, basename, await aget_generation(basename))
+
+
+class CachedResponseMixin:
+    """
+    Cache de respostas para `list` e `retrieve` dos ViewSets.
+
+    As entradas vivem no cache `classroom` (LRU com TTL, ver `CACHES`) e são
+    invalidadas pelos sinais de `classroom/signals.py`.
+
+    Os validadores da resposta (ETag, Last-Modified, ver `ConditionalGetMixin`
+    depois no MRO) ficam junto dos dados: num acerto, um `If-None-Match` que
+    ainda vale responde 304 sem ir ao banco.
+    """
+
+    def list(self, request, *args, **kwargs):
+        return self._cached_response(super().list, request, *args, **kwargs)
+
+    async def alist(self, request, *args, **kwargs):
+        return await self._acached_response(super().alist, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._cached_response(super().retrieve, request, *args, **kwargs)
+
+    def _cached_response(self, handler, request, *args, **kwargs):
+        cache = caches[CACHE_ALIAS]
+        key = response_cache_key(request, self.basename)
+
+        entrada = cache.get(key)
+        if entrada is not None:
+            stats.incr("hits")
+            return _resposta_em_cache(request, entrada)
+
+        stats.incr("misses")
+        response = handler(request, *args, **kwargs)
+
+        if response.status_code == 200:
+            cache.set(key, _entrada(response))
+
+        return response
+
+    async def _acached_response(self, handler, request, *args, **kwargs):
+        """
+        Versão assíncrona de `_cached_response`, para handlers assíncronos.
+        """
+        cache = caches[CACHE_ALIAS]
+        key = await aresponse_cache_key(request, self.basename)
+
+        entrada = await cache.aget(key)
+        if entrada is not None:
+            stats.incr("hits")
+            return _resposta_em_cache(request, entrada)
+
+        stats.incr("misses")
+        response = await handler(request, *args, **kwargs)
+
+        if response.status_code == 200:
+            await cache.aset(key, _entrada(response))
+
+        return response
+
+
+CABECALHOS_EM_CACHE = ("ETag", "Last-Modified", "Cache-Control")
+
+
+def _entrada(response):
+    cabecalhos = {
+        nome: response[nome] for nome in CABECALHOS_EM_CACHE if nome in response
+    }
+    return {"data": response.data, "cabecalhos": cabecalhos}
+
+
+def _resposta_em_cache(request, entrada):
+    cabecalhos = entrada["cabecalhos"]
+
+    response = None
+    if "ETag" in cabecalhos:
+        response = get_conditional_response(
+            request,
+            etag=cabecalhos["ETag"],
+            last_modified=parse_http_date_safe(cabecalhos.get("Last-Modified", "")),
+        )
+    if response is None:
+        response = Response(entrada["data"])
+
+    for nome, valor in cabecalhos.items():
+        response[nome] = valor
+    return response
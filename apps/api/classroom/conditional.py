@@ -0,0 +1,164 @@
+import functools
+import hashlib
+from datetime import date
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+from .serializers.sparse import EXPAND_PARAM, FIELDS_PARAM
+
+
+class ConditionalGetMixin:
+    """
+    ETag em `list` (e no `alist`, com `AsyncListMixin`) e ETag e
+    Last-Modified em `retrieve`. Se o `If-None-Match` ainda vale, a resposta
+    é `304 Not Modified`, sem chamar o handler nem serializar nada.
+
+    No detalhe o validador é um agregado barato da linha pelo pk: `Count` e
+    `Max` de cada campo de `etag_fields` (o `atualizado_em` do modelo e dos
+    relacionados exibidos).
+
+    Na listagem o validador são o pk e os `etag_fields` das linhas da página
+    pedida (a mesma consulta com `LIMIT` da paginação, sem agregado sobre a
+    queryset filtrada inteira). Com `CachedResponseMixin` antes no MRO, um
+    acerto do cache responde com o ETag guardado e nem chega aqui.
+    """
+
+    etag_fields = ("atualizado_em",)
+
+    def get_etag_queryset(self):
+        """
+        Queryset do validador: a mesma da view, sem anotações caras.
+        """
+        return self.get_queryset()
+
+    def list(self, request, *args, **kwargs):
+        linhas = self._linhas_da_pagina()
+        return self._etag_response(
+            {"pagina": _hash_linhas(linhas)},
+            functools.partial(super().list, request, *args, **kwargs),
+        )
+
+    async def alist(self, request, *args, **kwargs):
+        linhas = [linha async for linha in self._linhas_da_pagina()]
+
+        etag = self._etag({"pagina": _hash_linhas(linhas)})
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = await super().alist(request, *args, **kwargs)
+
+        return _cabecalhos(response, etag, None)
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_etag_queryset())
+
+        try:
+            validador = queryset.filter(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            ).aggregate(**_agregados(self.etag_fields))
+        except (TypeError, ValueError, ValidationError):
+            validador = None
+
+        handler = functools.partial(super().retrieve, request, *args, **kwargs)
+        if not validador or not validador["total"]:
+            # Inexistente (ou id inválido): o handler responde o 404
+            return handler()
+
+        return self._conditional_response(validador, handler)
+
+    def etag_response(self, queryset, campos, handler):
+        """
+        Resposta de `handler()` (uma listagem de `queryset`) com ETag sobre
+        `Count` e `Max` de `campos`, ou 304 sem chamar o handler; usada nas
+        actions de listagem, como `/turmas/{id}/recursos/`, em que a
+        queryset já vem restrita pelo índice do pai.
+        """
+        return self._etag_response(queryset.aggregate(**_agregados(campos)), handler)
+
+    def _linhas_da_pagina(self):
+        queryset = self.filter_queryset(self.get_etag_queryset())
+
+        # Paginador próprio: o da view ainda vai paginar a resposta
+        pagina = None
+        if self.pagination_class is not None:
+            pagina = self.pagination_class()._page_queryset(
+                queryset, self.request, self
+            )
+
+        if pagina is None:
+            pagina = queryset
+        return pagina.values_list("pk", *self.etag_fields)
+
+    def _etag_response(self, validador, handler):
+        # Só ETag: uma exclusão muda o validador, mas não o `Max(atualizado_em)`
+        # que iria no Last-Modified
+        etag = self._etag(validador)
+        response = get_conditional_response(self.request, etag=etag) or handler()
+        return _cabecalhos(response, etag, None)
+
+    def _conditional_response(self, validador, handler):
+        etag, ultima = self._etag(validador), _ultima_alteracao(validador)
+
+        response = get_conditional_response(
+            self.request, etag=etag, last_modified=ultima
+        )
+        if response is None:
+            response = handler()
+
+        return _cabecalhos(response, etag, ultima)
+
+    def _etag(self, validador):
+        request = self.request
+        if request.user.is_staff:
+            papel, usuario = "staff", "*"
+        else:
+            # A visibilidade dos recursos para o aluno depende da data
+            papel, usuario = "aluno", f"{request.user.pk}:{date.today()}"
+
+        partes = [
+            self.basename,
+            papel,
+            usuario,
+            request.accepted_renderer.format,
+            # Cada seleção de campos é outra representação
+            request.query_params.get(FIELDS_PARAM, ""),
+            request.query_params.get(EXPAND_PARAM, ""),
+            *(str(validador[chave]) for chave in sorted(validador)),
+        ]
+        return quote_etag(hashlib.md5(":".join(partes).encode()).hexdigest())
+
+
+def _hash_linhas(linhas):
+    conteudo = "|".join(":".join(map(str, linha)) for linha in linhas)
+    return hashlib.md5(conteudo.encode()).hexdigest()
+
+
+def _agregados(campos):
+    agregados = {"total": Count("pk")}
+    for campo in campos:
+        agregados[f"max_{campo}"] = Max(campo)
+    return agregados
+
+
+def _ultima_alteracao(validador):
+    datas = [
+        valor
+        for chave, valor in validador.items()
+        if chave.startswith("max_") and valor is not None
+    ]
+    # Em segundos, a precisão do HTTP-date
+    return int(max(datas).timestamp()) if datas else None
+
+
+def _cabecalhos(response, etag, ultima):
+    if response.status_code in (200, 304):
+        response["ETag"] = etag
+        if ultima is not None:
+            response["Last-Modified"] = http_date(ultima)
+        # Resposta por usuário, sempre revalidada
+        patch_cache_control(response, private=True, no_cache=True)
+
+    return response
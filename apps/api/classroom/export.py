@@ -0,0 +1,126 @@
+import csv
+import json
+
+from django.conf import settings
+from django.db.models import F
+from django.http import StreamingHttpResponse
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+CHUNK_SIZE = 2000
+
+CAMPOS_MATRICULA = [
+    "id",
+    "aluno_id",
+    "aluno_nome",
+    "aluno_email",
+    "turma_id",
+    "turma_nome",
+    "treinamento_nome",
+    "data_matricula",
+]
+
+# Alunos exportam as matrículas das próprias turmas: sem o e-mail dos colegas
+CAMPOS_MATRICULA_ALUNO = [campo for campo in CAMPOS_MATRICULA if campo != "aluno_email"]
+
+ANOTACOES_MATRICULA = {
+    "aluno_nome": F("aluno__nome"),
+    "aluno_email": F("aluno__email"),
+    "turma_nome": F("turma__nome"),
+    "treinamento_nome": F("turma__treinamento__nome"),
+}
+
+FORMATOS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+class _Echo:
+    """
+    Buffer que apenas devolve o que é escrito, para o `csv.writer`.
+    """
+
+    def write(self, value):
+        return value
+
+
+def _valores(queryset, campos):
+    anotacoes = {
+        campo: expressao
+        for campo, expressao in ANOTACOES_MATRICULA.items()
+        if campo in campos
+    }
+    return queryset.order_by("id").values(
+        "id", "aluno_id", "turma_id", "data_matricula", **anotacoes
+    )
+
+
+def _linha(row, campos, data_hora):
+    row["data_matricula"] = data_hora.to_representation(row["data_matricula"])
+    return {campo: row[campo] for campo in campos}
+
+
+def _linhas(queryset, campos):
+    data_hora = serializers.DateTimeField()
+    for row in _valores(queryset, campos).iterator(chunk_size=CHUNK_SIZE):
+        yield _linha(row, campos, data_hora)
+
+
+async def _alinhas(queryset, campos):
+    # `aiterator` lê um bloco de `CHUNK_SIZE` linhas por vez numa thread
+    data_hora = serializers.DateTimeField()
+    async for row in _valores(queryset, campos).aiterator(chunk_size=CHUNK_SIZE):
+        yield _linha(row, campos, data_hora)
+
+
+def _csv(campos):
+    writer = csv.writer(_Echo())
+    return writer.writerow(campos), lambda row: writer.writerow(row.values())
+
+
+def _ndjson(campos):
+    return None, lambda row: json.dumps(row, ensure_ascii=False) + "\n"
+
+
+def _conteudo(rows, cabecalho, formatar):
+    if cabecalho is not None:
+        yield cabecalho
+    for row in rows:
+        yield formatar(row)
+
+
+async def _aconteudo(rows, cabecalho, formatar):
+    if cabecalho is not None:
+        yield cabecalho
+    async for row in rows:
+        yield formatar(row)
+
+
+FORMATADORES = {"csv": _csv, "ndjson": _ndjson}
+
+
+def exportar_matriculas(request, queryset, nome_arquivo):
+    """
+    Exporta matrículas em CSV ou NDJSON (`?formato=`) via streaming.
+
+    As linhas vêm de `.values()` com `.iterator()` (cursor do lado do servidor
+    no PostgreSQL), então o uso de memória não depende do tamanho do export.
+    Com `ASYNC_VIEWS` (ASGI) o corpo é um iterador assíncrono sobre
+    `.aiterator()`: um iterador síncrono seria lido inteiro para a memória
+    pelo Django antes do envio. O e-mail do aluno só sai para o staff.
+    """
+    formato = request.query_params.get("formato", "csv")
+    if formato not in FORMATOS:
+        raise ValidationError({"formato": f"Use um de: {', '.join(FORMATOS)}."})
+
+    campos = CAMPOS_MATRICULA if request.user.is_staff else CAMPOS_MATRICULA_ALUNO
+    cabecalho, formatar = FORMATADORES[formato](campos)
+    if settings.ASYNC_VIEWS:
+        conteudo = _aconteudo(_alinhas(queryset, campos), cabecalho, formatar)
+    else:
+        conteudo = _conteudo(_linhas(queryset, campos), cabecalho, formatar)
+
+    response = StreamingHttpResponse(conteudo, content_type=FORMATOS[formato])
+    response["Content-Disposition"] = f'attachment; filename="{nome_arquivo}.{formato}"'
+    return response
@@ -0,0 +1,36 @@
+from rest_framework.filters import BaseFilterBackend, OrderingFilter
+
+
+class QueryParamFilter(BaseFilterBackend):
+    """
+    Filtros declarados em `view.filter_serializer_class`: cada campo é um
+    lookup do ORM (`treinamento` com `source="treinamento_id"`,
+    `data_inicio__gte`, ...) e os valores validados viram
+    `queryset.filter(**validated_data)`. Parâmetro inválido responde 400.
+
+    Toda combinação aceita tem índice (ver `IndicesTests` em `classroom/tests.py`).
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        serializer_class = getattr(view, "filter_serializer_class", None)
+        if serializer_class is None:
+            return queryset
+
+        # Dicionário simples: num `QueryDict` o DRF lê o booleano ausente
+        # como `False` (checkbox de formulário)
+        parametros = serializer_class(data=request.query_params.dict())
+        parametros.is_valid(raise_exception=True)
+        return queryset.filter(**parametros.validated_data)
+
+
+class IndexedOrderingFilter(OrderingFilter):
+    """
+    `?ordering=` com um campo de `view.ordering_fields` (`-campo` para
+    decrescente). Só o primeiro campo vale: os índices cobrem um campo mais o
+    `id` do desempate da paginação. Campos fora da lista são ignorados, como
+    no `OrderingFilter`.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        return ordering[:1] if ordering else None
@@ -0,0 +1,669 @@
+import json
+import statistics
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from pathlib import Path
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.cache import cache, caches
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.runner import DiscoverRunner
+from django.test.utils import (
+    CaptureQueriesContext,
+    override_settings,
+    setup_test_environment,
+)
+from django.urls import URLPattern, URLResolver, get_resolver
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from classroom import search
+from classroom.cache import CACHE_ALIAS
+from classroom.models import Aluno, Matricula, Recurso, Treinamento, Turma
+from core.views.auth import AccessTokenOnlySerializer
+
+SENHA = "Senha@Benchmark123"
+BATCH_SIZE = 5000
+
+# Diferença absoluta abaixo da qual uma piora é tratada como ruído
+FOLGA = {"p95_ms": 2.0, "memoria_kb": 64.0}
+
+# Volume com `--escala 1` (o padrão)
+VOLUME = {
+    "treinamentos": 100,
+    "turmas": 2000,
+    "alunos": 50000,
+    "matriculas_por_aluno": 10,
+    "recursos_por_turma": 50,
+}
+
+
+@dataclass
+class Caso:
+    """
+    Uma requisição medida. `consultas` é o número exato de queries esperado
+    por papel (`staff`/`aluno`); papéis ausentes não são exercitados.
+    """
+
+    rota: str
+    metodo: str
+    url: str
+    consultas: dict
+    status: dict = field(default_factory=lambda: {"staff": 200, "aluno": 200})
+    dados: object = None
+    repeticoes: int = None
+
+    @property
+    def nome(self):
+        return f"{self.metodo} {self.rota}"
+
+
+def _casos(ids):
+    """
+    Casos de todas as rotas de `core/urls.py` e `classroom/urls.py`, com os
+    ids do conjunto de dados gerado.
+    """
+    turma, treinamento = ids["turma"], ids["treinamento"]
+    aluno, matricula, recurso = ids["aluno"], ids["matricula"], ids["recurso"]
+    outra_turma = ids["outra_turma"]
+    proibido = {"staff": 201, "aluno": 403}
+    desde = date.today() - timedelta(days=30)
+
+    casos = [
+        # core/urls.py
+        Caso(
+            "token_obtain_pair",
+            "POST",
+            "/api/auth/token",
+            {"staff": 2, "aluno": 2},
+            dados={"username": ids["username"], "password": SENHA},
+        ),
+        Caso("is_admin", "GET", "/api/auth/is-admin", {"staff": 0, "aluno": 0}),
+        # classroom/urls.py
+        Caso("api-root", "GET", "/api/", {"staff": 0, "aluno": 0}),
+        Caso("search", "GET", "/api/search/?q=turma", {"staff": 3, "aluno": 3}),
+        # Versão, aluno, matrículas, turmas e recursos, qualquer que seja o total
+        # de turmas
+        Caso(
+            "dashboard",
+            "GET",
+            "/api/me/dashboard",
+            {"staff": 1, "aluno": 5},
+            status={"staff": 404, "aluno": 200},
+        ),
+        Caso(
+            "cache_stats",
+            "GET",
+            "/api/cache/stats",
+            {"staff": 0, "aluno": 0},
+            status={"staff": 200, "aluno": 403},
+        ),
+        Caso("aluno-list", "GET", "/api/alunos/", {"staff": 1, "aluno": 1}),
+        Caso(
+            "aluno-list",
+            "POST",
+            "/api/alunos/",
+            {"staff": 6, "aluno": 0},
+            status=proibido,
+            dados={"nome": "Aluno Novo", "email": "novo@bench.local"},
+            repeticoes=5,
+        ),
+        Caso(
+            "aluno-importar",
+            "POST",
+            "/api/alunos/importar/",
+            {"staff": 5},
+            status={"staff": 200},
+            dados=[
+                {"nome": f"Importado {i}", "email": f"importado{i}@bench.local"}
+                for i in range(20)
+            ],
+            repeticoes=3,
+        ),
+        Caso("aluno-list", "GET", "/api/alunos/?q=aluno", {"staff": 1, "aluno": 1}),
+        Caso("aluno-detail", "GET", f"/api/alunos/{aluno}/", {"staff": 1, "aluno": 1}),
+        Caso(
+            "aluno-detail",
+            "PATCH",
+            f"/api/alunos/{aluno}/",
+            {"staff": 3},
+            status={"staff": 200},
+            dados={"telefone": "11999999999"},
+        ),
+        Caso(
+            "aluno-detail",
+            "DELETE",
+            f"/api/alunos/{aluno}/",
+            # + o UPDATE das turmas no `on_commit`, fora da transação medida
+            {"staff": 11},
+            status={"staff": 204},
+        ),
+        Caso(
+            "aluno-matriculas",
+            "GET",
+            f"/api/alunos/{aluno}/matriculas/",
+            {"staff": 2, "aluno": 2},
+        ),
+        # Listagens com ETag: o validador (pk e `atualizado_em` das linhas da
+        # página) e a página
+        Caso("treinamento-list", "GET", "/api/treinamentos/", {"staff": 2, "aluno": 2}),
+        Caso(
+            "treinamento-list",
+            "POST",
+            "/api/treinamentos/",
+            {"staff": 1, "aluno": 0},
+            status=proibido,
+            dados={"nome": "Treinamento Novo"},
+        ),
+        Caso(
+            "treinamento-detail",
+            "GET",
+            f"/api/treinamentos/{treinamento}/",
+            {"staff": 2, "aluno": 2},
+        ),
+        # Com a leitura do nome anterior (turmas tocadas só se ele mudar)
+        Caso(
+            "treinamento-detail",
+            "PATCH",
+            f"/api/treinamentos/{treinamento}/",
+            {"staff": 3},
+            status={"staff": 200},
+            dados={"descricao": "Atualizado"},
+        ),
+        Caso(
+            "treinamento-turmas",
+            "GET",
+            f"/api/treinamentos/{treinamento}/turmas/",
+            {"staff": 2, "aluno": 2},
+        ),
+        Caso("turma-list", "GET", "/api/turmas/", {"staff": 2, "aluno": 2}),
+        Caso(
+            "turma-list",
+            "POST",
+            "/api/turmas/",
+            {"staff": 4, "aluno": 0},
+            status=proibido,
+            dados={
+                "treinamento": treinamento,
+                "nome": "Turma Nova",
+                "data_inicio": "2030-01-01",
+            },
+        ),
+        Caso("turma-list", "GET", "/api/turmas/?q=turma", {"staff": 2, "aluno": 2}),
+        Caso(
+            "turma-list",
+            "GET",
+            f"/api/turmas/?treinamento={treinamento}&data_inicio__gte={desde}"
+            "&ordering=nome",
+            {"staff": 2, "aluno": 2},
+        ),
+        # Só id e nome (listas de seleção): sem o JOIN e sem `total_alunos`
+        Caso(
+            "turma-list", "GET", "/api/turmas/?fields=id,nome", {"staff": 2, "aluno": 2}
+        ),
+        Caso("turma-detail", "GET", f"/api/turmas/{turma}/", {"staff": 2, "aluno": 3}),
+        Caso(
+            "turma-detail",
+            "PATCH",
+            f"/api/turmas/{turma}/",
+            {"staff": 5},
+            status={"staff": 200},
+            dados={"link_acesso": "https://example.com/aula"},
+        ),
+        Caso(
+            "turma-alunos",
+            "GET",
+            f"/api/turmas/{turma}/alunos/",
+            {"staff": 2, "aluno": 3},
+        ),
+        Caso(
+            "turma-exportar-alunos",
+            "GET",
+            f"/api/turmas/{turma}/alunos/exportar/",
+            {"staff": 2, "aluno": 3},
+        ),
+        Caso(
+            "turma-recursos",
+            "GET",
+            f"/api/turmas/{turma}/recursos/",
+            {"staff": 3, "aluno": 4},
+        ),
+        Caso("matricula-list", "GET", "/api/matriculas/", {"staff": 1, "aluno": 1}),
+        Caso(
+            "matricula-list",
+            "GET",
+            f"/api/matriculas/?turma={turma}&data_matricula__gte={desde}"
+            "&ordering=data_matricula",
+            {"staff": 1, "aluno": 1},
+        ),
+        Caso(
+            "matricula-list",
+            "GET",
+            "/api/matriculas/?fields=id,data_matricula&expand=turma",
+            {"staff": 1, "aluno": 1},
+        ),
+        Caso(
+            "matricula-list",
+            "POST",
+            "/api/matriculas/",
+            {"staff": 6, "aluno": 0},
+            status=proibido,
+            dados={"aluno": aluno, "turma": outra_turma},
+        ),
+        Caso(
+            "matricula-exportar",
+            "GET",
+            "/api/matriculas/exportar/",
+            {"staff": 1, "aluno": 1},
+            repeticoes=3,
+        ),
+        Caso(
+            "matricula-lote",
+            "POST",
+            "/api/matriculas/lote/",
+            {"staff": 5, "aluno": 0},
+            status={"staff": 200, "aluno": 403},
+            dados=[{"aluno": aluno, "turma": t} for t in ids["turmas_lote"]],
+        ),
+        Caso(
+            "matricula-detail",
+            "GET",
+            f"/api/matriculas/{matricula}/",
+            {"staff": 1, "aluno": 1},
+        ),
+        Caso(
+            "matricula-detail",
+            "DELETE",
+            f"/api/matriculas/{matricula}/",
+            {"staff": 4},
+            status={"staff": 204},
+        ),
+        Caso("recurso-list", "GET", "/api/recursos/", {"staff": 2, "aluno": 2}),
+        Caso(
+            "recurso-list",
+            "POST",
+            "/api/recursos/",
+            {"staff": 3, "aluno": 0},
+            status=proibido,
+            dados={"turma": turma, "tipo": "PDF", "nome": "Recurso Novo"},
+        ),
+        Caso(
+            "recurso-list", "GET", "/api/recursos/?q=recurso", {"staff": 2, "aluno": 2}
+        ),
+        Caso(
+            "recurso-list",
+            "GET",
+            f"/api/recursos/?turma={turma}&tipo=VIDEO&draft=false",
+            {"staff": 2, "aluno": 2},
+        ),
+        Caso(
+            "recurso-list",
+            "GET",
+            "/api/recursos/?fields=id,nome,tipo",
+            {"staff": 2, "aluno": 2},
+        ),
+        # Sincronização incremental sem alterações desde o cursor
+        Caso(
+            "recurso-changes",
+            "GET",
+            f"/api/recursos/changes/?{urlencode({'since': timezone.now().isoformat()})}",
+            {"staff": 2, "aluno": 4},
+        ),
+        Caso(
+            "recurso-detail",
+            "GET",
+            f"/api/recursos/{recurso}/",
+            {"staff": 2, "aluno": 3},
+        ),
+        # Sem a `descricao` (`.defer()`) e sem o JOIN da turma para o staff
+        Caso(
+            "recurso-detail",
+            "GET",
+            f"/api/recursos/{recurso}/?fields=id,nome",
+            {"staff": 2, "aluno": 3},
+        ),
+        Caso(
+            "recurso-detail",
+            "DELETE",
+            f"/api/recursos/{recurso}/",
+            {"staff": 4},
+            status={"staff": 204},
+        ),
+    ]
+
+    if settings.METRICS_ENABLED:
+        casos.append(Caso("metrics", "GET", "/metrics", {"staff": 0, "aluno": 0}))
+
+    return casos
+
+
+def _rotas(resolver=None):
+    """
+    Nomes de todas as rotas da API (exceto o admin do Django).
+    """
+    nomes = set()
+    for padrao in (resolver or get_resolver()).url_patterns:
+        if isinstance(padrao, URLResolver):
+            if padrao.app_name != "admin":
+                nomes |= _rotas(padrao)
+        elif isinstance(padrao, URLPattern) and padrao.name:
+            nomes.add(padrao.name)
+    return nomes
+
+
+def _percentil(valores, p):
+    ordenados = sorted(valores)
+    indice = min(len(ordenados) - 1, round(p / 100 * (len(ordenados) - 1)))
+    return ordenados[indice]
+
+
+class Command(BaseCommand):
+    help = (
+        "Popula um banco de teste com um volume realista, exercita todas as "
+        "rotas da API como admin e como aluno, confere o número de queries de "
+        "cada uma e compara p50/p95 e pico de memória com um baseline JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--escala",
+            type=float,
+            default=1.0,
+            help="Fração do volume padrão (50k alunos, 500k matrículas...)",
+        )
+        parser.add_argument("--repeticoes", type=int, default=20)
+        parser.add_argument("--baseline", default="benchmark_baseline.json")
+        parser.add_argument(
+            "--atualizar-baseline",
+            action="store_true",
+            help="Grava os resultados desta execução como novo baseline",
+        )
+        parser.add_argument(
+            "--tolerancia",
+            type=float,
+            default=0.25,
+            help="Piora relativa de p95/memória aceita em relação ao baseline",
+        )
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        runner = DiscoverRunner(verbosity=0, interactive=False)
+        bancos = runner.setup_databases()
+        try:
+            ids = self._popular(options["escala"])
+            # /metrics aberto: mede a coleta, não a recusa sem o token
+            with override_settings(METRICS_TOKEN="", METRICS_PUBLIC=True):
+                resultados, falhas = self._medir(ids, options["repeticoes"])
+        finally:
+            runner.teardown_databases(bancos)
+
+        falhas += self._comparar(resultados, options)
+
+        if falhas:
+            for falha in falhas:
+                self.stdout.write(self.style.ERROR(falha))
+            raise CommandError(f"{len(falhas)} falha(s) no benchmark.")
+
+        self.stdout.write(self.style.SUCCESS("Benchmark sem regressões."))
+
+    def _popular(self, escala):
+        volume = {
+            chave: max(1, round(valor * escala)) for chave, valor in VOLUME.items()
+        }
+        volume["matriculas_por_aluno"] = VOLUME["matriculas_por_aluno"]
+        volume["recursos_por_turma"] = VOLUME["recursos_por_turma"]
+        self.stdout.write(f"Populando: {volume}")
+        inicio = time.perf_counter()
+
+        hoje = date.today()
+        senha_hash = make_password(SENHA)
+
+        Treinamento.objects.bulk_create(
+            [
+                Treinamento(nome=f"Treinamento {i}", descricao="Benchmark")
+                for i in range(volume["treinamentos"])
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        treinamento_ids = list(
+            Treinamento.objects.order_by("id").values_list("id", flat=True)
+        )
+
+        Turma.objects.bulk_create(
+            [
+                Turma(
+                    treinamento_id=treinamento_ids[i % len(treinamento_ids)],
+                    nome=f"Turma {i}",
+                    data_inicio=hoje + timedelta(days=i % 120 - 60),
+                    data_conclusao=hoje + timedelta(days=i % 120 + 30),
+                    link_acesso=f"https://example.com/turma/{i}",
+                )
+                for i in range(volume["turmas"])
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        turma_ids = list(Turma.objects.order_by("id").values_list("id", flat=True))
+
+        User.objects.create_user(
+            "admin@bench.local", password=SENHA, is_staff=True, is_superuser=True
+        )
+        User.objects.bulk_create(
+            [
+                User(
+                    username=f"aluno{i}@bench.local",
+                    email=f"aluno{i}@bench.local",
+                    first_name=f"Aluno {i}",
+                    password=senha_hash,
+                )
+                for i in range(volume["alunos"])
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        user_ids = list(
+            User.objects.filter(is_staff=False)
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+        Aluno.objects.bulk_create(
+            [
+                Aluno(
+                    user_id=user_id,
+                    nome=f"Aluno {i}",
+                    email=f"aluno{i}@bench.local",
+                    telefone="11900000000",
+                )
+                for i, user_id in enumerate(user_ids)
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        aluno_ids = list(Aluno.objects.order_by("id").values_list("id", flat=True))
+
+        # Cada aluno em turmas consecutivas: a turma i recebe os alunos
+        # i - (matriculas_por_aluno - 1) ... i.
+        por_aluno = min(volume["matriculas_por_aluno"], len(turma_ids))
+        Matricula.objects.bulk_create(
+            (
+                Matricula(
+                    aluno_id=aluno_id, turma_id=turma_ids[(i + k) % len(turma_ids)]
+                )
+                for i, aluno_id in enumerate(aluno_ids)
+                for k in range(por_aluno)
+            ),
+            batch_size=BATCH_SIZE,
+        )
+
+        tipos = Recurso.TipoRecurso.values
+        Recurso.objects.bulk_create(
+            (
+                Recurso(
+                    turma_id=turma_id,
+                    tipo=tipos[k % len(tipos)],
+                    nome=f"Recurso {k}",
+                    descricao="Benchmark",
+                    draft=k % 10 == 0,
+                    acesso_previo=k % 5 == 1,
+                )
+                for turma_id in turma_ids
+                for k in range(volume["recursos_por_turma"])
+            ),
+            batch_size=BATCH_SIZE,
+        )
+
+        # `bulk_create` não dispara os sinais que mantêm o índice de busca
+        for model in search.CAMPOS:
+            search.reindexar(model)
+
+        self.stdout.write(f"Dados gerados em {time.perf_counter() - inicio:.1f}s")
+
+        # O aluno medido está na primeira turma, que já começou.
+        aluno = Aluno.objects.select_related("user").get(pk=aluno_ids[0])
+        turma = turma_ids[0]
+        return {
+            "escala": escala,
+            "username": aluno.user.username,
+            "aluno": aluno.pk,
+            "turma": turma,
+            "outra_turma": turma_ids[por_aluno % len(turma_ids)],
+            "turmas_lote": turma_ids[por_aluno : por_aluno + 20],
+            "treinamento": Turma.objects.get(pk=turma).treinamento_id,
+            "matricula": Matricula.objects.filter(aluno=aluno, turma_id=turma)
+            .values_list("id", flat=True)
+            .get(),
+            "recurso": Recurso.objects.filter(turma_id=turma, draft=False)
+            .values_list("id", flat=True)
+            .first(),
+            "usuarios": {
+                "staff": User.objects.get(username="admin@bench.local"),
+                "aluno": aluno.user,
+            },
+        }
+
+    def _cliente(self, user):
+        token = AccessTokenOnlySerializer.get_token(user).access_token
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        return client
+
+    def _requisicao(self, client, caso):
+        """
+        Executa a requisição sem cache e desfaz as escritas ao final.
+        """
+        caches[CACHE_ALIAS].clear()
+        cache.clear()
+
+        with transaction.atomic():
+            inicio = time.perf_counter()
+            response = client.generic(
+                caso.metodo,
+                caso.url,
+                json.dumps(caso.dados) if caso.dados is not None else "",
+                content_type="application/json",
+            )
+            if response.streaming:
+                for _ in response.streaming_content:
+                    pass
+            else:
+                response.content
+            duracao = time.perf_counter() - inicio
+            transaction.set_rollback(True)
+
+        return response, duracao
+
+    def _medir(self, ids, repeticoes):
+        casos = _casos(ids)
+        falhas = []
+
+        sem_caso = _rotas() - {caso.rota for caso in casos}
+        if sem_caso:
+            falhas.append(f"Rotas sem caso no benchmark: {', '.join(sorted(sem_caso))}")
+
+        resultados = {}
+        for caso in casos:
+            for papel, esperado in caso.consultas.items():
+                client = self._cliente(ids["usuarios"][papel])
+                chave = f"{caso.nome} [{papel}]"
+
+                tracemalloc.start()
+                with CaptureQueriesContext(connection) as queries:
+                    response, _ = self._requisicao(client, caso)
+                _, pico = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+
+                # Sem as queries de SAVEPOINT/transação do próprio benchmark
+                consultas = sum(
+                    1
+                    for query in queries.captured_queries
+                    if not query["sql"].startswith(
+                        ("BEGIN", "SAVEPOINT", "RELEASE", "ROLLBACK")
+                    )
+                )
+
+                duracoes = [
+                    self._requisicao(client, caso)[1]
+                    for _ in range(caso.repeticoes or repeticoes)
+                ]
+
+                resultado = {
+                    "status": response.status_code,
+                    "consultas": consultas,
+                    "p50_ms": round(statistics.median(duracoes) * 1000, 2),
+                    "p95_ms": round(_percentil(duracoes, 95) * 1000, 2),
+                    "memoria_kb": round(pico / 1024, 1),
+                }
+                resultados[chave] = resultado
+
+                self.stdout.write(
+                    f"{chave:<45} {resultado['status']} "
+                    f"{consultas:>3} queries  p50 {resultado['p50_ms']:>8.2f}ms  "
+                    f"p95 {resultado['p95_ms']:>8.2f}ms  {resultado['memoria_kb']:>9.1f}KB"
+                )
+
+                if response.status_code != caso.status[papel]:
+                    falhas.append(
+                        f"{chave}: status {response.status_code}, "
+                        f"esperado {caso.status[papel]}"
+                    )
+                if consultas != esperado:
+                    falhas.append(f"{chave}: {consultas} queries, esperado {esperado}")
+
+        return {"escala": ids["escala"], "resultados": resultados}, falhas
+
+    def _comparar(self, atual, options):
+        caminho = Path(options["baseline"])
+
+        if options["atualizar_baseline"] or not caminho.exists():
+            caminho.write_text(json.dumps(atual, indent=2, ensure_ascii=False) + "\n")
+            self.stdout.write(f"Baseline gravado em {caminho}")
+            return []
+
+        baseline = json.loads(caminho.read_text())
+        if baseline.get("escala") != atual["escala"]:
+            raise CommandError(
+                f"O baseline {caminho} foi gerado com --escala {baseline.get('escala')}."
+            )
+
+        limite = 1 + options["tolerancia"]
+        falhas = []
+        for chave, resultado in atual["resultados"].items():
+            anterior = baseline["resultados"].get(chave)
+            if anterior is None:
+                continue
+
+            for metrica in ("p95_ms", "memoria_kb"):
+                piora = resultado[metrica] - anterior[metrica]
+                if (
+                    resultado[metrica] > anterior[metrica] * limite
+                    and piora > FOLGA[metrica]
+                ):
+                    falhas.append(
+                        f"{chave}: {metrica} {resultado[metrica]} "
+                        f"(baseline {anterior[metrica]})"
+                    )
+
+        return falhas
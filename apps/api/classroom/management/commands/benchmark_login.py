@@ -0,0 +1,61 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.hashers import get_hasher, get_hashers
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        "Mede logins por segundo (verificação de senha) por núcleo para o "
+        "PBKDF2 padrão e para o hasher preferido em PASSWORD_HASHERS."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--logins", type=int, default=200, help="Verificações por hasher"
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count(),
+            help="Threads simultâneas (padrão: número de núcleos)",
+        )
+        parser.add_argument(
+            "--hasher",
+            action="append",
+            dest="hashers",
+            help="Algoritmo a medir (pode repetir). Padrão: pbkdf2_sha256 e o preferido",
+        )
+
+    def handle(self, *args, **options):
+        algoritmos = options["hashers"] or ["pbkdf2_sha256", get_hashers()[0].algorithm]
+        workers = max(1, options["workers"])
+        logins = max(1, options["logins"])
+
+        for algoritmo in dict.fromkeys(algoritmos):
+            try:
+                hasher = get_hasher(algoritmo)
+            except ValueError as exc:
+                raise CommandError(exc)
+
+            senha = "Senha@Benchmark123"
+            encoded = hasher.encode(senha, hasher.salt())
+
+            inicio = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                verificados = sum(
+                    pool.map(lambda _: hasher.verify(senha, encoded), range(logins))
+                )
+            duracao = time.perf_counter() - inicio
+
+            if verificados != logins:
+                raise CommandError(f"{algoritmo}: verificação falhou")
+
+            por_segundo = logins / duracao
+            self.stdout.write(
+                f"{algoritmo}: {por_segundo:.1f} logins/s com {workers} threads "
+                f"({por_segundo / workers:.1f} por núcleo, "
+                f"{duracao / logins * workers * 1000:.1f} ms por login)"
+            )
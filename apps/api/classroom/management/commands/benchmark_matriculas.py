@@ -0,0 +1,249 @@
+import logging
+import multiprocessing
+import os
+import statistics
+import tempfile
+import time
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.core.cache import cache, caches
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection
+from django.test.utils import setup_test_environment
+from rest_framework.test import APIClient
+
+from classroom.cache import CACHE_ALIAS
+from classroom.models import Aluno, Treinamento, Turma
+
+# Configuração do SQLite antes (padrões do Django) e depois de `DATABASES`
+VARIANTES = {
+    "antes": {
+        "descricao": "journal DELETE, transações DEFERRED, timeout 5s",
+        "options": {"init_command": "PRAGMA journal_mode=DELETE;"},
+    },
+    "depois": {
+        "descricao": "journal WAL, synchronous=NORMAL, IMMEDIATE, timeout 20s",
+        "options": None,  # o OPTIONS configurado em settings.DATABASES
+    },
+}
+
+
+def _percentil(valores, fracao):
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * fracao))]
+
+
+def _requisicao(client, pares):
+    """
+    Uma matrícula por `POST /api/matriculas/` ou várias, numa transação, por
+    `POST /api/matriculas/lote/`.
+    """
+    linhas = [{"aluno": aluno, "turma": turma} for aluno, turma in pares]
+    if len(linhas) == 1:
+        return client.post("/api/matriculas/", linhas[0], format="json")
+
+    response = client.post("/api/matriculas/lote/", linhas, format="json")
+    if response.status_code == 200 and response.data["erros"]:
+        response.status_code = 409
+    return response
+
+
+def _escritor(pares, lote, staff_id, fila):
+    """
+    Processo que matricula `pares` (aluno, turma), `lote` por requisição,
+    como requisições de workers diferentes.
+    """
+    client = APIClient(raise_request_exception=False)
+    client.force_authenticate(User.objects.get(pk=staff_id))
+
+    duracoes, erros = [], 0
+    for i in range(0, len(pares), lote):
+        inicio = time.perf_counter()
+        try:
+            response = _requisicao(client, pares[i : i + lote])
+            ok = response.status_code in (200, 201)
+        except OperationalError:
+            ok = False
+        duracoes.append(time.perf_counter() - inicio)
+        erros += not ok
+
+    fila.put(("escrita", duracoes, erros))
+
+
+def _leitor(staff_id, ate, fila):
+    """
+    Processo que lista turmas (`GET /api/turmas/`) enquanto há escritas.
+    """
+    client = APIClient(raise_request_exception=False)
+    client.force_authenticate(User.objects.get(pk=staff_id))
+
+    duracoes, erros = [], 0
+    while time.monotonic() < ate.value:
+        caches[CACHE_ALIAS].clear()
+        inicio = time.perf_counter()
+        try:
+            ok = client.get("/api/turmas/").status_code == 200
+        except OperationalError:
+            ok = False
+        duracoes.append(time.perf_counter() - inicio)
+        erros += not ok
+
+    fila.put(("leitura", duracoes, erros))
+
+
+class Command(BaseCommand):
+    help = (
+        "Teste de carga de matrículas simultâneas no SQLite: processos "
+        "escritores (POST /api/matriculas/) e leitores (GET /api/turmas/) "
+        "com a configuração antiga do banco e com a de settings.DATABASES."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--escritores", type=int, default=4, help="Processos que matriculam"
+        )
+        parser.add_argument(
+            "--leitores", type=int, default=2, help="Processos que listam turmas"
+        )
+        parser.add_argument(
+            "--matriculas",
+            type=int,
+            default=100,
+            help="Matrículas por processo escritor",
+        )
+        parser.add_argument(
+            "--lote",
+            type=int,
+            default=1,
+            help="Matrículas por requisição (acima de 1, POST /api/matriculas/lote/)",
+        )
+        parser.add_argument(
+            "--variante",
+            action="append",
+            dest="variantes",
+            choices=list(VARIANTES),
+            help="Configuração a medir (pode repetir). Padrão: antes e depois",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError(
+                "Só para o SQLite: no PostgreSQL a concorrência não depende do "
+                "journal nem do modo de transação."
+            )
+
+        setup_test_environment()
+        # Sem o log de cada requisição dos processos
+        logging.getLogger("core.requests").setLevel(logging.ERROR)
+
+        original = dict(connection.settings_dict)
+        try:
+            for nome in options["variantes"] or list(VARIANTES):
+                with tempfile.TemporaryDirectory() as diretorio:
+                    arquivo = os.path.join(diretorio, "db.sqlite3")
+                    self._medir(nome, arquivo, original["OPTIONS"], options)
+        finally:
+            connection.close()
+            connection.settings_dict.clear()
+            connection.settings_dict.update(original)
+
+    def _medir(self, nome, arquivo, configuradas, options):
+        variante = VARIANTES[nome]
+        connection.close()
+        connection.settings_dict["NAME"] = arquivo
+        connection.settings_dict["OPTIONS"] = dict(variante["options"] or configuradas)
+
+        call_command("migrate", verbosity=0, interactive=False)
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA journal_mode")
+            journal = cursor.fetchone()[0]
+        staff_id, pares = self._popular(options["escritores"] * options["matriculas"])
+        caches[CACHE_ALIAS].clear()
+        cache.clear()
+
+        # Cada processo abre a própria conexão
+        connection.close()
+        contexto = multiprocessing.get_context("fork")
+        fila = contexto.Queue()
+        ate = contexto.Value("d", float("inf"))
+
+        escritores = [
+            contexto.Process(
+                target=_escritor,
+                args=(
+                    pares[i :: options["escritores"]],
+                    max(1, options["lote"]),
+                    staff_id,
+                    fila,
+                ),
+            )
+            for i in range(options["escritores"])
+        ]
+        leitores = [
+            contexto.Process(target=_leitor, args=(staff_id, ate, fila))
+            for _ in range(options["leitores"])
+        ]
+
+        inicio = time.perf_counter()
+        for processo in leitores + escritores:
+            processo.start()
+
+        resultados = {"escrita": ([], 0), "leitura": ([], 0)}
+        for _ in escritores:
+            self._somar(resultados, fila.get())
+        duracao = time.perf_counter() - inicio
+
+        ate.value = time.monotonic()
+        for _ in leitores:
+            self._somar(resultados, fila.get())
+        for processo in leitores + escritores:
+            processo.join()
+
+        self.stdout.write(
+            f"\n{nome} ({variante['descricao']}; journal_mode={journal}, "
+            f"{len(escritores)} escritores, {len(leitores)} leitores)"
+        )
+        for tipo, (duracoes, erros) in resultados.items():
+            if not duracoes:
+                continue
+            self.stdout.write(
+                f"  {tipo:<8} {len(duracoes) / duracao:>7.1f} req/s  "
+                f"p50 {statistics.median(duracoes) * 1000:>7.1f}ms  "
+                f"p95 {_percentil(duracoes, 0.95) * 1000:>7.1f}ms  "
+                f"max {max(duracoes) * 1000:>7.1f}ms  "
+                f"erros {erros}/{len(duracoes)}"
+            )
+
+    def _somar(self, resultados, item):
+        tipo, duracoes, erros = item
+        total, falhas = resultados[tipo]
+        resultados[tipo] = (total + duracoes, falhas + erros)
+
+    def _popular(self, quantidade):
+        """
+        Um admin e `quantidade` pares (aluno, turma) distintos, ainda sem
+        matrícula.
+        """
+        staff = User.objects.create_user(
+            username="admin@bench.local", password="x", is_staff=True
+        )
+        treinamento = Treinamento.objects.create(nome="Carga")
+        turmas = Turma.objects.bulk_create(
+            Turma(treinamento=treinamento, nome=f"Turma {i}", data_inicio=date.today())
+            for i in range(20)
+        )
+        users = User.objects.bulk_create(
+            User(username=f"carga{i}@bench.local") for i in range(quantidade)
+        )
+        alunos = Aluno.objects.bulk_create(
+            Aluno(user=user, nome=f"Aluno {i}", email=user.username)
+            for i, user in enumerate(users)
+        )
+        pares = [
+            (aluno.pk, turmas[i % len(turmas)].pk) for i, aluno in enumerate(alunos)
+        ]
+        return staff.pk, pares
@@ -0,0 +1,143 @@
+import io
+import json
+import time
+
+from django.core.management.base import CommandError
+from django.test.runner import DiscoverRunner
+from django.test.utils import setup_test_environment
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+
+from classroom.serializers import (
+    AlunoSerializer,
+    MatriculaSerializer,
+    RecursoSerializer,
+    TurmaSerializer,
+)
+from classroom.serializers.values import values_representation
+from classroom.views import AlunoViewSet, MatriculaViewSet, RecursoViewSet, TurmaViewSet
+
+from .benchmark_api import Command as BenchmarkApiCommand
+
+LISTAGENS = [
+    ("alunos", AlunoViewSet, AlunoSerializer),
+    ("turmas", TurmaViewSet, TurmaSerializer),
+    ("matriculas", MatriculaViewSet, MatriculaSerializer),
+    ("recursos", RecursoViewSet, RecursoSerializer),
+]
+
+
+class Command(BenchmarkApiCommand):
+    help = (
+        "Compara linhas por segundo das listagens serializadas pelo "
+        "ModelSerializer e direto de `.values()` (ValuesRepresentation), e do "
+        "renderer/parser JSON configurado com os padrões do DRF, conferindo "
+        "que o JSON gerado é idêntico."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--escala",
+            type=float,
+            default=0.1,
+            help="Fração do volume do benchmark_api usado para popular o banco",
+        )
+        parser.add_argument(
+            "--linhas", type=int, default=5000, help="Linhas por listagem"
+        )
+        parser.add_argument("--repeticoes", type=int, default=5)
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        runner = DiscoverRunner(verbosity=0, interactive=False)
+        bancos = runner.setup_databases()
+        try:
+            self._popular(options["escala"])
+            for nome, viewset, serializer_class in LISTAGENS:
+                self._comparar_listagem(
+                    nome,
+                    viewset.queryset,
+                    serializer_class,
+                    options["linhas"],
+                    options["repeticoes"],
+                )
+            self._comparar_parser(options["linhas"], options["repeticoes"])
+        finally:
+            runner.teardown_databases(bancos)
+
+    def _comparar_listagem(self, nome, queryset, serializer_class, linhas, repeticoes):
+        queryset = queryset.order_by(*queryset.model._meta.ordering, "id")
+        representacao = values_representation(serializer_class)
+
+        def modelo():
+            return serializer_class(list(queryset[:linhas]), many=True).data
+
+        def values():
+            return representacao.data(representacao.queryset(queryset)[:linhas])
+
+        padrao, renderer = JSONRenderer(), api_settings.DEFAULT_RENDERER_CLASSES[0]()
+        dados = values()
+        esperado = padrao.render(modelo())
+        if padrao.render(dados) != esperado or renderer.render(dados) != esperado:
+            raise CommandError(f"{nome}: JSON diferente do ModelSerializer")
+
+        total = len(dados)
+        modelo_s = _melhor(lambda: padrao.render(modelo()), repeticoes)
+        values_s = _melhor(lambda: padrao.render(values()), repeticoes)
+        self.stdout.write(
+            f"{nome:<12} {total:>6} linhas  "
+            f"ModelSerializer {total / modelo_s:>10.0f} linhas/s  "
+            f"values() {total / values_s:>10.0f} linhas/s  "
+            f"({modelo_s / values_s:.1f}x)"
+        )
+
+        if type(renderer) is not JSONRenderer:
+            padrao_s = _melhor(lambda: padrao.render(dados), repeticoes)
+            renderer_s = _melhor(lambda: renderer.render(dados), repeticoes)
+            self.stdout.write(
+                f"{'':<12} {'render':>13}  "
+                f"{'JSONRenderer':<15} {total / padrao_s:>10.0f} linhas/s  "
+                f"{type(renderer).__name__} {total / renderer_s:>10.0f} linhas/s  "
+                f"({padrao_s / renderer_s:.1f}x)"
+            )
+
+    def _comparar_parser(self, linhas, repeticoes):
+        """
+        Corpo de uma matrícula em lote com `linhas` itens, lido pelo
+        `JSONParser` do DRF e pelo parser configurado.
+        """
+        parser = api_settings.DEFAULT_PARSER_CLASSES[0]()
+        if type(parser) is JSONParser:
+            return
+
+        corpo = json.dumps(
+            [{"aluno": i, "turma": i % 100 + 1} for i in range(linhas)]
+        ).encode()
+
+        def ler(parser):
+            return parser.parse(io.BytesIO(corpo), parser_context={})
+
+        if ler(parser) != ler(JSONParser()):
+            raise CommandError("Parser: resultado diferente do JSONParser")
+
+        padrao_s = _melhor(lambda: ler(JSONParser()), repeticoes)
+        parser_s = _melhor(lambda: ler(parser), repeticoes)
+        self.stdout.write(
+            f"{'lote':<12} {linhas:>6} linhas  "
+            f"{'JSONParser':<15} {linhas / padrao_s:>10.0f} linhas/s  "
+            f"{type(parser).__name__} {linhas / parser_s:>10.0f} linhas/s  "
+            f"({padrao_s / parser_s:.1f}x)"
+        )
+
+
+def _melhor(funcao, repeticoes):
+    """
+    Menor tempo de `funcao` em `repeticoes` execuções.
+    """
+    tempos = []
+    for _ in range(max(1, repeticoes)):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos)
@@ -0,0 +1,123 @@
+import statistics
+import time
+from types import SimpleNamespace
+
+from django.core.management.base import CommandError
+from django.db import connection
+from django.db.models import Exists, OuterRef
+from django.test.runner import DiscoverRunner
+from django.test.utils import setup_test_environment
+
+from classroom.models import Aluno, Matricula, Recurso, Turma
+from classroom.permissions import matriculado_na_turma
+
+from .benchmark_api import Command as BenchmarkApiCommand
+
+
+def _variantes(aluno):
+    """
+    Primeira página das listagens do aluno com a matrícula como JOIN +
+    `.distinct()` (a forma original), como `EXISTS` correlacionado e como
+    `IN (subconsulta)` (`matriculado_na_turma`, a de `get_queryset`).
+    """
+    # Usuário com a claim `aluno_id` do token, como na API
+    request = SimpleNamespace(user=SimpleNamespace(pk=aluno.user_id, aluno_id=aluno.pk))
+    matriculas = Matricula.objects.do_usuario(request.user)
+    turmas = Turma.objects.order_by("-data_inicio", "-id")
+    recursos = Recurso.objects.filter(draft=False).order_by("-criado_em", "-id")
+
+    return {
+        "turmas": {
+            "join_distinct": turmas.filter(matriculas__aluno=aluno).distinct(),
+            "exists": turmas.filter(Exists(matriculas.filter(turma_id=OuterRef("pk")))),
+            "in_subquery": turmas.filter(matriculado_na_turma(request, "pk")),
+        },
+        "recursos": {
+            "join_distinct": recursos.filter(turma__matriculas__aluno=aluno).distinct(),
+            "exists": recursos.filter(
+                Exists(matriculas.filter(turma_id=OuterRef("turma_id")))
+            ),
+            "in_subquery": recursos.filter(matriculado_na_turma(request, "turma_id")),
+        },
+    }
+
+
+class Command(BenchmarkApiCommand):
+    help = (
+        "Compara o plano e a latência da visibilidade das listagens do aluno "
+        "(turmas e recursos) com JOIN + DISTINCT, EXISTS e IN (subconsulta), "
+        "para um aluno comum e para um matriculado em muitas turmas."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--escala",
+            type=float,
+            default=0.1,
+            help="Fração do volume do benchmark_api usado para popular o banco",
+        )
+        parser.add_argument(
+            "--turmas-aluno",
+            type=int,
+            default=200,
+            help="Turmas do aluno com muitas matrículas",
+        )
+        parser.add_argument("--linhas", type=int, default=50, help="Tamanho da página")
+        parser.add_argument("--repeticoes", type=int, default=20)
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        runner = DiscoverRunner(verbosity=0, interactive=False)
+        bancos = runner.setup_databases()
+        try:
+            ids = self._popular(options["escala"])
+            alunos = {
+                "aluno comum": Aluno.objects.get(pk=ids["aluno"]),
+                "muitas turmas": self._aluno_com_muitas_turmas(
+                    ids["aluno"], options["turmas_aluno"]
+                ),
+            }
+            for descricao, aluno in alunos.items():
+                total = Matricula.objects.filter(aluno=aluno).count()
+                self.stdout.write(
+                    f"\n{descricao} ({total} matrículas, {connection.vendor})"
+                )
+                for listagem, variantes in _variantes(aluno).items():
+                    self._comparar(listagem, variantes, options)
+        finally:
+            runner.teardown_databases(bancos)
+
+    def _aluno_com_muitas_turmas(self, aluno_id, quantidade):
+        aluno = Aluno.objects.exclude(pk=aluno_id).first()
+        matriculadas = Matricula.objects.filter(aluno=aluno).values_list(
+            "turma_id", flat=True
+        )
+        turmas = Turma.objects.exclude(pk__in=matriculadas).values_list(
+            "id", flat=True
+        )[:quantidade]
+        Matricula.objects.bulk_create(
+            [Matricula(aluno=aluno, turma_id=turma_id) for turma_id in turmas]
+        )
+        return aluno
+
+    def _comparar(self, listagem, variantes, options):
+        linhas = options["linhas"]
+        resultados = {}
+        for nome, queryset in variantes.items():
+            resultados[nome] = [obj.pk for obj in queryset[:linhas]]
+
+            duracoes = []
+            for _ in range(options["repeticoes"]):
+                inicio = time.perf_counter()
+                list(queryset[:linhas])
+                duracoes.append(time.perf_counter() - inicio)
+
+            self.stdout.write(
+                f"  {listagem:<9} {nome:<14} p50 "
+                f"{statistics.median(duracoes) * 1000:>8.2f}ms"
+            )
+            for linha in queryset[:linhas].explain().splitlines():
+                self.stdout.write(f"      {linha}")
+
+        if len({tuple(ids) for ids in resultados.values()}) != 1:
+            raise CommandError(f"{listagem}: as variantes retornam linhas diferentes")
@@ -0,0 +1,42 @@
+import csv
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from classroom.bulk import importar_alunos, resumo
+
+
+class Command(BaseCommand):
+    help = "Importa alunos em lote a partir de um arquivo CSV ou JSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument("arquivo", help="CSV (nome,email,telefone) ou JSON")
+
+    def handle(self, *args, **options):
+        caminho = options["arquivo"]
+
+        try:
+            with open(caminho, encoding="utf-8-sig") as arquivo:
+                if caminho.endswith(".json"):
+                    linhas = json.load(arquivo)
+                else:
+                    linhas = list(csv.DictReader(arquivo))
+        except (OSError, ValueError) as exc:
+            raise CommandError(f"Não foi possível ler {caminho}: {exc}")
+
+        def progresso(feitos, total):
+            self.stdout.write(f"Senhas geradas: {feitos}/{total}")
+
+        resultado = resumo(importar_alunos(linhas, progresso=progresso))
+
+        for linha in resultado["resultados"]:
+            if linha["status"] != "criado":
+                self.stdout.write(self.style.WARNING(json.dumps(linha)))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Criados: {resultado['criados']}, "
+                f"duplicados: {resultado['duplicados']}, "
+                f"erros: {resultado['erros']}"
+            )
+        )
@@ -0,0 +1,27 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from classroom.models import Remocao
+
+
+class Command(BaseCommand):
+    help = (
+        "Apaga os registros de remoção mais antigos que o prazo da "
+        "sincronização incremental (DJANGO_SYNC_RETENTION_DAYS)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dias",
+            type=int,
+            default=settings.SYNC_RETENTION_DAYS,
+            help="Dias a manter (padrão: SYNC_RETENTION_DAYS)",
+        )
+
+    def handle(self, *args, **options):
+        limite = timezone.now() - timedelta(days=options["dias"])
+        apagados, _ = Remocao.objects.filter(removido_em__lt=limite).delete()
+        self.stdout.write(self.style.SUCCESS(f"Remoções apagadas: {apagados}"))
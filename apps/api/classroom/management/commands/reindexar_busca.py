@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from classroom import search
+from classroom.cache import invalidate
+from classroom.signals import DEPENDENCIAS
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconstrói o índice de busca (?q= e /api/search/) de alunos, turmas "
+        "e recursos, após cargas que não disparam sinais (bulk_create, update)."
+    )
+
+    def handle(self, *args, **options):
+        for model in search.CAMPOS:
+            total = search.reindexar(model)
+            self.stdout.write(f"{model._meta.verbose_name_plural}: {total}")
+
+        # Listagens com `?q=` em cache (com DJANGO_CACHE_URL, as dos workers)
+        invalidate(
+            *dict.fromkeys(
+                basename for model in search.CAMPOS for basename in DEPENDENCIAS[model]
+            )
+        )
+
+        self.stdout.write(self.style.SUCCESS("Índice de busca reconstruído."))
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('classroom', '0005_alter_turma_data_conclusao'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='recurso',
+            index=models.Index(fields=['turma', 'draft', 'acesso_previo'], name='recurso_turma_visivel_idx'),
+        ),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("classroom", "0006_recurso_turma_visivel_idx"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="aluno",
+            index=models.Index(fields=["nome", "id"], name="aluno_nome_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="matricula",
+            index=models.Index(
+                fields=["aluno", "-data_matricula", "-id"],
+                name="matricula_aluno_data_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="matricula",
+            index=models.Index(
+                fields=["turma", "-data_matricula", "-id"],
+                name="matricula_turma_data_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="matricula",
+            index=models.Index(
+                fields=["-data_matricula", "-id"], name="matricula_data_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="recurso",
+            index=models.Index(
+                fields=["turma", "draft", "-criado_em", "-id"],
+                name="recurso_turma_criado_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="recurso",
+            index=models.Index(
+                condition=models.Q(("draft", False)),
+                fields=["turma", "-criado_em", "-id"],
+                name="recurso_publicado_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="recurso",
+            index=models.Index(fields=["-criado_em", "-id"], name="recurso_criado_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="treinamento",
+            index=models.Index(fields=["nome", "id"], name="treinamento_nome_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="turma",
+            index=models.Index(
+                fields=["treinamento", "-data_inicio", "-id"],
+                name="turma_treinamento_inicio_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="turma",
+            index=models.Index(fields=["-data_inicio", "-id"], name="turma_inicio_idx"),
+        ),
+    ]
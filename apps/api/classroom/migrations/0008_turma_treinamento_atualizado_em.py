@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("classroom", "0007_indices_consultas"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="treinamento",
+            name="atualizado_em",
+            field=models.DateTimeField(auto_now=True, verbose_name="Atualizado em"),
+        ),
+        migrations.AddField(
+            model_name="turma",
+            name="atualizado_em",
+            field=models.DateTimeField(auto_now=True, verbose_name="Atualizado em"),
+        ),
+    ]
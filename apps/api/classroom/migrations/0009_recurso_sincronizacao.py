@@ -0,0 +1,60 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("classroom", "0008_turma_treinamento_atualizado_em"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Remocao",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                (
+                    "tipo",
+                    models.CharField(
+                        choices=[
+                            ("RECURSO", "Recurso"),
+                            ("TURMA", "Turma"),
+                            ("MATRICULA", "Matrícula"),
+                        ],
+                        max_length=10,
+                        verbose_name="Tipo",
+                    ),
+                ),
+                ("objeto_id", models.IntegerField(verbose_name="Objeto")),
+                ("turma_id", models.IntegerField(verbose_name="Turma")),
+                (
+                    "aluno_id",
+                    models.IntegerField(blank=True, null=True, verbose_name="Aluno"),
+                ),
+                (
+                    "removido_em",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Removido em"),
+                ),
+            ],
+            options={
+                "verbose_name": "Remoção",
+                "verbose_name_plural": "Remoções",
+                "ordering": ["removido_em"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="recurso",
+            index=models.Index(fields=["atualizado_em"], name="recurso_atualizado_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="remocao",
+            index=models.Index(
+                fields=["tipo", "removido_em"], name="remocao_tipo_data_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="remocao",
+            index=models.Index(fields=["removido_em"], name="remocao_data_idx"),
+        ),
+    ]
@@ -0,0 +1,148 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:31
+
+import re
+import unicodedata
+
+import classroom.models.busca
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Tabelas do índice de busca (`classroom/search.py`), fora do ORM: uma linha
+# por registro, com o mesmo id (`rowid`). FTS5 no SQLite, `tsvector` com
+# índice GIN no PostgreSQL. Os modelos (`managed = False`) só servem ao JOIN.
+CAMPOS = {
+    "Aluno": ("nome", "email"),
+    "Turma": ("nome",),
+    "Recurso": ("nome", "descricao"),
+}
+
+
+def normalizar(texto):
+    # Cópia de `classroom.search.normalizar` na época desta migração: o índice
+    # inicial não muda com alterações posteriores do módulo.
+    texto = unicodedata.normalize("NFKD", texto or "")
+    texto = "".join(c for c in texto if not unicodedata.combining(c))
+    return " ".join(re.findall(r"[^\W_]+", texto.lower()))
+
+
+def _tabela(model):
+    return f"{model._meta.db_table}_busca"
+
+
+def criar_indices(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    for nome, campos in CAMPOS.items():
+        model = apps.get_model("classroom", nome)
+        tabela = _tabela(model)
+
+        if vendor == "postgresql":
+            schema_editor.execute(
+                f"CREATE TABLE {tabela} "
+                f"(rowid integer PRIMARY KEY, documento tsvector NOT NULL)"
+            )
+            schema_editor.execute(
+                f"CREATE INDEX {tabela}_idx ON {tabela} USING GIN (documento)"
+            )
+            inserir = (
+                f"INSERT INTO {tabela} (rowid, documento) "
+                f"VALUES (%s, to_tsvector('simple', %s))"
+            )
+        else:
+            schema_editor.execute(
+                f"CREATE VIRTUAL TABLE {tabela} USING fts5("
+                f"documento, tokenize = 'unicode61 remove_diacritics 2')"
+            )
+            inserir = f"INSERT INTO {tabela} (rowid, documento) VALUES (%s, %s)"
+
+        linhas = [
+            (valores[0], normalizar(" ".join(str(v or "") for v in valores[1:])))
+            for valores in model.objects.values_list("pk", *campos).iterator()
+        ]
+        with schema_editor.connection.cursor() as cursor:
+            cursor.executemany(inserir, linhas)
+
+
+def remover_indices(apps, schema_editor):
+    for nome in CAMPOS:
+        tabela = _tabela(apps.get_model("classroom", nome))
+        schema_editor.execute(f"DROP TABLE IF EXISTS {tabela}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("classroom", "0009_recurso_sincronizacao"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AlunoBusca",
+            fields=[
+                ("documento", classroom.models.busca.DocumentoBusca()),
+                (
+                    "registro",
+                    models.OneToOneField(
+                        db_column="rowid",
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        primary_key=True,
+                        related_name="busca",
+                        serialize=False,
+                        to="classroom.aluno",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "classroom_aluno_busca",
+                "abstract": False,
+                "managed": False,
+            },
+        ),
+        migrations.CreateModel(
+            name="RecursoBusca",
+            fields=[
+                ("documento", classroom.models.busca.DocumentoBusca()),
+                (
+                    "registro",
+                    models.OneToOneField(
+                        db_column="rowid",
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        primary_key=True,
+                        related_name="busca",
+                        serialize=False,
+                        to="classroom.recurso",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "classroom_recurso_busca",
+                "abstract": False,
+                "managed": False,
+            },
+        ),
+        migrations.CreateModel(
+            name="TurmaBusca",
+            fields=[
+                ("documento", classroom.models.busca.DocumentoBusca()),
+                (
+                    "registro",
+                    models.OneToOneField(
+                        db_column="rowid",
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        primary_key=True,
+                        related_name="busca",
+                        serialize=False,
+                        to="classroom.turma",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "classroom_turma_busca",
+                "abstract": False,
+                "managed": False,
+            },
+        ),
+        migrations.RunPython(criar_indices, remover_indices),
+    ]
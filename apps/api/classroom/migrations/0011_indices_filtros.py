@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("classroom", "0010_busca"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="recurso",
+            index=models.Index(
+                fields=["tipo", "-criado_em", "-id"], name="recurso_tipo_criado_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="turma",
+            index=models.Index(fields=["data_conclusao"], name="turma_conclusao_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="turma",
+            index=models.Index(fields=["nome", "id"], name="turma_nome_idx"),
+        ),
+    ]
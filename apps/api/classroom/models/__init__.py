@@ -3,6 +3,8 @@ from .treinamento import Treinamento
 from .turma import Turma
 from .matricula import Matricula
 from .recurso import Recurso
+from .remocao import Remocao
+from .busca import AlunoBusca, TurmaBusca, RecursoBusca
 
 __all__ = [
     "Aluno",
@@ -10,4 +12,8 @@ __all__ = [
     "Turma",
     "Matricula",
     "Recurso",
+    "Remocao",
+    "AlunoBusca",
+    "TurmaBusca",
+    "RecursoBusca",
 ]
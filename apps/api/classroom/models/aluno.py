@@ -24,6 +24,7 @@ class Aluno(models.Model):
         verbose_name = "Aluno"
         verbose_name_plural = "Alunos"
         ordering = ["nome"]
+        indexes = [models.Index(fields=["nome", "id"], name="aluno_nome_idx")]
 
     def __str__(self):
         return self.nome
@@ -0,0 +1,79 @@
+from django.db import models
+from django.db.models import Lookup
+
+from .aluno import Aluno
+from .recurso import Recurso
+from .turma import Turma
+
+
+class DocumentoBusca(models.TextField):
+    """
+    Texto indexado: coluna de uma tabela FTS5 no SQLite, `tsvector` no
+    PostgreSQL. Só é consultado pelo lookup `casa`.
+    """
+
+
+@DocumentoBusca.register_lookup
+class Casa(Lookup):
+    """
+    `documento__casa=<consulta>`, com a consulta já no formato do banco
+    (ver `classroom/search.py`).
+    """
+
+    lookup_name = "casa"
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs} MATCH {rhs}", [*lhs_params, *rhs_params]
+
+    def as_postgresql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs} @@ to_tsquery('simple', {rhs})", [*lhs_params, *rhs_params]
+
+
+class IndiceBusca(models.Model):
+    """
+    Linha do índice de busca de um registro, com o mesmo id (`rowid`). As
+    tabelas são criadas e mantidas fora do ORM (migração 0010 e
+    `classroom/search.py`); o modelo existe para a busca ser um JOIN.
+    """
+
+    documento = DocumentoBusca()
+
+    class Meta:
+        abstract = True
+        managed = False
+
+
+def _registro(model):
+    return models.OneToOneField(
+        model,
+        primary_key=True,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_column="rowid",
+        related_name="busca",
+    )
+
+
+class AlunoBusca(IndiceBusca):
+    registro = _registro(Aluno)
+
+    class Meta(IndiceBusca.Meta):
+        db_table = "classroom_aluno_busca"
+
+
+class TurmaBusca(IndiceBusca):
+    registro = _registro(Turma)
+
+    class Meta(IndiceBusca.Meta):
+        db_table = "classroom_turma_busca"
+
+
+class RecursoBusca(IndiceBusca):
+    registro = _registro(Recurso)
+
+    class Meta(IndiceBusca.Meta):
+        db_table = "classroom_recurso_busca"
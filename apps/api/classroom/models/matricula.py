@@ -1,9 +1,24 @@
 from django.db import models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 
 from .aluno import Aluno
 from .turma import Turma
 
 
+class MatriculaQuerySet(models.QuerySet):
+    def do_usuario(self, user):
+        """
+        Matrículas do aluno de `user`. Usa a claim `aluno_id` do token quando
+        disponível, evitando o JOIN com `Aluno`.
+        """
+        aluno_id = getattr(user, "aluno_id", None)
+        if aluno_id is not None:
+            return self.filter(aluno_id=aluno_id)
+
+        return self.filter(aluno__user_id=user.pk)
+
+
 class Matricula(models.Model):
     """
     Modelo que representa a matrícula de um aluno em uma turma.
@@ -26,11 +41,41 @@ class Matricula(models.Model):
         auto_now_add=True, verbose_name="Data da Matrícula"
     )
 
+    objects = MatriculaQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Matrícula"
         verbose_name_plural = "Matrículas"
         unique_together = [["aluno", "turma"]]
         ordering = ["-data_matricula"]
+        # Índices na ordem de `Meta.ordering` + `id` (desempate da paginação)
+        indexes = [
+            models.Index(
+                fields=["aluno", "-data_matricula", "-id"],
+                name="matricula_aluno_data_idx",
+            ),
+            models.Index(
+                fields=["turma", "-data_matricula", "-id"],
+                name="matricula_turma_data_idx",
+            ),
+            models.Index(fields=["-data_matricula", "-id"], name="matricula_data_idx"),
+        ]
 
     def __str__(self):
         return f"{self.aluno.nome} - {self.turma.nome}"
+
+
+def total_alunos():
+    """
+    Total de matrículas da turma de cada linha, em subconsulta pelo índice de
+    `turma`. Sem o GROUP BY de `Count("matriculas")`, a listagem de turmas
+    segue o índice da ordenação e para no LIMIT da página.
+    """
+    matriculas = (
+        Matricula.objects.filter(turma=OuterRef("pk"))
+        .order_by()
+        .values("turma")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    return Coalesce(Subquery(matriculas), 0, output_field=IntegerField())
@@ -1,8 +1,41 @@
+from datetime import date
+
 from django.db import models
+from django.db.models import Q
 
+from .matricula import Matricula
 from .turma import Turma
 
 
+class RecursoQuerySet(models.QuerySet):
+    def visible_to(self, user, today=None):
+        """
+        Recursos visíveis para o aluno de `user`, avaliado inteiramente em SQL.
+
+        Regra (espelhada em `Recurso.liberado_em`): matriculado na turma,
+        `draft=False` e turma já iniciada ou `acesso_previo=True`.
+        """
+        # `IN (subconsulta)`, como em `permissions.matriculado_na_turma`
+        turmas = Matricula.objects.do_usuario(user).values("turma_id")
+
+        return self.filter(turma_id__in=turmas).liberados(today)
+
+    def liberados(self, today=None):
+        """
+        Recursos publicados e liberados na data, sem considerar a matrícula.
+        """
+        return self.filter(liberado_q(today))
+
+
+def liberado_q(today=None):
+    """
+    Condição de `RecursoQuerySet.liberados`: `draft=False` e turma já
+    iniciada ou `acesso_previo=True`.
+    """
+    today = today or date.today()
+    return Q(draft=False) & (Q(turma__data_inicio__lte=today) | Q(acesso_previo=True))
+
+
 class Recurso(models.Model):
     """
     Modelo que representa um recurso educacional de uma turma.
@@ -38,10 +71,45 @@ class Recurso(models.Model):
     criado_em = models.DateTimeField(auto_now_add=True, verbose_name="Criado em")
     atualizado_em = models.DateTimeField(auto_now=True, verbose_name="Atualizado em")
 
+    objects = RecursoQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Recurso"
         verbose_name_plural = "Recursos"
         ordering = ["-criado_em"]
+        indexes = [
+            models.Index(
+                fields=["turma", "draft", "acesso_previo"],
+                name="recurso_turma_visivel_idx",
+            ),
+            models.Index(
+                fields=["turma", "draft", "-criado_em", "-id"],
+                name="recurso_turma_criado_idx",
+            ),
+            # Listagem dos alunos: só recursos publicados
+            models.Index(
+                fields=["turma", "-criado_em", "-id"],
+                condition=models.Q(draft=False),
+                name="recurso_publicado_idx",
+            ),
+            models.Index(fields=["-criado_em", "-id"], name="recurso_criado_idx"),
+            # Filtro `?tipo=` da listagem
+            models.Index(
+                fields=["tipo", "-criado_em", "-id"], name="recurso_tipo_criado_idx"
+            ),
+            # Sincronização incremental (`classroom/sync.py`): com um cursor
+            # recente, poucas linhas passam do `atualizado_em`
+            models.Index(fields=["atualizado_em"], name="recurso_atualizado_idx"),
+        ]
 
     def __str__(self):
         return f"{self.nome} ({self.get_tipo_display()})"
+
+    def liberado_em(self, today):
+        """
+        Mesma regra de `RecursoQuerySet.visible_to`, sem a matrícula.
+        """
+        if self.draft:
+            return False
+
+        return today >= self.turma.data_inicio or self.acesso_previo
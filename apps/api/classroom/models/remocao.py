@@ -0,0 +1,35 @@
+from django.db import models
+
+
+class Remocao(models.Model):
+    """
+    Registro das exclusões para a sincronização incremental dos recursos
+    (`classroom/sync.py`): recursos removidos (ou movidos para outra turma),
+    turmas removidas e matrículas canceladas. Os registros mais antigos que
+    `SYNC_RETENTION_DAYS` são apagados por `manage.py limpar_remocoes`.
+    """
+
+    class Tipo(models.TextChoices):
+        RECURSO = "RECURSO", "Recurso"
+        TURMA = "TURMA", "Turma"
+        MATRICULA = "MATRICULA", "Matrícula"
+
+    id = models.BigAutoField(primary_key=True)
+    tipo = models.CharField(max_length=10, choices=Tipo.choices, verbose_name="Tipo")
+    objeto_id = models.IntegerField(verbose_name="Objeto")
+    # Sem chave estrangeira: a turma e o aluno podem já não existir
+    turma_id = models.IntegerField(verbose_name="Turma")
+    aluno_id = models.IntegerField(null=True, blank=True, verbose_name="Aluno")
+    removido_em = models.DateTimeField(auto_now_add=True, verbose_name="Removido em")
+
+    class Meta:
+        verbose_name = "Remoção"
+        verbose_name_plural = "Remoções"
+        ordering = ["removido_em"]
+        indexes = [
+            models.Index(fields=["tipo", "removido_em"], name="remocao_tipo_data_idx"),
+            models.Index(fields=["removido_em"], name="remocao_data_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.get_tipo_display()} {self.objeto_id}"
@@ -9,11 +9,14 @@ class Treinamento(models.Model):
     id = models.AutoField(primary_key=True)
     nome = models.CharField(max_length=100, verbose_name="Nome")
     descricao = models.TextField(null=True, blank=True, verbose_name="Descrição")
+    # Também atualizado quando as turmas mudam (ver `classroom/signals.py`)
+    atualizado_em = models.DateTimeField(auto_now=True, verbose_name="Atualizado em")
 
     class Meta:
         verbose_name = "Treinamento"
         verbose_name_plural = "Treinamentos"
         ordering = ["nome"]
+        indexes = [models.Index(fields=["nome", "id"], name="treinamento_nome_idx")]
 
     def __str__(self):
         return self.nome
@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 
 from .treinamento import Treinamento
 
@@ -21,11 +23,39 @@ class Turma(models.Model):
         null=True, blank=True, verbose_name="Data de Conclusão"
     )
     link_acesso = models.URLField(null=True, verbose_name="Link de Acesso")
+    # Também atualizado quando as matrículas mudam (ver `classroom/signals.py`)
+    atualizado_em = models.DateTimeField(auto_now=True, verbose_name="Atualizado em")
 
     class Meta:
         verbose_name = "Turma"
         verbose_name_plural = "Turmas"
         ordering = ["-data_inicio"]
+        indexes = [
+            models.Index(
+                fields=["treinamento", "-data_inicio", "-id"],
+                name="turma_treinamento_inicio_idx",
+            ),
+            models.Index(fields=["-data_inicio", "-id"], name="turma_inicio_idx"),
+            # Filtro por período de conclusão e `?ordering=nome` da listagem
+            models.Index(fields=["data_conclusao"], name="turma_conclusao_idx"),
+            models.Index(fields=["nome", "id"], name="turma_nome_idx"),
+        ]
 
     def __str__(self):
         return f"{self.nome} - {self.treinamento.nome}"
+
+
+def total_turmas():
+    """
+    Total de turmas do treinamento de cada linha, em subconsulta pelo índice
+    de `treinamento` (como `total_alunos`): a listagem de treinamentos segue
+    o índice do nome e para no LIMIT da página.
+    """
+    turmas = (
+        Turma.objects.filter(treinamento=OuterRef("pk"))
+        .order_by()
+        .values("treinamento")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    return Coalesce(Subquery(turmas), 0, output_field=IntegerField())
@@ -0,0 +1,217 @@
+import json
+from base64 import b64decode, b64encode
+from urllib import parse
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination, _reverse_ordering
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Paginação por cursor (keyset) para os ViewSets da classroom.
+
+    A ordenação é o `Meta.ordering` do modelo (ou a pedida em `?ordering=`, ou
+    a relevância da busca) acrescido de `id` como desempate, e o cursor guarda
+    a posição completa (valor de cada campo da ordenação).
+    Assim cada página é um `WHERE (campo, id) < (...)` com `LIMIT`, sem OFFSET:
+    a página N custa o mesmo que a página 1.
+    """
+
+    page_size_query_param = "page_size"
+    max_page_size = 200
+    ordering = None
+    tiebreak_field = "id"
+
+    def get_ordering(self, request, queryset, view):
+        # Vale a ordenação do primeiro filtro da view que definir uma
+        # (`?ordering=`, relevância da busca); o DRF só consulta o primeiro.
+        # As listagens aninhadas (`/turmas/{id}/alunos/`) são de outro modelo
+        # e não passam pelos filtros.
+        ordering = self.ordering
+        backends = ()
+        if queryset.model is getattr(getattr(view, "queryset", None), "model", None):
+            backends = view.filter_backends
+
+        for backend in backends:
+            if hasattr(backend, "get_ordering"):
+                escolhida = backend().get_ordering(request, queryset, view)
+                if escolhida:
+                    ordering = tuple(escolhida)
+                    break
+
+        fields = [field.lstrip("-") for field in ordering]
+
+        if self.tiebreak_field not in fields:
+            direction = "-" if ordering and ordering[-1].startswith("-") else ""
+            ordering = (*ordering, f"{direction}{self.tiebreak_field}")
+
+        return ordering
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self._page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+
+        return self._set_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        Versão assíncrona de `paginate_queryset`, para as views servidas por
+        ASGI: a página é lida com o ORM assíncrono (`aiterator`).
+        """
+        queryset = self._page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+
+        return self._set_page([obj async for obj in queryset.aiterator()])
+
+    def _page_queryset(self, queryset, request, view):
+        """
+        Queryset da página atual (ordenada, filtrada pelo cursor e com um item
+        a mais para saber se há próxima página), ou `None` sem paginação.
+        """
+        if self.ordering is None:
+            self.ordering = tuple(queryset.model._meta.ordering)
+
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            (reverse, current_position) = (False, None)
+        else:
+            (_, reverse, current_position) = self.cursor
+
+        if reverse:
+            queryset = queryset.order_by(*_reverse_ordering(self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        if current_position is not None:
+            queryset = queryset.filter(self._keyset_filter(current_position, reverse))
+
+        return queryset[: self.page_size + 1]
+
+    def _set_page(self, results):
+        if self.cursor is None:
+            (reverse, current_position) = (False, None)
+        else:
+            (_, reverse, current_position) = self.cursor
+
+        self.page = list(results[: self.page_size])
+
+        if len(results) > len(self.page):
+            has_following_position = True
+            following_position = self._get_position_from_instance(
+                self.page[-1], self.ordering
+            )
+        else:
+            has_following_position = False
+            following_position = None
+
+        if reverse:
+            self.page = list(reversed(self.page))
+
+            self.has_next = current_position is not None
+            self.has_previous = has_following_position
+            if self.has_next:
+                self.next_position = current_position
+            if self.has_previous:
+                self.previous_position = following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = current_position is not None
+            if self.has_next:
+                self.next_position = following_position
+            if self.has_previous:
+                self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+
+        position = self.next_position
+        if self.page and self.cursor and self.cursor.reverse:
+            position = self._get_position_from_instance(self.page[-1], self.ordering)
+
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=position))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+
+        position = self.previous_position
+        if self.page and not (self.cursor and self.cursor.reverse):
+            position = self._get_position_from_instance(self.page[0], self.ordering)
+
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=position))
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            querystring = b64decode(encoded.encode("ascii")).decode("ascii")
+            tokens = parse.parse_qs(querystring, keep_blank_values=True)
+
+            reverse = bool(int(tokens.get("r", ["0"])[0]))
+            position = json.loads(tokens["p"][0])
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        return Cursor(offset=0, reverse=reverse, position=position)
+
+    def encode_cursor(self, cursor):
+        tokens = {"p": json.dumps(cursor.position, separators=(",", ":"))}
+        if cursor.reverse:
+            tokens["r"] = "1"
+
+        querystring = parse.urlencode(tokens, doseq=True)
+        encoded = b64encode(querystring.encode("ascii")).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def _get_position_from_instance(self, instance, ordering):
+        position = []
+        for order in ordering:
+            field_name = order.lstrip("-")
+            if isinstance(instance, dict):
+                attr = instance[field_name]
+            else:
+                attr = getattr(instance, field_name)
+            # Números (ids, relevância da busca) seguem como número no JSON
+            position.append(attr if isinstance(attr, (int, float)) else str(attr))
+        return position
+
+    def _keyset_filter(self, position, reverse):
+        """
+        Comparação lexicográfica `(f1, f2, ..., id) > (v1, v2, ..., vid)`
+        respeitando a direção de cada campo da ordenação.
+        """
+        keyset = Q()
+        equal = {}
+
+        for order, value in zip(self.ordering, position):
+            field_name = order.lstrip("-")
+            descending = order.startswith("-") != reverse
+            lookup = "lt" if descending else "gt"
+
+            keyset |= Q(**equal, **{f"{field_name}__{lookup}": value})
+            equal[field_name] = value
+
+        return keyset
@@ -1,12 +1,52 @@
 from datetime import date
+from django.db.models import Q
 from rest_framework.permissions import BasePermission, SAFE_METHODS
 
+from core.metrics import timed_permission
+
+from .models import Matricula
+
+
+def get_turmas_matriculadas(request):
+    """
+    Ids das turmas em que o aluno autenticado está matriculado.
+
+    Carregado com uma única query e memoizado na requisição, para que
+    `get_queryset` e as permissões de objeto compartilhem o mesmo resultado.
+    """
+    if not hasattr(request, "_turmas_matriculadas"):
+        if request.user and request.user.is_authenticated:
+            turma_ids = Matricula.objects.do_usuario(request.user).values_list(
+                "turma_id", flat=True
+            )
+            request._turmas_matriculadas = frozenset(turma_ids)
+        else:
+            request._turmas_matriculadas = frozenset()
+
+    return request._turmas_matriculadas
+
+
+def matriculado_na_turma(request, turma_ref):
+    """
+    Predicado `turma_ref IN (subconsulta)`: verdadeiro quando o aluno
+    autenticado está matriculado na turma referenciada por `turma_ref`.
+
+    Evita o JOIN com `matriculas` seguido de `.distinct()` nas listagens. A
+    subconsulta não é correlacionada: o banco lê as turmas do aluno pelo
+    índice único `(aluno, turma)` e busca só as linhas delas, em vez de
+    testar um `EXISTS` para cada linha da tabela (`manage.py
+    benchmark_visibilidade`).
+    """
+    turmas = Matricula.objects.do_usuario(request.user).values("turma_id")
+    return Q(**{f"{turma_ref}__in": turmas})
+
 
 class IsAdmin(BasePermission):
     """
     Permissão para administradores (staff).
     """
 
+    @timed_permission
     def has_permission(self, request, view):
         return request.user and request.user.is_staff
 
@@ -17,6 +57,7 @@ class IsAdminOrReadOnly(BasePermission):
     Aluno autenticado: Somente leitura (GET, HEAD, OPTIONS)
     """
 
+    @timed_permission
     def has_permission(self, request, view):
         if not request.user or not request.user.is_authenticated:
             return False
@@ -33,6 +74,7 @@ class IsOwnerOrAdmin(BasePermission):
     Aluno: acesso somente aos próprios dados (somente leitura)
     """
 
+    @timed_permission
     def has_permission(self, request, view):
         if not request.user or not request.user.is_authenticated:
             return False
@@ -42,14 +84,15 @@ class IsOwnerOrAdmin(BasePermission):
 
         return request.method in SAFE_METHODS
 
+    @timed_permission
     def has_object_permission(self, request, view, obj):
         if request.user.is_staff:
             return True
 
-        if hasattr(obj, "user"):
-            return obj.user == request.user
+        if hasattr(obj, "user_id"):
+            return obj.user_id == request.user.pk
         elif hasattr(obj, "aluno"):
-            return obj.aluno.user == request.user
+            return obj.aluno.user_id == request.user.pk
 
         return False
 
@@ -59,11 +102,15 @@ class IsEnrolledStudentOrAdmin(BasePermission):
     Para Turmas: admin vê tudo, aluno vê apenas turmas onde está matriculado
     """
 
+    @timed_permission
     def has_permission(self, request, view):
         if not request.user or not request.user.is_authenticated:
             return False
-        return True
 
+        # Escrita (criar turmas/recursos) só para admin
+        return request.user.is_staff or request.method in SAFE_METHODS
+
+    @timed_permission
     def has_object_permission(self, request, view, obj):
         if request.user.is_staff:
             return True
@@ -71,11 +118,7 @@ class IsEnrolledStudentOrAdmin(BasePermission):
         if request.method not in SAFE_METHODS:
             return False
 
-        try:
-            aluno = request.user.alunos
-            return obj.matriculas.filter(aluno=aluno).exists()
-        except:
-            return False
+        return obj.pk in get_turmas_matriculadas(request)
 
 
 class IsEnrolledAndResourceAccessible(BasePermission):
@@ -83,11 +126,15 @@ class IsEnrolledAndResourceAccessible(BasePermission):
     Para Recursos: admin vê tudo, aluno vê apenas recursos das turmas matriculadas
     """
 
+    @timed_permission
     def has_permission(self, request, view):
         if not request.user or not request.user.is_authenticated:
             return False
-        return True
 
+        # Escrita (criar turmas/recursos) só para admin
+        return request.user.is_staff or request.method in SAFE_METHODS
+
+    @timed_permission
     def has_object_permission(self, request, view, obj):
         if request.user.is_staff:
             return True
@@ -95,16 +142,7 @@ class IsEnrolledAndResourceAccessible(BasePermission):
         if request.method not in SAFE_METHODS:
             return False
 
-        try:
-            aluno = request.user.alunos
-            matriculado = obj.turma.matriculas.filter(aluno=aluno).exists()
-            if not matriculado:
-                return False
-
-            hoje = date.today()
-            if hoje < obj.turma.data_inicio:
-                return obj.acesso_previo
-            else:
-                return not obj.draft
-        except:
+        if obj.turma_id not in get_turmas_matriculadas(request):
             return False
+
+        return obj.liberado_em(date.today())
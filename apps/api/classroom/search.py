@@ -0,0 +1,176 @@
+import re
+import unicodedata
+
+from django.db import connection, transaction
+from django.db.models import F, FloatField, Func, Value
+from rest_framework.filters import BaseFilterBackend
+
+from .models import Aluno, Recurso, Turma
+
+# Campos indexados de cada modelo. O índice fica em `<tabela>_busca`, uma
+# linha por registro com o mesmo id (`rowid`): FTS5 no SQLite, `tsvector` com
+# GIN no PostgreSQL (ver migração 0010 e `models/busca.py`).
+CAMPOS = {
+    Aluno: ("nome", "email"),
+    Turma: ("nome",),
+    Recurso: ("nome", "descricao"),
+}
+
+BATCH_SIZE = 1000
+
+
+def tabela(model):
+    return f"{model._meta.db_table}_busca"
+
+
+def normalizar(texto):
+    """
+    Minúsculas, sem acentos e só com letras e dígitos: o mesmo texto é
+    indexado e consultado nos dois bancos (e `joao.silva@x.com` vira
+    `joao silva x com`).
+    """
+    texto = unicodedata.normalize("NFKD", texto or "")
+    texto = "".join(c for c in texto if not unicodedata.combining(c))
+    return " ".join(re.findall(r"[^\W_]+", texto.lower()))
+
+
+def documento(obj):
+    return normalizar(
+        " ".join(str(getattr(obj, campo) or "") for campo in CAMPOS[type(obj)])
+    )
+
+
+def consulta(termos):
+    """
+    Prefixo de cada termo, todos obrigatórios, no formato do banco.
+    """
+    if connection.vendor == "postgresql":
+        return " & ".join(f"{termo}:*" for termo in termos)
+
+    return " ".join(f'"{termo}"*' for termo in termos)
+
+
+class Relevancia(Func):
+    """
+    Relevância do registro na busca (maior é melhor): a coluna `rank` do FTS5
+    (o `bm25`, menor quanto mais relevante) ou `ts_rank` do PostgreSQL.
+    """
+
+    output_field = FloatField()
+
+    def __init__(self, documento, consulta):
+        super().__init__(documento, Value(consulta))
+
+    def as_sql(self, compiler, connection, **extra_context):
+        # Coluna oculta da tabela FTS5 do JOIN; a função `bm25()` não pode ser
+        # usada em consultas com GROUP BY (como a de turmas, com `Count`)
+        tabela = connection.ops.quote_name(self.source_expressions[0].alias)
+        return f"-{tabela}.rank", []
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        documento, documento_params = compiler.compile(self.source_expressions[0])
+        consulta, consulta_params = compiler.compile(self.source_expressions[1])
+        return (
+            f"ts_rank({documento}, to_tsquery('simple', {consulta}))",
+            [*documento_params, *consulta_params],
+        )
+
+
+def _gravar(model, linhas):
+    if connection.vendor == "postgresql":
+        sql = (
+            f"INSERT INTO {tabela(model)} (rowid, documento) "
+            f"VALUES (%s, to_tsvector('simple', %s)) "
+            f"ON CONFLICT (rowid) DO UPDATE SET documento = EXCLUDED.documento"
+        )
+    else:
+        sql = (
+            f"INSERT OR REPLACE INTO {tabela(model)} (rowid, documento) VALUES (%s, %s)"
+        )
+
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, linhas)
+
+
+def indexar(model, objetos):
+    """
+    Grava (ou substitui) o texto indexado de `objetos`.
+    """
+    linhas = [(obj.pk, documento(obj)) for obj in objetos]
+    for inicio in range(0, len(linhas), BATCH_SIZE):
+        _gravar(model, linhas[inicio : inicio + BATCH_SIZE])
+
+
+def remover(model, ids):
+    ids = [pk for pk in ids if pk is not None]
+    if ids:
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"DELETE FROM {tabela(model)} WHERE rowid = %s", [(pk,) for pk in ids]
+            )
+
+
+def reindexar(model):
+    """
+    Reconstrói o índice de `model` a partir da tabela; retorna o total.
+    """
+    total = 0
+    objetos = model.objects.only("pk", *CAMPOS[model]).order_by("pk")
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {tabela(model)}")
+
+        lote = []
+        for obj in objetos.iterator(chunk_size=BATCH_SIZE):
+            lote.append(obj)
+            if len(lote) == BATCH_SIZE:
+                indexar(model, lote)
+                total, lote = total + len(lote), []
+        indexar(model, lote)
+
+    return total + len(lote)
+
+
+def buscar(queryset, q):
+    """
+    `queryset` restrita aos registros que casam com `q` (prefixo de cada
+    palavra, todas obrigatórias), anotada com `relevancia`. O índice entra
+    como JOIN pelo id, e a relevância é calculada só para as linhas que casam.
+    """
+    termos = normalizar(q).split()
+    if not termos:
+        # Só pontuação: nada casa, mas a ordenação por relevância continua válida
+        return queryset.none().annotate(
+            relevancia=Value(0.0, output_field=FloatField())
+        )
+
+    texto = consulta(termos)
+    return queryset.filter(busca__documento__casa=texto).annotate(
+        relevancia=Relevancia(F("busca__documento"), texto)
+    )
+
+
+class FullTextSearchFilter(BaseFilterBackend):
+    """
+    `?q=` com o índice de busca, ordenado por relevância (com `id` como
+    desempate na paginação por cursor).
+    """
+
+    search_param = "q"
+
+    def get_search_terms(self, request):
+        return request.query_params.get(self.search_param, "").strip()
+
+    def filter_queryset(self, request, queryset, view):
+        q = self.get_search_terms(request)
+        if not q:
+            return queryset
+
+        return buscar(queryset, q)
+
+    def get_ordering(self, request, queryset, view):
+        # Lido pela paginação por cursor; sem busca, vale o `Meta.ordering`
+        if self.get_search_terms(request):
+            return ("-relevancia",)
+
+        return None
@@ -1,13 +1,29 @@
-from .aluno import AlunoSerializer
+from .aluno import AlunoSerializer, AlunoImportacaoSerializer
 from .treinamento import TreinamentoSerializer
-from .turma import TurmaSerializer
-from .matricula import MatriculaSerializer
-from .recurso import RecursoSerializer
+from .turma import TurmaSerializer, TurmaFiltroSerializer
+from .matricula import (
+    MatriculaSerializer,
+    MatriculaColegaSerializer,
+    MatriculaFiltroSerializer,
+)
+from .recurso import (
+    RecursoSerializer,
+    RecursoFiltroSerializer,
+    SincronizacaoSerializer,
+)
+from .busca import BuscaSerializer
 
 __all__ = [
     "AlunoSerializer",
+    "AlunoImportacaoSerializer",
     "TreinamentoSerializer",
     "TurmaSerializer",
+    "TurmaFiltroSerializer",
     "MatriculaSerializer",
+    "MatriculaColegaSerializer",
+    "MatriculaFiltroSerializer",
     "RecursoSerializer",
+    "RecursoFiltroSerializer",
+    "SincronizacaoSerializer",
+    "BuscaSerializer",
 ]
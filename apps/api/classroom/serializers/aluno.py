@@ -3,9 +3,10 @@ from django.db import transaction
 from rest_framework import serializers
 
 from ..models import Aluno
+from .sparse import SparseFieldsMixin
 
 
-class AlunoSerializer(serializers.ModelSerializer):
+class AlunoSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     user_id = serializers.IntegerField(source="user.id", read_only=True)
 
     class Meta:
@@ -66,3 +67,16 @@ class AlunoSerializer(serializers.ModelSerializer):
     def _gerar_senha_padrao(nome: str) -> str:
         prefixo = nome.strip().lower()[:3]
         return f"{prefixo}@123"
+
+
+class AlunoImportacaoSerializer(serializers.Serializer):
+    """
+    Validação de uma linha da importação em lote, sem consultas ao banco.
+    A unicidade do e-mail é verificada para o lote inteiro.
+    """
+
+    nome = serializers.CharField(max_length=100)
+    email = serializers.EmailField(max_length=254)
+    telefone = serializers.CharField(
+        max_length=15, required=False, allow_null=True, allow_blank=True
+    )
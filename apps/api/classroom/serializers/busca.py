@@ -0,0 +1,12 @@
+from rest_framework import serializers
+
+
+class BuscaSerializer(serializers.Serializer):
+    """
+    Parâmetros de `GET /api/search/`.
+    """
+
+    q = serializers.CharField(max_length=200)
+    limite = serializers.IntegerField(
+        required=False, default=10, min_value=1, max_value=50
+    )
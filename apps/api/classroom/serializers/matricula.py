@@ -1,9 +1,12 @@
 from rest_framework import serializers
 
 from ..models import Matricula
+from .aluno import AlunoSerializer
+from .sparse import SparseFieldsMixin
+from .turma import TurmaSerializer
 
 
-class MatriculaSerializer(serializers.ModelSerializer):
+class MatriculaSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     aluno_nome = serializers.CharField(source="aluno.nome", read_only=True)
     turma_nome = serializers.CharField(source="turma.nome", read_only=True)
 
@@ -18,6 +21,7 @@ class MatriculaSerializer(serializers.ModelSerializer):
             "data_matricula",
         ]
         read_only_fields = ["id", "data_matricula", "aluno_nome", "turma_nome"]
+        expandable_fields = {"aluno": AlunoSerializer, "turma": TurmaSerializer}
 
     def validate(self, data):
         aluno = data.get("aluno")
@@ -32,3 +36,24 @@ class MatriculaSerializer(serializers.ModelSerializer):
             )
 
         return data
+
+
+class MatriculaColegaSerializer(MatriculaSerializer):
+    """
+    Matrículas de uma turma vistas por um aluno (`/turmas/{id}/alunos/`):
+    sem `?expand=aluno`, que traria o e-mail e o telefone dos colegas.
+    """
+
+    class Meta(MatriculaSerializer.Meta):
+        expandable_fields = {"turma": TurmaSerializer}
+
+
+class MatriculaFiltroSerializer(serializers.Serializer):
+    """
+    Filtros de `GET /api/matriculas/` (ver `QueryParamFilter`).
+    """
+
+    aluno = serializers.IntegerField(required=False, min_value=1, source="aluno_id")
+    turma = serializers.IntegerField(required=False, min_value=1, source="turma_id")
+    data_matricula__gte = serializers.DateTimeField(required=False)
+    data_matricula__lte = serializers.DateTimeField(required=False)
@@ -1,9 +1,11 @@
 from rest_framework import serializers
 
 from ..models import Recurso
+from .sparse import SparseFieldsMixin
+from .turma import TurmaSerializer
 
 
-class RecursoSerializer(serializers.ModelSerializer):
+class RecursoSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     turma_nome = serializers.CharField(source="turma.nome", read_only=True)
     tipo_display = serializers.CharField(source="get_tipo_display", read_only=True)
 
@@ -29,3 +31,23 @@ class RecursoSerializer(serializers.ModelSerializer):
             "criado_em",
             "atualizado_em",
         ]
+        expandable_fields = {"turma": TurmaSerializer}
+
+
+class RecursoFiltroSerializer(serializers.Serializer):
+    """
+    Filtros de `GET /api/recursos/` (ver `QueryParamFilter`).
+    """
+
+    turma = serializers.IntegerField(required=False, min_value=1, source="turma_id")
+    tipo = serializers.ChoiceField(required=False, choices=Recurso.TipoRecurso.choices)
+    draft = serializers.BooleanField(required=False)
+
+
+class SincronizacaoSerializer(serializers.Serializer):
+    """
+    Parâmetros de `GET /api/recursos/changes/`.
+    """
+
+    since = serializers.DateTimeField(required=False)
+    turma = serializers.IntegerField(required=False, min_value=1)
@@ -0,0 +1,128 @@
+import functools
+
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+FIELDS_PARAM = "fields"
+EXPAND_PARAM = "expand"
+
+
+def nomes_pedidos(request, parametro):
+    """
+    Nomes separados por vírgula em `?<parametro>=`, sem repetições. Só nas
+    leituras: a escrita sempre usa e devolve todos os campos.
+    """
+    if request.method not in SAFE_METHODS:
+        return ()
+
+    valor = request.query_params.get(parametro, "")
+    nomes = (nome.strip() for nome in valor.split(","))
+    return tuple(dict.fromkeys(nome for nome in nomes if nome))
+
+
+def campos_pedidos(request, serializer_class):
+    """
+    `(fields, expand)` de `?fields=` e `?expand=`, validados contra
+    `serializer_class` e na ordem dos campos do serializer. `fields` é `None`
+    sem o parâmetro (todos os campos). Nome desconhecido responde 400.
+    """
+    fields = nomes_pedidos(request, FIELDS_PARAM)
+    expand = nomes_pedidos(request, EXPAND_PARAM)
+    if not fields and not expand:
+        return None, ()
+
+    disponiveis = _campos(serializer_class)
+    expansiveis = expandable_fields(serializer_class)
+
+    erros = {}
+    invalidos = [nome for nome in fields if nome not in disponiveis]
+    if invalidos:
+        erros[FIELDS_PARAM] = f"Campos inválidos: {', '.join(invalidos)}."
+    invalidos = [nome for nome in expand if nome not in expansiveis]
+    if invalidos:
+        erros[EXPAND_PARAM] = (
+            f"Campos não expansíveis: {', '.join(invalidos)}. "
+            f"Opções: {', '.join(expansiveis) or 'nenhuma'}."
+        )
+    if erros:
+        raise serializers.ValidationError(erros)
+
+    expand = tuple(nome for nome in disponiveis if nome in expand)
+    if not fields:
+        return None, expand
+
+    return tuple(nome for nome in disponiveis if nome in fields), expand
+
+
+@functools.cache
+def _campos(serializer_class):
+    return tuple(field.field_name for field in serializer_class()._readable_fields)
+
+
+@functools.cache
+def fontes(serializer_class):
+    """
+    Atributo do modelo lido por cada campo de `serializer_class`: a relação
+    em `turma.nome` e o campo em `get_tipo_display`.
+    """
+    origens = {}
+    for field in serializer_class()._readable_fields:
+        origem = field.source.split(".", 1)[0]
+        if origem.startswith("get_") and origem.endswith("_display"):
+            origem = origem[4:-8]
+        origens[field.field_name] = origem
+    return origens
+
+
+def expandable_fields(serializer_class):
+    meta = getattr(serializer_class, "Meta", None)
+    return getattr(meta, "expandable_fields", {})
+
+
+@functools.cache
+def campos_expandidos(serializer_class):
+    """
+    Campos de `serializer_class` dentro de uma expansão: só as colunas do
+    próprio modelo, sem os que pedem JOIN ou anotação (`turma_nome`,
+    `total_alunos`).
+    """
+    opts = serializer_class.Meta.model._meta
+    colunas = {field.name for field in opts.concrete_fields}
+    return tuple(
+        field.field_name
+        for field in serializer_class()._readable_fields
+        if field.source in colunas
+    )
+
+
+class SparseFieldsMixin:
+    """
+    Serializer com seleção de campos: `fields` mantém só os campos listados
+    e `expand` troca o id de uma relação de `Meta.expandable_fields` pelo
+    objeto (ver `campos_expandidos`). A view repassa `?fields=` e `?expand=`
+    (ver `SparseFieldsViewMixin`).
+    """
+
+    def __init__(self, *args, fields=None, expand=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.sparse_fields = fields
+        self.sparse_expand = expand
+
+    def get_fields(self):
+        campos = super().get_fields()
+        fields, expand = self.sparse_fields, self.sparse_expand
+
+        if fields is not None:
+            campos = {
+                nome: field
+                for nome, field in campos.items()
+                if nome in fields or nome in expand
+            }
+
+        for nome in expand:
+            relacionado = expandable_fields(type(self))[nome]
+            campos[nome] = relacionado(
+                read_only=True, fields=campos_expandidos(relacionado)
+            )
+
+        return campos
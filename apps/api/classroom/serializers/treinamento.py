@@ -1,12 +1,18 @@
 from rest_framework import serializers
 
 from ..models import Treinamento
+from .sparse import SparseFieldsMixin
 
 
-class TreinamentoSerializer(serializers.ModelSerializer):
-    total_turmas = serializers.IntegerField(source="turmas.count", read_only=True)
+class TreinamentoSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    total_turmas = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Treinamento
         fields = ["id", "nome", "descricao", "total_turmas"]
         read_only_fields = ["id", "total_turmas"]
+
+    def create(self, validated_data):
+        treinamento = super().create(validated_data)
+        treinamento.total_turmas = 0
+        return treinamento
@@ -1,11 +1,13 @@
 from rest_framework import serializers
 
 from ..models import Turma
+from .sparse import SparseFieldsMixin
+from .treinamento import TreinamentoSerializer
 
 
-class TurmaSerializer(serializers.ModelSerializer):
+class TurmaSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     treinamento_nome = serializers.CharField(source="treinamento.nome", read_only=True)
-    total_alunos = serializers.IntegerField(source="matriculas.count", read_only=True)
+    total_alunos = serializers.IntegerField(read_only=True)
 
     link_acesso = serializers.URLField(
         allow_blank=False, allow_null=True, required=False
@@ -24,6 +26,12 @@ class TurmaSerializer(serializers.ModelSerializer):
             "total_alunos",
         ]
         read_only_fields = ["id", "treinamento_nome", "total_alunos"]
+        expandable_fields = {"treinamento": TreinamentoSerializer}
+
+    def create(self, validated_data):
+        turma = super().create(validated_data)
+        turma.total_alunos = 0
+        return turma
 
     def validate(self, data):
         data_inicio = data.get("data_inicio")
@@ -37,3 +45,17 @@ class TurmaSerializer(serializers.ModelSerializer):
             )
 
         return data
+
+
+class TurmaFiltroSerializer(serializers.Serializer):
+    """
+    Filtros de `GET /api/turmas/` (ver `QueryParamFilter`).
+    """
+
+    treinamento = serializers.IntegerField(
+        required=False, min_value=1, source="treinamento_id"
+    )
+    data_inicio__gte = serializers.DateField(required=False)
+    data_inicio__lte = serializers.DateField(required=False)
+    data_conclusao__gte = serializers.DateField(required=False)
+    data_conclusao__lte = serializers.DateField(required=False)
@@ -0,0 +1,180 @@
+import functools
+
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.db.models import F
+from rest_framework import ISO_8601, serializers
+from rest_framework.relations import PrimaryKeyRelatedField
+from rest_framework.settings import api_settings
+
+from .sparse import campos_expandidos, expandable_fields
+
+# Campos cujo `to_representation` não muda o valor já convertido pelo banco
+_SEM_CONVERSAO = (
+    serializers.CharField,
+    serializers.IntegerField,
+    serializers.BooleanField,
+    PrimaryKeyRelatedField,
+)
+
+
+class ValuesRepresentation:
+    """
+    Serialização somente leitura de listagens direto de `.values()`.
+
+    Monta, a partir dos campos de um `ModelSerializer`, as colunas do
+    `.values()` (campos do modelo, anotações da queryset e `F()` para as
+    fontes com ponto, como `turma.nome`) e a conversão de cada uma. Os
+    `get_<campo>_display` viram um dicionário pré-calculado das choices.
+    Nenhuma instância de modelo é criada e o JSON gerado é o mesmo do
+    serializer.
+
+    Com `fields` (ver `SparseFieldsMixin`), só as colunas e JOINs dos campos
+    pedidos entram na consulta, mais o `id` e os campos de `ordenacao` (e do
+    `Meta.ordering`), lidos pela paginação por cursor. Cada relação de
+    `expand` vira um objeto com as colunas do modelo relacionado.
+    """
+
+    def __init__(self, serializer_class, fields=None, expand=(), ordenacao=()):
+        serializer = serializer_class()
+        model = serializer.Meta.model
+
+        self.campos = []
+        self.expressoes = {}
+        self.colunas = []
+        self.aninhados = []
+
+        for field in serializer._readable_fields:
+            nome, origem = field.field_name, field.source
+            if fields is not None and nome not in fields and nome not in expand:
+                continue
+
+            if origem.startswith("get_") and origem.endswith("_display"):
+                campo_modelo = model._meta.get_field(origem[4:-8])
+                choices = {
+                    valor: str(label) for valor, label in campo_modelo.flatchoices
+                }
+                self.colunas.append((nome, campo_modelo.attname, _display(choices)))
+                self._selecionar(campo_modelo.attname)
+                continue
+
+            if "." in origem:
+                relacao, atributo = origem.split(".", 1)
+                campo_modelo = model._meta.get_field(relacao)
+                if atributo in ("id", "pk"):
+                    # O id do relacionado já está na tabela: sem JOIN
+                    chave = campo_modelo.attname
+                    self._selecionar(chave)
+                else:
+                    chave = nome
+                    self.expressoes[chave] = F(origem.replace(".", "__"))
+            else:
+                chave = origem
+                self._selecionar(chave)
+
+            self.colunas.append((nome, chave, _conversor(field)))
+            if nome in expand:
+                self._expandir(nome, model._meta.get_field(origem), serializer_class)
+
+        if fields is not None:
+            for campo in ("id", *model._meta.ordering, *ordenacao):
+                self._selecionar(campo.lstrip("-"))
+
+    def _expandir(self, nome, relacao, serializer_class):
+        relacionado = expandable_fields(serializer_class)[nome]
+        representacao = values_representation(
+            relacionado, campos_expandidos(relacionado)
+        )
+
+        subcolunas = []
+        for subnome, subchave, conversor in representacao.colunas:
+            chave = f"{nome}__{subchave}"
+            self.expressoes[chave] = F(f"{relacao.name}__{subchave}")
+            subcolunas.append((subnome, chave, conversor))
+
+        self.aninhados.append((nome, subcolunas))
+
+    def _selecionar(self, campo):
+        if campo not in self.campos:
+            self.campos.append(campo)
+
+    def queryset(self, queryset):
+        """
+        `queryset` reduzida às colunas usadas, devolvendo dicionários. As
+        demais anotações (como a `relevancia` da busca) também são lidas, para
+        a ordenação da paginação; `data()` as ignora.
+        """
+        anotacoes = [
+            nome for nome in queryset.query.annotations if nome not in self.campos
+        ]
+        return queryset.values(*self.campos, *anotacoes, **self.expressoes)
+
+    def data(self, rows):
+        colunas = self.colunas
+        dados = [
+            {
+                nome: None if row[chave] is None else conversor(row[chave])
+                for nome, chave, conversor in colunas
+            }
+            for row in rows
+        ]
+
+        for nome, subcolunas in self.aninhados:
+            # O id da relação já ocupa a posição do campo no JSON
+            for item, row in zip(dados, rows):
+                if item[nome] is not None:
+                    item[nome] = {
+                        subnome: None if row[chave] is None else conversor(row[chave])
+                        for subnome, chave, conversor in subcolunas
+                    }
+
+        return dados
+
+
+def _conversor(field):
+    if isinstance(field, _SEM_CONVERSAO):
+        return _identidade
+    # Em ISO 8601, o renderer formata `date`/`datetime` como o campo faria:
+    # basta levar o datetime para o fuso atual.
+    if isinstance(field, serializers.DateTimeField) and _iso_8601(
+        field, api_settings.DATETIME_FORMAT
+    ):
+        return field.enforce_timezone
+    if isinstance(field, serializers.DateField) and _iso_8601(
+        field, api_settings.DATE_FORMAT
+    ):
+        return _identidade
+    if isinstance(field, serializers.ModelSerializer) or field.source == "*":
+        raise ImproperlyConfigured(
+            f"Campo {field.field_name!r} não suportado por ValuesRepresentation."
+        )
+    return field.to_representation
+
+
+def _iso_8601(field, padrao):
+    formato = getattr(field, "format", padrao)
+    return isinstance(formato, str) and formato.lower() == ISO_8601
+
+
+def _identidade(valor):
+    return valor
+
+
+def _display(choices):
+    def conversor(valor):
+        return choices.get(valor, valor)
+
+    return conversor
+
+
+# Uma por combinação de `?fields=`/`?expand=` pedida; as combinações já vêm
+# validadas e normalizadas (ver `campos_pedidos`), mas são muitas
+@functools.lru_cache(maxsize=512)
+def values_representation(serializer_class, fields=None, expand=(), ordenacao=()):
+    """
+    `ValuesRepresentation` de `serializer_class` (e da seleção de campos),
+    criada uma vez por processo.
+    """
+    try:
+        return ValuesRepresentation(serializer_class, fields, expand, ordenacao)
+    except FieldDoesNotExist as exc:
+        raise ImproperlyConfigured(f"{serializer_class.__name__}: {exc}") from exc
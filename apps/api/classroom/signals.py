@@ -0,0 +1,298 @@
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from core.authentication import revogar_tokens
+
+from . import search
+from .cache import invalidate_on_commit
+from .models import Aluno, Matricula, Recurso, Remocao, Treinamento, Turma
+
+# Endpoints (basename do router) cujas respostas dependem de cada modelo. O
+# painel do aluno (`/api/me/dashboard`) tem a chave pela versão dos dados do
+# aluno (`versao_painel`) e não precisa de invalidação.
+DEPENDENCIAS = {
+    Aluno: ("aluno", "matricula"),
+    Treinamento: ("treinamento", "turma"),
+    Turma: ("turma", "treinamento", "matricula", "recurso"),
+    Matricula: ("matricula", "turma", "recurso"),
+    Recurso: ("recurso",),
+}
+
+
+def invalidar_respostas(sender, **kwargs):
+    invalidate_on_commit(*DEPENDENCIAS[sender])
+
+
+for model in DEPENDENCIAS:
+    post_save.connect(
+        invalidar_respostas,
+        sender=model,
+        dispatch_uid=f"cache-save-{model.__name__}",
+    )
+    post_delete.connect(
+        invalidar_respostas,
+        sender=model,
+        dispatch_uid=f"cache-delete-{model.__name__}",
+    )
+
+
+# Pais exibidos com totais dos filhos (`total_alunos`, `total_turmas`): o
+# `atualizado_em` do pai, usado nos ETags (`classroom/conditional.py`), muda
+# junto com os filhos.
+PAIS = {
+    Matricula: ("turma_id", Turma),
+    Turma: ("treinamento_id", Treinamento),
+}
+
+
+def tocar(model, ids):
+    """
+    Atualiza o `atualizado_em` dos registros, sem disparar sinais.
+    """
+    ids = {pk for pk in ids if pk is not None}
+    if ids:
+        model.objects.filter(pk__in=ids).update(atualizado_em=timezone.now())
+
+
+def _ancestrais(model):
+    while model in PAIS:
+        model = PAIS[model][1]
+        yield model
+
+
+# Valores lidos antes de uma alteração: o pai (filho movido para outro pai,
+# o anterior também perde um item), os campos da turma exibidos nos recursos
+# e o do treinamento exibido nas turmas.
+CAMPOS_ANTERIORES = {
+    Treinamento: ("nome",),
+    Matricula: ("turma_id",),
+    Turma: ("treinamento_id", "nome", "data_inicio"),
+    Recurso: ("turma_id",),
+}
+
+
+def guardar_anterior(sender, instance, **kwargs):
+    if instance.pk is not None:
+        instance._anterior = (
+            sender.objects.filter(pk=instance.pk)
+            .values(*CAMPOS_ANTERIORES[sender])
+            .first()
+        )
+
+
+def _anterior(instance, campo):
+    return (getattr(instance, "_anterior", None) or {}).get(campo)
+
+
+def tocar_pai(sender, instance, origin=None, **kwargs):
+    campo, pai = PAIS[sender]
+
+    # Em cascata a partir de um ancestral, o próprio pai está sendo removido
+    origem = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if origin is not None and origem in set(_ancestrais(sender)):
+        return
+
+    ids = {getattr(instance, campo), _anterior(instance, campo)}
+    if origin is None or origin is instance:
+        tocar(pai, ids)
+        return
+
+    # Exclusão em lote ou em cascata (ex.: aluno removido com as matrículas):
+    # um UPDATE por pai ao fim da transação da exclusão, e não um por filho.
+    _pendentes(origin, "_pais_a_tocar", tocar).setdefault(pai, set()).update(ids)
+
+
+def _pendentes(origin, atributo, acao):
+    """
+    Ids por modelo acumulados durante a exclusão de `origin`, passados a
+    `acao(model, ids)` quando a transação for confirmada.
+    """
+    pendentes = getattr(origin, atributo, None)
+    if pendentes is None:
+        pendentes = {}
+        setattr(origin, atributo, pendentes)
+        transaction.on_commit(
+            lambda: [acao(model, ids) for model, ids in pendentes.items()]
+        )
+    return pendentes
+
+
+for model in CAMPOS_ANTERIORES:
+    pre_save.connect(
+        guardar_anterior,
+        sender=model,
+        dispatch_uid=f"anterior-pre-save-{model.__name__}",
+    )
+
+for model in PAIS:
+    post_save.connect(
+        tocar_pai,
+        sender=model,
+        dispatch_uid=f"etag-save-{model.__name__}",
+    )
+    post_delete.connect(
+        tocar_pai,
+        sender=model,
+        dispatch_uid=f"etag-delete-{model.__name__}",
+    )
+
+
+@receiver(post_save, sender=Turma, dispatch_uid="sync-turma-save")
+def tocar_recursos(sender, instance, created=False, **kwargs):
+    """
+    Turma renomeada ou com outra data de início: a representação
+    (`turma_nome`) ou a visibilidade dos recursos muda, e eles voltam para a
+    sincronização incremental (`classroom/sync.py`).
+    """
+    anterior = getattr(instance, "_anterior", None)
+    if created or not anterior:
+        return
+
+    if any(
+        anterior[campo] != getattr(instance, campo) for campo in ("nome", "data_inicio")
+    ):
+        Recurso.objects.filter(turma_id=instance.pk).update(
+            atualizado_em=timezone.now()
+        )
+
+
+@receiver(post_save, sender=Treinamento, dispatch_uid="painel-treinamento-save")
+def tocar_turmas(sender, instance, created=False, **kwargs):
+    """
+    Treinamento renomeado: muda a representação (`treinamento_nome`) das
+    turmas, e com ela a versão do painel dos alunos (`versao_painel`).
+    """
+    if not created and _anterior(instance, "nome") not in (None, instance.nome):
+        Turma.objects.filter(treinamento_id=instance.pk).update(
+            atualizado_em=timezone.now()
+        )
+
+
+@receiver(post_save, sender=Recurso, dispatch_uid="sync-recurso-save")
+def registrar_recurso_movido(sender, instance, created=False, **kwargs):
+    # Recurso movido de turma: some para os alunos da turma anterior
+    turma_anterior = _anterior(instance, "turma_id")
+    if not created and turma_anterior not in (None, instance.turma_id):
+        Remocao.objects.create(
+            tipo=Remocao.Tipo.RECURSO, objeto_id=instance.pk, turma_id=turma_anterior
+        )
+
+
+TIPOS_REMOCAO = {
+    Turma: Remocao.Tipo.TURMA,
+    Recurso: Remocao.Tipo.RECURSO,
+    Matricula: Remocao.Tipo.MATRICULA,
+}
+
+
+@receiver(post_delete, sender=Recurso, dispatch_uid="sync-recurso-delete")
+@receiver(post_delete, sender=Turma, dispatch_uid="sync-turma-delete")
+@receiver(post_delete, sender=Matricula, dispatch_uid="sync-matricula-delete")
+def registrar_remocao(sender, instance, origin=None, **kwargs):
+    """
+    Registra a exclusão para a sincronização incremental. Em cascata, a
+    turma removida já cobre seus recursos, e as matrículas de um aluno
+    removido não têm mais quem as sincronize.
+
+    As matrículas removidas com a turma também são registradas: é por elas
+    que só os alunos da turma recebem a remoção. O `Collector` apaga as
+    matrículas antes da turma, que as grava no mesmo INSERT.
+    """
+    origem = origin.model if isinstance(origin, QuerySet) else type(origin)
+    remocao = Remocao(
+        tipo=TIPOS_REMOCAO[sender],
+        objeto_id=instance.pk,
+        turma_id=instance.pk if sender is Turma else instance.turma_id,
+        aluno_id=getattr(instance, "aluno_id", None),
+    )
+
+    if sender is Matricula and origem in (Turma, Treinamento):
+        _remocoes_pendentes(origin).append(remocao)
+        return
+    if sender is not Turma and origin is not None and origem is not sender:
+        return
+
+    remocoes = [remocao]
+    if sender is Turma and origin is not None:
+        remocoes += _remocoes_pendentes(origin)
+        origin._remocoes_pendentes = []
+
+    Remocao.objects.bulk_create(remocoes)
+
+
+def _remocoes_pendentes(origin):
+    if not hasattr(origin, "_remocoes_pendentes"):
+        origin._remocoes_pendentes = []
+    return origin._remocoes_pendentes
+
+
+def indexar_busca(sender, instance, update_fields=None, **kwargs):
+    """
+    Mantém o índice de busca (`classroom/search.py`) em dia com o registro.
+    """
+    if update_fields is None or set(update_fields) & set(search.CAMPOS[sender]):
+        search.indexar(sender, [instance])
+
+
+def remover_busca(sender, instance, origin=None, **kwargs):
+    if origin is None or origin is instance:
+        search.remover(sender, [instance.pk])
+        return
+
+    # Em cascata (ex.: turma removida com os recursos), um DELETE por modelo
+    _pendentes(origin, "_busca_a_remover", search.remover).setdefault(
+        sender, set()
+    ).add(instance.pk)
+
+
+for model in search.CAMPOS:
+    post_save.connect(
+        indexar_busca,
+        sender=model,
+        dispatch_uid=f"busca-save-{model.__name__}",
+    )
+    post_delete.connect(
+        remover_busca,
+        sender=model,
+        dispatch_uid=f"busca-delete-{model.__name__}",
+    )
+
+
+@receiver(pre_save, sender=User, dispatch_uid="revogar-tokens-save")
+def revogar_tokens_alterados(sender, instance, **kwargs):
+    """
+    Revoga os tokens do usuário quando muda algo que as claims ou o login
+    dependem: `is_active`, `is_staff` ou a senha.
+    """
+    if not settings.JWT_REVOCATION_CHECK or instance.pk is None:
+        return
+
+    anterior = (
+        User.objects.filter(pk=instance.pk)
+        .values("is_active", "is_staff", "password")
+        .first()
+    )
+    if not anterior:
+        return
+
+    alterados = {
+        campo for campo, valor in anterior.items() if valor != getattr(instance, campo)
+    }
+    # `_password` só é preenchido por `set_password()`: sem ele, a troca do
+    # hash é o rehash transparente feito no login e a senha é a mesma.
+    if alterados == {"password"} and instance._password is None:
+        return
+
+    if alterados:
+        revogar_tokens(instance.pk)
+
+
+@receiver(post_delete, sender=User, dispatch_uid="revogar-tokens-delete")
+def revogar_tokens_removidos(sender, instance, **kwargs):
+    if settings.JWT_REVOCATION_CHECK:
+        revogar_tokens(instance.pk)
@@ -0,0 +1,120 @@
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from .models import Aluno, Matricula, Recurso, Remocao, Turma
+from .models.recurso import liberado_q
+from .permissions import get_turmas_matriculadas
+from .serializers import RecursoSerializer
+from .serializers.values import values_representation
+
+# O cursor devolvido fica um pouco antes do início da consulta: uma escrita
+# com `atualizado_em` anterior, mas confirmada depois da leitura, entra na
+# próxima sincronização. Reenviar um recurso inalterado é inofensivo.
+MARGEM_CURSOR = timedelta(seconds=5)
+
+
+class CursorExpirado(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = (
+        "Cursor anterior ao registro de remoções. Sincronize novamente sem `since`."
+    )
+    default_code = "cursor_expirado"
+
+
+def alteracoes_recursos(request, since=None, turma=None):
+    """
+    Sincronização incremental dos recursos visíveis ao usuário da requisição.
+
+    Com `since`, devolve os recursos criados ou alterados depois dele (e, para
+    o aluno, os das turmas em que se matriculou ou que começaram desde então),
+    os ids dos recursos removidos ou que deixaram de ser visíveis e os ids
+    das turmas removidas ou canceladas. Sem `since`, todos os recursos
+    visíveis. O `cursor` é o `since` da próxima chamada; o cliente aplica as
+    remoções antes dos `alterados`.
+    """
+    agora = timezone.now()
+    if since is not None and since < agora - timedelta(
+        days=settings.SYNC_RETENTION_DAYS
+    ):
+        raise CursorExpirado()
+
+    user = request.user
+    recursos = Recurso.objects.all()
+    if turma is not None:
+        recursos = recursos.filter(turma_id=turma)
+
+    if user.is_staff:
+        alterados = recursos
+        ocultos = Recurso.objects.none()
+        remocoes = Q(tipo__in=(Remocao.Tipo.RECURSO, Remocao.Tipo.TURMA))
+    else:
+        turmas = get_turmas_matriculadas(request)
+        recursos = recursos.filter(turma_id__in=turmas)
+        hoje = date.today()
+        alterados = recursos.filter(liberado_q(hoje))
+        ocultos = recursos.exclude(liberado_q(hoje))
+        # A turma removida chega ao aluno pelas matrículas removidas com ela
+        remocoes = Q(tipo=Remocao.Tipo.RECURSO, turma_id__in=turmas) | (
+            Q(tipo=Remocao.Tipo.MATRICULA) & _do_aluno(user)
+        )
+
+    if since is not None:
+        alteracao = Q(atualizado_em__gt=since)
+        if not user.is_staff:
+            # Visíveis sem alteração no recurso: matrícula nova ou turma que
+            # começou desde o cursor
+            novas = Matricula.objects.do_usuario(user).filter(data_matricula__gt=since)
+            iniciadas = Turma.objects.filter(
+                data_inicio__gt=timezone.localdate(since), data_inicio__lte=hoje
+            )
+            alteracao |= Q(turma_id__in=novas.values("turma_id")) | Q(
+                turma_id__in=iniciadas.values("pk")
+            )
+        alterados = alterados.filter(alteracao)
+        ocultos = ocultos.filter(atualizado_em__gt=since)
+
+    representacao = values_representation(RecursoSerializer)
+    dados = representacao.data(
+        representacao.queryset(alterados.order_by("atualizado_em", "id"))
+    )
+
+    removidos, turmas_removidas = set(), set()
+    if since is not None:
+        removidos.update(ocultos.values_list("id", flat=True))
+
+        registradas = Remocao.objects.filter(remocoes, removido_em__gt=since)
+        if turma is not None:
+            registradas = registradas.filter(turma_id=turma)
+        for tipo, objeto_id, turma_id in registradas.values_list(
+            "tipo", "objeto_id", "turma_id"
+        ):
+            if tipo == Remocao.Tipo.RECURSO:
+                removidos.add(objeto_id)
+            else:
+                turmas_removidas.add(turma_id)
+
+        # Recurso movido para outra turma visível, ou aluno matriculado de novo
+        removidos.difference_update(recurso["id"] for recurso in dados)
+        if not user.is_staff:
+            turmas_removidas.difference_update(get_turmas_matriculadas(request))
+
+    return {
+        "cursor": agora - MARGEM_CURSOR,
+        "alterados": dados,
+        "removidos": sorted(removidos),
+        "turmas_removidas": sorted(turmas_removidas),
+    }
+
+
+def _do_aluno(user):
+    # Mesma regra de `MatriculaQuerySet.do_usuario`, para a remoção registrada
+    aluno_id = getattr(user, "aluno_id", None)
+    if aluno_id is not None:
+        return Q(aluno_id=aluno_id)
+
+    return Q(aluno_id__in=Aluno.objects.filter(user_id=user.pk).values("pk"))
@@ -1,3 +1,1513 @@
-from django.test import TestCase
+import importlib.util
+import io
+import json
+import re
+import threading
+from datetime import date, datetime, timedelta
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+from itertools import combinations
+from unittest import mock, skipUnless
+from urllib.parse import urlencode
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.cache import cache, caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import (
+    AsyncClient,
+    AsyncRequestFactory,
+    TestCase,
+    override_settings,
+)
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework import serializers
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from core.throttling import LoginIPRateThrottle, LoginRateThrottle
+
+from .cache import CACHE_ALIAS, stats
+from .models import Aluno, Matricula, Recurso, Treinamento, Turma
+from .views import MatriculaViewSet, RecursoViewSet, TurmaViewSet
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class ClassroomTestCase(TestCase):
+    """
+    Base dos testes: um admin, dois alunos e duas turmas, com o aluno
+    matriculado só na primeira.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            username="admin@teste.local", password="admin", is_staff=True
+        )
+        cls.aluno = cls.criar_aluno("Ana Souza", "ana@teste.local")
+        cls.colega = cls.criar_aluno("Bruno Lima", "bruno@teste.local")
+
+        cls.treinamento = Treinamento.objects.create(nome="Python")
+        cls.turma = cls.criar_turma("Turma A", date.today() - timedelta(days=30))
+        cls.outra_turma = cls.criar_turma("Turma B", date.today() - timedelta(days=30))
+
+        Matricula.objects.create(aluno=cls.aluno, turma=cls.turma)
+        Matricula.objects.create(aluno=cls.colega, turma=cls.turma)
+        Matricula.objects.create(aluno=cls.colega, turma=cls.outra_turma)
+
+    @classmethod
+    def criar_aluno(cls, nome, email):
+        user = User.objects.create_user(username=email, email=email, password="x")
+        return Aluno.objects.create(user=user, nome=nome, email=email)
+
+    @classmethod
+    def criar_turma(cls, nome, data_inicio):
+        return Turma.objects.create(
+            treinamento=cls.treinamento, nome=nome, data_inicio=data_inicio
+        )
+
+    @classmethod
+    def criar_recurso(cls, turma, nome, **kwargs):
+        kwargs.setdefault("tipo", Recurso.TipoRecurso.PDF)
+        return Recurso.objects.create(turma=turma, nome=nome, **kwargs)
+
+    def setUp(self):
+        caches[CACHE_ALIAS].clear()
+        cache.clear()
+
+    def cliente(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+
+    def token(self, user, senha="x"):
+        """
+        Token de acesso emitido pelo login, como um cliente real o obtém.
+        """
+        response = APIClient().post(
+            "/api/auth/token",
+            {"username": user.username, "password": senha},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.data["access"]
+
+
+class PaginacaoTests(ClassroomTestCase):
+    """
+    Paginação por cursor: as páginas, nos dois sentidos, cobrem a listagem
+    sem repetir nem pular itens, inclusive com empates na ordenação.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        inicio = date.today() - timedelta(days=10)
+        for i in range(5):
+            # Mesma `data_inicio`: o `id` desempata
+            cls.criar_turma(f"Turma {i}", inicio)
+
+    def percorrer(self, url):
+        client = self.cliente(self.admin)
+        paginas, proxima = [], url
+        while proxima:
+            response = client.get(proxima)
+            self.assertEqual(response.status_code, 200)
+            paginas.append(response.data)
+            proxima = response.data["next"]
+        return paginas
+
+    def test_percorre_todas_as_paginas(self):
+        esperado = list(
+            Turma.objects.order_by("-data_inicio", "-id").values_list("id", flat=True)
+        )
+
+        paginas = self.percorrer("/api/turmas/?page_size=2")
+
+        self.assertEqual(len(paginas), 4)
+        ids = [turma["id"] for pagina in paginas for turma in pagina["results"]]
+        self.assertEqual(ids, esperado)
+
+    def test_volta_pelas_paginas_anteriores(self):
+        client = self.cliente(self.admin)
+        paginas = self.percorrer("/api/turmas/?page_size=2")
+
+        anterior = paginas[-1]["previous"]
+        for pagina in reversed(paginas[:-1]):
+            response = client.get(anterior)
+            self.assertEqual(response.data["results"], pagina["results"])
+            anterior = response.data["previous"]
+
+        self.assertIsNone(anterior)
+
+    def test_ordenacao_pedida(self):
+        paginas = self.percorrer("/api/turmas/?page_size=3&ordering=nome")
+
+        nomes = [turma["nome"] for pagina in paginas for turma in pagina["results"]]
+        self.assertEqual(nomes, sorted(nomes))
+        self.assertEqual(len(nomes), Turma.objects.count())
+
+    def test_cursor_invalido(self):
+        response = self.cliente(self.admin).get("/api/turmas/?cursor=invalido")
+
+        self.assertEqual(response.status_code, 404)
+
+
+class VisibilidadeTests(ClassroomTestCase):
+    """
+    `Recurso.objects.visible_to`: matriculado na turma, publicado e turma já
+    iniciada ou com acesso prévio.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.futura = cls.criar_turma("Turma Futura", date.today() + timedelta(days=7))
+        Matricula.objects.create(aluno=cls.aluno, turma=cls.futura)
+
+        cls.publicado = cls.criar_recurso(cls.turma, "Publicado")
+        cls.rascunho = cls.criar_recurso(cls.turma, "Rascunho", draft=True)
+        cls.previo = cls.criar_recurso(cls.futura, "Prévio", acesso_previo=True)
+        cls.fechado = cls.criar_recurso(cls.futura, "Fechado")
+        cls.alheio = cls.criar_recurso(cls.outra_turma, "Alheio")
+
+    def test_visible_to(self):
+        visiveis = Recurso.objects.visible_to(self.aluno.user)
+
+        self.assertCountEqual(visiveis, [self.publicado, self.previo])
+
+    def test_visible_to_na_data_de_inicio(self):
+        visiveis = Recurso.objects.visible_to(
+            self.aluno.user, today=self.futura.data_inicio
+        )
+
+        self.assertCountEqual(visiveis, [self.publicado, self.previo, self.fechado])
+
+    def test_listagem_e_detalhe_do_aluno(self):
+        client = self.cliente(self.aluno.user)
+
+        response = client.get("/api/recursos/")
+        self.assertCountEqual(
+            [recurso["id"] for recurso in response.data["results"]],
+            [self.publicado.pk, self.previo.pk],
+        )
+        for recurso in (self.rascunho, self.fechado, self.alheio):
+            with self.subTest(recurso=recurso.nome):
+                response = client.get(f"/api/recursos/{recurso.pk}/")
+                self.assertEqual(response.status_code, 404)
+
+    def test_admin_ve_todos(self):
+        response = self.cliente(self.admin).get("/api/recursos/")
+
+        self.assertEqual(len(response.data["results"]), Recurso.objects.count())
+
+
+class TotaisEPermissoesTests(ClassroomTestCase):
+    """
+    `total_alunos` e `total_turmas` calculados no banco, e uma única
+    consulta das matrículas do aluno por requisição, compartilhada entre a
+    queryset e as permissões de objeto.
+    """
+
+    def test_totais(self):
+        vazio = Treinamento.objects.create(nome="Sem turmas")
+        sem_alunos = self.criar_turma("Turma C", date.today())
+        client = self.cliente(self.admin)
+
+        turmas = {
+            turma["id"]: turma["total_alunos"]
+            for turma in client.get("/api/turmas/").data["results"]
+        }
+        self.assertEqual(
+            turmas, {self.turma.pk: 2, self.outra_turma.pk: 1, sem_alunos.pk: 0}
+        )
+        response = client.get(f"/api/turmas/{self.turma.pk}/")
+        self.assertEqual(response.data["total_alunos"], 2)
+
+        treinamentos = {
+            treinamento["id"]: treinamento["total_turmas"]
+            for treinamento in client.get("/api/treinamentos/").data["results"]
+        }
+        self.assertEqual(treinamentos, {self.treinamento.pk: 3, vazio.pk: 0})
+
+        response = client.get(f"/api/treinamentos/{self.treinamento.pk}/turmas/")
+        self.assertEqual(
+            {turma["id"]: turma["total_alunos"] for turma in response.data["results"]},
+            turmas,
+        )
+
+    def test_uma_consulta_das_matriculas_no_detalhe(self):
+        recurso = self.criar_recurso(self.turma, "Apostila")
+        client = self.cliente(self.aluno.user)
+
+        for url in (f"/api/turmas/{self.turma.pk}/", f"/api/recursos/{recurso.pk}/"):
+            with self.subTest(url=url):
+                with CaptureQueriesContext(connection) as capturadas:
+                    response = client.get(url)
+
+                self.assertEqual(response.status_code, 200)
+                # As demais só citam as matrículas numa subconsulta
+                matriculas = [
+                    consulta
+                    for consulta in capturadas.captured_queries
+                    if consulta["sql"].startswith('SELECT "classroom_matricula"')
+                ]
+                self.assertEqual(len(matriculas), 1)
+                # Validador do ETag, objeto e matrículas
+                self.assertEqual(len(capturadas), 3)
+
+
+class MatriculaEmLoteTests(ClassroomTestCase):
+    """
+    `POST /api/matriculas/lote/`: resultado por linha e consultas que não
+    crescem com o tamanho do lote.
+    """
+
+    url = "/api/matriculas/lote/"
+
+    def test_resultado_por_linha(self):
+        linhas = [
+            {"aluno": self.aluno.pk, "turma": self.outra_turma.pk},
+            {"aluno": self.colega.pk, "turma": self.turma.pk},
+            {"aluno": self.aluno.pk, "turma": self.outra_turma.pk},
+            {"aluno": self.aluno.pk, "turma": 999999},
+            {"aluno": self.aluno.pk},
+        ]
+
+        response = self.cliente(self.admin).post(self.url, linhas, format="json")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [resultado["status"] for resultado in response.data["resultados"]],
+            ["criado", "duplicado", "duplicado", "erro", "erro"],
+        )
+        self.assertEqual(
+            (
+                response.data["criados"],
+                response.data["duplicados"],
+                response.data["erros"],
+            ),
+            (1, 2, 2),
+        )
+        self.assertTrue(
+            Matricula.objects.filter(aluno=self.aluno, turma=self.outra_turma).exists()
+        )
+
+    def test_atualiza_o_total_de_alunos_em_cache(self):
+        client = self.cliente(self.admin)
+        url = f"/api/turmas/{self.outra_turma.pk}/"
+        self.assertEqual(client.get(url).data["total_alunos"], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            client.post(
+                self.url,
+                [{"aluno": self.aluno.pk, "turma": self.outra_turma.pk}],
+                format="json",
+            )
+
+        self.assertEqual(client.get(url).data["total_alunos"], 2)
+
+    def test_consultas_nao_crescem_com_o_lote(self):
+        client = self.cliente(self.admin)
+        turmas = [self.criar_turma(f"Turma {i}", date.today()) for i in range(6)]
+
+        def matricular(turmas):
+            linhas = [{"aluno": self.aluno.pk, "turma": turma.pk} for turma in turmas]
+            with CaptureQueriesContext(connection) as capturadas:
+                response = client.post(self.url, linhas, format="json")
+            self.assertEqual(response.data["criados"], len(turmas))
+            return len(capturadas)
+
+        self.assertEqual(matricular(turmas[:1]), matricular(turmas[1:]))
+
+    def test_csv(self):
+        arquivo = SimpleUploadedFile(
+            "matriculas.csv",
+            f"aluno,turma\n{self.aluno.pk},{self.outra_turma.pk}\n".encode(),
+            content_type="text/csv",
+        )
+
+        response = self.cliente(self.admin).post(
+            self.url, {"arquivo": arquivo}, format="multipart"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["criados"], 1)
+
+    def test_aluno_nao_matricula_em_lote(self):
+        response = self.cliente(self.aluno.user).post(
+            self.url,
+            [{"aluno": self.aluno.pk, "turma": self.outra_turma.pk}],
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(
+            Matricula.objects.filter(aluno=self.aluno, turma=self.outra_turma).exists()
+        )
+
+
+class ImportarAlunosTests(ClassroomTestCase):
+    url = "/api/alunos/importar/"
+
+    def linhas(self, quantidade):
+        return [
+            {"nome": f"Importado {i}", "email": f"importado{i}@teste.local"}
+            for i in range(quantidade)
+        ]
+
+    def test_importa_e_cria_usuarios(self):
+        response = self.cliente(self.admin).post(
+            self.url, self.linhas(3), format="json"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Aluno.objects.filter(email__startswith="importado").count(), 3)
+        self.assertTrue(User.objects.filter(username="importado0@teste.local").exists())
+
+    @override_settings(IMPORTACAO_MAX_LINHAS=2)
+    def test_recusa_lote_acima_do_limite(self):
+        response = self.cliente(self.admin).post(
+            self.url, self.linhas(3), format="json"
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Aluno.objects.filter(email__startswith="importado").exists())
+
+    def test_aluno_nao_importa(self):
+        response = self.cliente(self.aluno.user).post(
+            self.url, self.linhas(1), format="json"
+        )
+
+        self.assertEqual(response.status_code, 403)
+
+
+class ExportarMatriculasTests(ClassroomTestCase):
+    url = "/api/turmas/{}/alunos/exportar/"
+
+    def exportar(self, user, turma, formato="ndjson"):
+        # O `Client` síncrono lê o corpo como o WSGI, com o iterador síncrono
+        with override_settings(ASYNC_VIEWS=False):
+            response = self.cliente(user).get(
+                self.url.format(turma.pk), {"formato": formato}
+            )
+        linhas = b"".join(response.streaming_content).decode().splitlines()
+        return response, linhas
+
+    def test_admin_recebe_emails(self):
+        response, linhas = self.exportar(self.admin, self.turma)
+
+        self.assertEqual(response.status_code, 200)
+        emails = {json.loads(linha)["aluno_email"] for linha in linhas}
+        self.assertEqual(emails, {"ana@teste.local", "bruno@teste.local"})
+
+    def test_aluno_nao_recebe_email_dos_colegas(self):
+        response, linhas = self.exportar(self.aluno.user, self.turma)
+
+        self.assertEqual(response.status_code, 200)
+        rows = [json.loads(linha) for linha in linhas]
+        self.assertEqual(
+            {row["aluno_nome"] for row in rows}, {"Ana Souza", "Bruno Lima"}
+        )
+        for row in rows:
+            self.assertNotIn("aluno_email", row)
+
+    def test_csv_do_aluno_sem_coluna_de_email(self):
+        _, linhas = self.exportar(self.aluno.user, self.turma, formato="csv")
+
+        self.assertNotIn("aluno_email", linhas[0])
+        self.assertNotIn("bruno@teste.local", "\n".join(linhas))
+
+    def test_aluno_nao_exporta_turma_alheia(self):
+        response = self.cliente(self.aluno.user).get(
+            self.url.format(self.outra_turma.pk)
+        )
+
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(ASYNC_VIEWS=True)
+    async def test_asgi_com_iterador_assincrono(self):
+        token = await sync_to_async(self.token)(self.admin, "admin")
+        response = await AsyncClient().get(
+            self.url.format(self.turma.pk),
+            {"formato": "csv"},
+            headers={"authorization": f"Bearer {token}"},
+        )
+
+        # Um iterador síncrono seria lido inteiro pelo Django sob ASGI
+        self.assertTrue(response.is_async)
+        partes = [parte async for parte in response.streaming_content]
+        linhas = b"".join(partes).decode().splitlines()
+        self.assertIn("aluno_email", linhas[0])
+        self.assertEqual(len(linhas), 3)
+
+
+class HandlersAssincronosTests(ClassroomTestCase):
+    """
+    Views com `ASYNC_VIEWS`: `initial()`, que lê o cache dos limites de
+    requisição e da revogação de tokens, roda fora do event loop.
+    """
+
+    async def test_initial_fora_do_event_loop(self):
+        with override_settings(ASYNC_VIEWS=True):
+            view = TurmaViewSet.as_view({"get": "list"}, basename="turma")
+
+        threads = []
+        initial = TurmaViewSet.initial
+
+        def registrar(view, request, *args, **kwargs):
+            threads.append(threading.current_thread())
+            return initial(view, request, *args, **kwargs)
+
+        token = await sync_to_async(self.token)(self.admin, "admin")
+        request = AsyncRequestFactory().get(
+            "/api/turmas/", headers={"authorization": f"Bearer {token}"}
+        )
+        with mock.patch.object(TurmaViewSet, "initial", registrar):
+            response = await view(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(threads), 1)
+        self.assertIsNot(threads[0], threading.current_thread())
+
+
+class AlunosDaTurmaTests(ClassroomTestCase):
+    def url(self, turma):
+        return f"/api/turmas/{turma.pk}/alunos/"
+
+    def test_admin_expande_aluno(self):
+        response = self.cliente(self.admin).get(
+            self.url(self.turma), {"expand": "aluno"}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        emails = {row["aluno"]["email"] for row in response.data["results"]}
+        self.assertEqual(emails, {"ana@teste.local", "bruno@teste.local"})
+
+    def test_aluno_ve_colegas_sem_expandir_contato(self):
+        client = self.cliente(self.aluno.user)
+
+        response = client.get(self.url(self.turma))
+        self.assertEqual(response.status_code, 200)
+        nomes = {row["aluno_nome"] for row in response.data["results"]}
+        self.assertEqual(nomes, {"Ana Souza", "Bruno Lima"})
+
+        response = client.get(self.url(self.turma), {"expand": "aluno"})
+        self.assertEqual(response.status_code, 400)
+        self.assertNotIn("bruno@teste.local", response.content.decode())
+
+
+def _plano(sql):
+    """
+    Plano (`EXPLAIN`) de uma consulta capturada, já com os parâmetros.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(f"{connection.ops.explain_query_prefix()} {sql}")
+        linhas = cursor.fetchall()
+
+    if connection.vendor == "sqlite":
+        # (id, parent, notused, detail)
+        return "\n".join(linha[-1] for linha in linhas)
+    return "\n".join(linha[0] for linha in linhas)
+
+
+def _varredura_completa(plano, tabela):
+    if connection.vendor == "postgresql":
+        return f"Seq Scan on {tabela}" in plano
+
+    # `SCAN tabela USING INDEX ...` percorre um índice na ordem da página e
+    # para no LIMIT; seguido de ordenação (TEMP B-TREE), lê a tabela toda
+    if re.search(rf"SCAN {tabela}\b(?! USING)", plano):
+        return True
+    return bool(re.search(rf"SCAN {tabela}\b", plano)) and "TEMP B-TREE" in plano
+
+
+def _exemplo(campo):
+    if isinstance(campo, serializers.ChoiceField):
+        return next(iter(campo.choices))
+    if isinstance(campo, serializers.BooleanField):
+        return "true"
+    if isinstance(campo, serializers.DateTimeField):
+        return "2025-01-01T00:00:00Z"
+    if isinstance(campo, serializers.DateField):
+        return "2025-01-01"
+    return 1
+
+
+def _combinacoes(viewset):
+    """
+    Query strings de cada combinação de filtros de `filter_serializer_class`
+    com cada `?ordering=` aceito (e a ordenação padrão).
+    """
+    campos = viewset.filter_serializer_class().fields
+    ordenacoes = [None] + [
+        f"{direcao}{campo}"
+        for campo in viewset.ordering_fields
+        for direcao in ("", "-")
+    ]
+
+    for total in range(len(campos) + 1):
+        for nomes in combinations(campos, total):
+            filtros = {nome: _exemplo(campos[nome]) for nome in nomes}
+            for ordenacao in ordenacoes:
+                if ordenacao is None:
+                    yield filtros
+                else:
+                    yield {**filtros, "ordering": ordenacao}
+
+
+class IndicesTests(ClassroomTestCase):
+    """
+    Planos das consultas que as views executam de fato: cada endpoint é
+    chamado e as consultas capturadas passam por `EXPLAIN`.
+    """
+
+    def setUp(self):
+        super().setUp()
+        if connection.vendor == "postgresql":
+            # Com poucas linhas o PostgreSQL prefere varrer a tabela; o que
+            # interessa aqui é se o índice atende à consulta.
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+
+    def consultas(self, user, url, tabela):
+        """
+        SQL das consultas em `tabela` feitas por `GET url`.
+        """
+        with CaptureQueriesContext(connection) as capturadas:
+            response = self.cliente(user).get(url)
+        self.assertEqual(response.status_code, 200, url)
+
+        consultas = [
+            consulta["sql"]
+            for consulta in capturadas.captured_queries
+            if f'FROM "{tabela}"' in consulta["sql"]
+        ]
+        self.assertTrue(consultas, f"{url}: nenhuma consulta em {tabela}")
+        return consultas
+
+    def test_consultas_principais_usam_o_indice(self):
+        turma = self.turma.pk
+        desde = urlencode({"since": timezone.now() - timedelta(days=1)})
+        casos = [
+            # (usuário, URL, tabela, índice esperado)
+            (
+                "admin",
+                f"/api/alunos/{self.aluno.pk}/matriculas/",
+                "classroom_matricula",
+                "matricula_aluno_data_idx",
+            ),
+            (
+                "admin",
+                f"/api/turmas/{turma}/alunos/",
+                "classroom_matricula",
+                "matricula_turma_data_idx",
+            ),
+            ("admin", "/api/matriculas/", "classroom_matricula", "matricula_data_idx"),
+            (
+                "admin",
+                f"/api/treinamentos/{self.treinamento.pk}/turmas/",
+                "classroom_turma",
+                "turma_treinamento_inicio_idx",
+            ),
+            ("admin", "/api/turmas/", "classroom_turma", "turma_inicio_idx"),
+            (
+                "aluno",
+                f"/api/turmas/{turma}/recursos/",
+                "classroom_recurso",
+                "recurso_publicado_idx",
+            ),
+            (
+                "admin",
+                f"/api/recursos/?turma={turma}&draft=true",
+                "classroom_recurso",
+                "recurso_turma_criado_idx",
+            ),
+            ("admin", "/api/recursos/", "classroom_recurso", "recurso_criado_idx"),
+            (
+                "admin",
+                f"/api/recursos/changes/?{desde}",
+                "classroom_recurso",
+                "recurso_atualizado_idx",
+            ),
+            (
+                "aluno",
+                f"/api/recursos/changes/?{desde}",
+                "classroom_remocao",
+                "remocao_tipo_data_idx",
+            ),
+            ("admin", "/api/alunos/", "classroom_aluno", "aluno_nome_idx"),
+            (
+                "admin",
+                "/api/treinamentos/",
+                "classroom_treinamento",
+                "treinamento_nome_idx",
+            ),
+        ]
+        usuarios = {"admin": self.admin, "aluno": self.aluno.user}
+
+        for papel, url, tabela, indice in casos:
+            with self.subTest(url=url, papel=papel):
+                planos = [
+                    _plano(sql) for sql in self.consultas(usuarios[papel], url, tabela)
+                ]
+                self.assertTrue(
+                    any(indice in plano for plano in planos),
+                    f"{url}: sem {indice}\n" + "\n---\n".join(planos),
+                )
+
+    def test_filtros_e_ordenacao_nao_varrem_a_tabela(self):
+        """
+        A página de cada combinação de filtros e `?ordering=` das listagens
+        (a consulta com LIMIT) não lê a tabela inteira.
+        """
+        for viewset, url in (
+            (TurmaViewSet, "/api/turmas/"),
+            (RecursoViewSet, "/api/recursos/"),
+            (MatriculaViewSet, "/api/matriculas/"),
+        ):
+            tabela = viewset.queryset.model._meta.db_table
+            for params in _combinacoes(viewset):
+                with self.subTest(url=url, params=params):
+                    caches[CACHE_ALIAS].clear()
+                    consultas = self.consultas(
+                        self.admin, f"{url}?{urlencode(params)}", tabela
+                    )
+                    pagina = [sql for sql in consultas if " LIMIT " in sql]
+                    self.assertTrue(pagina)
+                    for sql in pagina:
+                        plano = _plano(sql)
+                        self.assertFalse(_varredura_completa(plano, tabela), plano)
+
+
+class EscritaSoAdminTests(ClassroomTestCase):
+    """
+    Turmas e recursos: o aluno matriculado lê, mas não cria nem altera.
+    """
+
+    def dados_turma(self):
+        return {
+            "treinamento": self.treinamento.pk,
+            "nome": "Turma Nova",
+            "data_inicio": "2030-01-01",
+        }
+
+    def dados_recurso(self):
+        return {"turma": self.turma.pk, "tipo": "PDF", "nome": "Recurso Novo"}
+
+    def test_aluno_nao_cria_turma_nem_recurso(self):
+        client = self.cliente(self.aluno.user)
+
+        response = client.post("/api/turmas/", self.dados_turma(), format="json")
+        self.assertEqual(response.status_code, 403)
+        response = client.post("/api/recursos/", self.dados_recurso(), format="json")
+        self.assertEqual(response.status_code, 403)
+
+        self.assertFalse(Turma.objects.filter(nome="Turma Nova").exists())
+        self.assertFalse(Recurso.objects.filter(nome="Recurso Novo").exists())
+
+    def test_aluno_nao_altera_a_propria_turma(self):
+        response = self.cliente(self.aluno.user).patch(
+            f"/api/turmas/{self.turma.pk}/", {"nome": "Outra"}, format="json"
+        )
+
+        self.assertEqual(response.status_code, 403)
+        self.turma.refresh_from_db()
+        self.assertEqual(self.turma.nome, "Turma A")
+
+    def test_aluno_le_a_propria_turma(self):
+        response = self.cliente(self.aluno.user).get(f"/api/turmas/{self.turma.pk}/")
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_admin_cria_turma_e_recurso(self):
+        client = self.cliente(self.admin)
+
+        response = client.post("/api/turmas/", self.dados_turma(), format="json")
+        self.assertEqual(response.status_code, 201)
+        response = client.post("/api/recursos/", self.dados_recurso(), format="json")
+        self.assertEqual(response.status_code, 201)
+
+
+class CacheDeRespostasTests(ClassroomTestCase):
+    """
+    Cache de respostas: acertos sem consultas, invalidação só depois do
+    commit da escrita e chaves dos alunos por dia.
+    """
+
+    def setUp(self):
+        super().setUp()
+        stats.reset()
+
+    def test_acerto_sem_consultas(self):
+        client = self.cliente(self.admin)
+        dados = client.get("/api/turmas/").data
+
+        with self.assertNumQueries(0):
+            self.assertEqual(client.get("/api/turmas/").data, dados)
+
+        self.assertEqual(stats.as_dict(), {"hits": 1, "misses": 1, "invalidations": 0})
+        contadores = client.get("/api/cache/stats").data
+        self.assertEqual(contadores["hit_ratio"], 0.5)
+
+    def test_cache_por_usuario(self):
+        self.cliente(self.aluno.user).get("/api/turmas/")
+        response = self.cliente(self.colega.user).get("/api/turmas/")
+
+        self.assertEqual(stats.as_dict()["misses"], 2)
+        self.assertEqual(len(response.data["results"]), 2)
+
+    def test_escrita_invalida_depois_do_commit(self):
+        client = self.cliente(self.admin)
+        url = f"/api/turmas/{self.turma.pk}/"
+        client.get(url)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            client.patch(url, {"nome": "Turma C"})
+            # Antes do commit a geração não muda
+            self.assertEqual(client.get(url).data["nome"], "Turma A")
+
+        for callback in callbacks:
+            callback()
+
+        self.assertEqual(client.get(url).data["nome"], "Turma C")
+        self.assertEqual(stats.as_dict()["hits"], 1)
+        self.assertGreater(stats.as_dict()["invalidations"], 0)
+
+    def test_chave_do_aluno_muda_com_a_data(self):
+        client = self.cliente(self.aluno.user)
+        client.get("/api/recursos/")
+
+        with mock.patch("classroom.cache.date") as data:
+            data.today.return_value = date.today() + timedelta(days=1)
+            client.get("/api/recursos/")
+
+        self.assertEqual(stats.as_dict()["misses"], 2)
+
+
+class GetCondicionalTests(ClassroomTestCase):
+    """
+    ETag das listagens: 304 enquanto a página não muda, sem tocar o banco
+    num acerto do cache, só com o validador fora dele, e um ETag novo depois
+    de cada escrita.
+    """
+
+    def test_304_com_o_mesmo_etag(self):
+        client = self.cliente(self.admin)
+        etag = client.get("/api/turmas/")["ETag"]
+
+        with self.assertNumQueries(0):
+            response = client.get("/api/turmas/", HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertIn("private", response["Cache-Control"])
+
+    def test_304_fora_do_cache_so_com_o_validador(self):
+        client = self.cliente(self.admin)
+        etag = client.get("/api/turmas/")["ETag"]
+        caches[CACHE_ALIAS].clear()
+
+        with CaptureQueriesContext(connection) as capturadas:
+            response = client.get("/api/turmas/", HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        # Só pk e atualizado_em das linhas da página, com o LIMIT da paginação
+        (consulta,) = capturadas.captured_queries
+        self.assertIn("LIMIT", consulta["sql"])
+        self.assertNotIn('"nome"', consulta["sql"])
+
+    def test_alteracao_e_exclusao_mudam_o_etag(self):
+        client = self.cliente(self.admin)
+        etag = client.get("/api/turmas/")["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            client.patch(f"/api/turmas/{self.turma.pk}/", {"nome": "Turma C"})
+        response = client.get("/api/turmas/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+        etag = response["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            client.delete(f"/api/turmas/{self.outra_turma.pk}/")
+        response = client.get("/api/turmas/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn(
+            self.outra_turma.pk, [t["id"] for t in response.data["results"]]
+        )
+
+    def test_recursos_da_turma(self):
+        self.criar_recurso(self.turma, "Apostila")
+        client = self.cliente(self.aluno.user)
+        url = f"/api/turmas/{self.turma.pk}/recursos/"
+        etag = client.get(url)["ETag"]
+
+        # Turma, matrícula e o agregado dos recursos; nada dos recursos em si
+        with self.assertNumQueries(3):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.criar_recurso(self.turma, "Slides")
+        self.assertEqual(client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_detalhe_com_last_modified(self):
+        client = self.cliente(self.admin)
+        response = client.get(f"/api/turmas/{self.turma.pk}/")
+
+        self.assertIn("Last-Modified", response)
+        response = client.get(
+            f"/api/turmas/{self.turma.pk}/", HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        self.assertEqual(response.status_code, 304)
+
+
+class SincronizacaoTests(ClassroomTestCase):
+    """
+    Remoções em `/api/recursos/changes/`: cada aluno recebe só as das
+    próprias turmas.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.desde = urlencode({"since": timezone.now() - timedelta(minutes=1)})
+
+    def alteracoes(self, user):
+        response = self.cliente(user).get(f"/api/recursos/changes/?{self.desde}")
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_turma_removida_so_para_os_alunos_dela(self):
+        self.cliente(self.admin).delete(f"/api/turmas/{self.outra_turma.pk}/")
+
+        self.assertEqual(self.alteracoes(self.aluno.user)["turmas_removidas"], [])
+        self.assertEqual(
+            self.alteracoes(self.colega.user)["turmas_removidas"],
+            [self.outra_turma.pk],
+        )
+        self.assertIn(
+            self.outra_turma.pk, self.alteracoes(self.admin)["turmas_removidas"]
+        )
+
+    def test_treinamento_removido_remove_as_turmas(self):
+        self.treinamento.delete()
+
+        self.assertEqual(
+            self.alteracoes(self.colega.user)["turmas_removidas"],
+            sorted([self.turma.pk, self.outra_turma.pk]),
+        )
+
+    def test_matricula_cancelada(self):
+        Matricula.objects.get(aluno=self.aluno, turma=self.turma).delete()
+
+        self.assertEqual(
+            self.alteracoes(self.aluno.user)["turmas_removidas"], [self.turma.pk]
+        )
+        self.assertEqual(self.alteracoes(self.colega.user)["turmas_removidas"], [])
+
+    def test_recurso_removido(self):
+        recurso = self.criar_recurso(self.turma, "Apostila")
+        removido = recurso.pk
+        recurso.delete()
+        self.criar_recurso(self.outra_turma, "Slides").delete()
+
+        self.assertEqual(self.alteracoes(self.aluno.user)["removidos"], [removido])
+
+
+class BuscaTests(ClassroomTestCase):
+    """
+    Busca textual: prefixos sem acento, índice mantido pelos sinais e a
+    mesma visibilidade das listagens.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.apostila = cls.criar_recurso(cls.turma, "Introdução à Programação")
+        cls.rascunho = cls.criar_recurso(cls.turma, "Introdução (rascunho)", draft=True)
+        cls.alheio = cls.criar_recurso(cls.outra_turma, "Introdução avançada")
+
+    def buscar(self, user, q):
+        response = self.cliente(user).get("/api/search/", {"q": q})
+        self.assertEqual(response.status_code, 200)
+        return {
+            grupo: sorted(item["id"] for item in itens)
+            for grupo, itens in response.data.items()
+        }
+
+    def test_prefixo_sem_acento(self):
+        resultado = self.buscar(self.admin, "introducao progr")
+
+        self.assertEqual(resultado["recursos"], [self.apostila.pk])
+
+    def test_aluno_so_encontra_o_que_ve(self):
+        resultado = self.buscar(self.aluno.user, "introdu")
+        self.assertEqual(resultado["recursos"], [self.apostila.pk])
+
+        resultado = self.buscar(self.aluno.user, "turma")
+        self.assertEqual(resultado["turmas"], [self.turma.pk])
+
+        resultado = self.buscar(self.aluno.user, "bruno")
+        self.assertEqual(resultado["alunos"], [])
+
+    def test_admin_encontra_tudo(self):
+        resultado = self.buscar(self.admin, "introdu")
+        self.assertEqual(
+            resultado["recursos"],
+            sorted([self.apostila.pk, self.rascunho.pk, self.alheio.pk]),
+        )
+
+        resultado = self.buscar(self.admin, "bruno@teste")
+        self.assertEqual(resultado["alunos"], [self.colega.pk])
+
+    def test_indice_acompanha_alteracoes(self):
+        self.apostila.nome = "Apostila de Python"
+        self.apostila.save()
+        self.alheio.delete()
+
+        self.assertEqual(
+            self.buscar(self.admin, "apostila")["recursos"], [self.apostila.pk]
+        )
+        self.assertEqual(self.buscar(self.admin, "avancada")["recursos"], [])
+
+    def test_q_na_listagem(self):
+        response = self.cliente(self.aluno.user).get("/api/recursos/", {"q": "introdu"})
+
+        self.assertEqual(
+            [recurso["id"] for recurso in response.data["results"]], [self.apostila.pk]
+        )
+
+
+class FiltrosTests(ClassroomTestCase):
+    """
+    Filtros e `?ordering=` das listagens: o resultado, não só o plano (ver
+    `IndicesTests`).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.outro_treinamento = Treinamento.objects.create(nome="Django")
+        cls.futura = Turma.objects.create(
+            treinamento=cls.outro_treinamento,
+            nome="Turma C",
+            data_inicio=date.today() + timedelta(days=30),
+        )
+        cls.video = cls.criar_recurso(
+            cls.turma, "Aula 1", tipo=Recurso.TipoRecurso.VIDEO
+        )
+        cls.pdf = cls.criar_recurso(cls.turma, "Apostila")
+        cls.rascunho = cls.criar_recurso(
+            cls.turma, "Aula 2", tipo=Recurso.TipoRecurso.VIDEO, draft=True
+        )
+
+    def ids(self, url, user=None):
+        response = self.cliente(user or self.admin).get(url)
+        self.assertEqual(response.status_code, 200, url)
+        return [item["id"] for item in response.data["results"]]
+
+    def test_filtros_de_turmas(self):
+        self.assertEqual(
+            self.ids(f"/api/turmas/?treinamento={self.outro_treinamento.pk}"),
+            [self.futura.pk],
+        )
+        self.assertEqual(
+            self.ids(f"/api/turmas/?data_inicio__gte={date.today()}"), [self.futura.pk]
+        )
+        self.assertCountEqual(
+            self.ids(f"/api/turmas/?data_inicio__lte={date.today()}"),
+            [self.turma.pk, self.outra_turma.pk],
+        )
+
+    def test_filtros_de_recursos(self):
+        turma = self.turma.pk
+        self.assertCountEqual(
+            self.ids(f"/api/recursos/?turma={turma}&tipo=VIDEO"),
+            [self.video.pk, self.rascunho.pk],
+        )
+        self.assertEqual(
+            self.ids(f"/api/recursos/?turma={turma}&tipo=VIDEO&draft=false"),
+            [self.video.pk],
+        )
+        # O filtro não amplia a visibilidade do aluno
+        self.assertEqual(self.ids("/api/recursos/?draft=true", self.aluno.user), [])
+
+    def test_filtros_de_matriculas(self):
+        ids = self.ids(
+            f"/api/matriculas/?aluno={self.colega.pk}&turma={self.outra_turma.pk}"
+        )
+
+        self.assertEqual(
+            ids,
+            [Matricula.objects.get(aluno=self.colega, turma=self.outra_turma).pk],
+        )
+
+    def test_parametro_invalido(self):
+        for url in ("/api/turmas/?treinamento=abc", "/api/recursos/?tipo=GIF"):
+            with self.subTest(url=url):
+                response = self.cliente(self.admin).get(url)
+                self.assertEqual(response.status_code, 400)
+
+    def test_ordenacao(self):
+        nomes = [
+            turma["nome"]
+            for turma in self.cliente(self.admin)
+            .get("/api/turmas/?ordering=-nome")
+            .data["results"]
+        ]
+        self.assertEqual(nomes, ["Turma C", "Turma B", "Turma A"])
+
+        # Campo fora de `ordering_fields`: vale a ordenação padrão
+        self.assertEqual(
+            self.ids("/api/turmas/?ordering=link_acesso"), self.ids("/api/turmas/")
+        )
+        self.assertEqual(
+            self.ids(f"/api/recursos/?turma={self.turma.pk}&ordering=criado_em"),
+            [self.video.pk, self.pdf.pk, self.rascunho.pk],
+        )
+
+
+class CamposEsparsosTests(ClassroomTestCase):
+    """
+    `?fields=` e `?expand=`: só os campos pedidos, sem os JOINs e colunas dos
+    que ficaram de fora.
+    """
+
+    def get(self, url):
+        with CaptureQueriesContext(connection) as capturadas:
+            response = self.cliente(self.admin).get(url)
+        self.assertEqual(response.status_code, 200, url)
+        return response.data, [q["sql"] for q in capturadas.captured_queries]
+
+    def test_fields_na_listagem(self):
+        dados, consultas = self.get("/api/turmas/?fields=id,nome")
+
+        for turma in dados["results"]:
+            self.assertEqual(set(turma), {"id", "nome"})
+        # A última é a dos dados; antes vem a do ETag, sobre pk e atualizado_em
+        sql = consultas[-1]
+        self.assertNotIn("classroom_treinamento", sql)
+        self.assertNotIn("classroom_matricula", sql)
+
+    def test_fields_no_detalhe_adia_colunas(self):
+        recurso = self.criar_recurso(self.turma, "Apostila", descricao="Longa")
+
+        dados, consultas = self.get(f"/api/recursos/{recurso.pk}/?fields=id,nome")
+
+        self.assertEqual(dados, {"id": recurso.pk, "nome": "Apostila"})
+        self.assertNotIn('"descricao"', " ".join(consultas))
+
+    def test_expand(self):
+        dados, _ = self.get(f"/api/turmas/{self.turma.pk}/?expand=treinamento")
+
+        self.assertEqual(dados["treinamento"]["id"], self.treinamento.pk)
+        self.assertEqual(dados["treinamento"]["nome"], "Python")
+
+    def test_sem_parametros_todos_os_campos(self):
+        dados, _ = self.get(f"/api/turmas/{self.turma.pk}/")
+
+        self.assertEqual(dados["treinamento"], self.treinamento.pk)
+        self.assertEqual(dados["treinamento_nome"], "Python")
+        self.assertEqual(dados["total_alunos"], 2)
+
+    def test_nomes_invalidos(self):
+        client = self.cliente(self.admin)
+        for url in ("/api/turmas/?fields=id,senha", "/api/turmas/?expand=nome"):
+            with self.subTest(url=url):
+                self.assertEqual(client.get(url).status_code, 400)
+
+    def test_escrita_devolve_todos_os_campos(self):
+        response = self.cliente(self.admin).post(
+            "/api/turmas/?fields=id",
+            {
+                "treinamento": self.treinamento.pk,
+                "nome": "Turma Nova",
+                "data_inicio": "2030-01-01",
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["nome"], "Turma Nova")
+
+
+class ListagensPorValuesTests(ClassroomTestCase):
+    """
+    As listagens vêm de `.values()` (`ValuesRepresentation`) e o detalhe do
+    serializer: o JSON de cada item tem de ser o mesmo.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.criar_recurso(cls.turma, "Apostila", descricao="Capítulo 1\u2028")
+        cls.criar_recurso(
+            cls.turma,
+            "Gravação",
+            tipo=Recurso.TipoRecurso.VIDEO,
+            acesso_previo=True,
+        )
+        cls.criar_recurso(cls.outra_turma, "Rascunho", draft=True)
+
+    def json(self, client, url):
+        response = client.get(url)
+        self.assertEqual(response.status_code, 200, url)
+        return json.loads(response.content)
+
+    def comparar(self, user, listagem, detalhe, parametros=""):
+        client = self.cliente(user)
+        itens = self.json(client, f"{listagem}{parametros}")["results"]
+        self.assertTrue(itens, listagem)
+
+        for item in itens:
+            url = f"{detalhe.format(item['id'])}{parametros}"
+            with self.subTest(url=url):
+                self.assertEqual(item, self.json(client, url))
+
+    def test_mesmo_json_do_serializer(self):
+        casos = [
+            ("/api/treinamentos/", "/api/treinamentos/{}/", ""),
+            ("/api/turmas/", "/api/turmas/{}/", ""),
+            ("/api/turmas/", "/api/turmas/{}/", "?expand=treinamento"),
+            ("/api/recursos/", "/api/recursos/{}/", ""),
+            ("/api/recursos/", "/api/recursos/{}/", "?expand=turma"),
+            (
+                f"/api/turmas/{self.turma.pk}/recursos/",
+                "/api/recursos/{}/",
+                "",
+            ),
+            ("/api/alunos/", "/api/alunos/{}/", ""),
+            ("/api/matriculas/", "/api/matriculas/{}/", ""),
+            ("/api/matriculas/", "/api/matriculas/{}/", "?expand=aluno,turma"),
+        ]
+        for user in (self.admin, self.colega.user):
+            for listagem, detalhe, parametros in casos:
+                self.comparar(user, listagem, detalhe, parametros)
+
+
+@skipUnless(importlib.util.find_spec("orjson"), "orjson não instalado")
+class ORJSONTests(ClassroomTestCase):
+    """
+    `ORJSONRenderer` e `ORJSONParser` produzem o mesmo que o `JSONRenderer`
+    e o `JSONParser` do DRF.
+    """
+
+    def test_mesmos_bytes_do_renderer_do_drf(self):
+        from core.renderers import ORJSONRenderer
+
+        dados = {
+            "data": date(2030, 1, 2),
+            "utc": datetime(2030, 1, 2, 3, 4, 5, 678901, tzinfo=dt_timezone.utc),
+            "sao_paulo": datetime(
+                2030, 1, 2, 3, 4, 5, tzinfo=dt_timezone(timedelta(hours=-3))
+            ),
+            "ingenua": datetime(2030, 1, 2, 3, 4, 5),
+            "decimal": Decimal("10.50"),
+            "lazy": gettext_lazy("Turma"),
+            "texto": 'Programação \u2028 \u2029 "aspas"',
+            "lista": [None, True, 1.5, {"1": "um"}],
+        }
+
+        self.assertEqual(ORJSONRenderer().render(dados), JSONRenderer().render(dados))
+
+    def test_mesmo_resultado_do_parser_do_drf(self):
+        from core.parsers import ORJSONParser
+
+        corpo = {"nome": "Programação", "lista": [1, 2.5, None, "ç"]}
+        for charset in ("utf-8", "latin-1", "cp1252"):
+            with self.subTest(charset=charset):
+                conteudo = json.dumps(corpo, ensure_ascii=False).encode(charset)
+                contexto = {"encoding": charset}
+
+                self.assertEqual(
+                    ORJSONParser().parse(io.BytesIO(conteudo), None, contexto),
+                    JSONParser().parse(io.BytesIO(conteudo), None, contexto),
+                )
+
+        for invalido in (b"{", b'{"valor": NaN}'):
+            with self.subTest(corpo=invalido):
+                with self.assertRaises(ParseError):
+                    ORJSONParser().parse(io.BytesIO(invalido))
+                with self.assertRaises(ParseError):
+                    JSONParser().parse(io.BytesIO(invalido))
+
+    def test_corpo_em_latin1(self):
+        response = self.cliente(self.admin).generic(
+            "POST",
+            "/api/treinamentos/",
+            json.dumps({"nome": "Programação"}, ensure_ascii=False).encode("latin-1"),
+            content_type="application/json; charset=latin-1",
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["nome"], "Programação")
+
+
+class PainelTests(ClassroomTestCase):
+    """
+    `/api/me/dashboard`: consultas fixas e cache invalidado só para os
+    alunos cujos dados mudaram.
+    """
+
+    def painel(self, user, consultas):
+        with self.assertNumQueries(consultas):
+            response = self.cliente(user).get("/api/me/dashboard")
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_consultas_fixas_e_cache(self):
+        for i in range(3):
+            turma = self.criar_turma(f"Turma {i}", date.today())
+            Matricula.objects.create(aluno=self.aluno, turma=turma)
+            self.criar_recurso(turma, f"Recurso {i}")
+
+        # Versão, aluno, matrículas, turmas e recursos; depois só a versão
+        dados = self.painel(self.aluno.user, 5)
+        self.assertEqual(len(dados["turmas"]), 4)
+        self.assertEqual(len(dados["recursos"]), 3)
+        self.assertEqual(self.painel(self.aluno.user, 1), dados)
+
+    def test_alteracao_invalida_so_os_alunos_da_turma(self):
+        self.painel(self.aluno.user, 5)
+        self.painel(self.colega.user, 5)
+
+        self.outra_turma.nome = "Turma B2"
+        self.outra_turma.save()
+
+        self.painel(self.aluno.user, 1)
+        dados = self.painel(self.colega.user, 5)
+        self.assertIn("Turma B2", [turma["nome"] for turma in dados["turmas"]])
+
+    def test_recursos_e_matriculas_mudam_o_painel(self):
+        self.painel(self.aluno.user, 5)
+
+        recurso = self.criar_recurso(self.turma, "Apostila")
+        dados = self.painel(self.aluno.user, 5)
+        self.assertEqual([r["id"] for r in dados["recursos"]], [recurso.pk])
+
+        Matricula.objects.create(aluno=self.aluno, turma=self.outra_turma)
+        dados = self.painel(self.aluno.user, 5)
+        self.assertEqual(len(dados["matriculas"]), 2)
+
+        Recurso.objects.filter(pk=recurso.pk).delete()
+        self.assertEqual(self.painel(self.aluno.user, 5)["recursos"], [])
+
+    def test_treinamento_renomeado(self):
+        self.painel(self.aluno.user, 5)
+
+        self.treinamento.nome = "Python Avançado"
+        self.treinamento.save()
+
+        dados = self.painel(self.aluno.user, 5)
+        self.assertEqual(dados["turmas"][0]["treinamento_nome"], "Python Avançado")
+
+    def test_usuario_sem_aluno(self):
+        response = self.cliente(self.admin).get("/api/me/dashboard")
+
+        self.assertEqual(response.status_code, 404)
+
+
+class AutenticacaoTests(ClassroomTestCase):
+    """
+    Token do login: claims usadas pelas views, nenhuma consulta ao `User`
+    por requisição e revogação dos tokens anteriores a uma alteração.
+    """
+
+    def get(self, token, url="/api/turmas/"):
+        return APIClient().get(url, HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def test_claims(self):
+        token = AccessToken(self.token(self.aluno.user))
+        self.assertIs(token["is_staff"], False)
+        self.assertEqual(token["aluno_id"], self.aluno.pk)
+
+        token = AccessToken(self.token(self.admin, "admin"))
+        self.assertIs(token["is_staff"], True)
+        self.assertIsNone(token["aluno_id"])
+
+    def test_sem_consulta_ao_user(self):
+        token = self.token(self.aluno.user)
+
+        with CaptureQueriesContext(connection) as capturadas:
+            response = self.get(token)
+
+        self.assertEqual(response.status_code, 200)
+        for consulta in capturadas.captured_queries:
+            self.assertNotIn("auth_user", consulta["sql"])
+
+    @override_settings(JWT_REVOCATION_CHECK=True)
+    def test_troca_de_senha_revoga_os_tokens_anteriores(self):
+        user = self.aluno.user
+        agora = timezone.now()
+
+        # Login há 10s, troca de senha há 5s e um novo login agora
+        with mock.patch(
+            "rest_framework_simplejwt.tokens.aware_utcnow",
+            return_value=agora - timedelta(seconds=10),
+        ):
+            anterior = self.token(user)
+        with mock.patch(
+            "core.authentication.time.time", return_value=agora.timestamp() - 5
+        ):
+            user.set_password("nova")
+            user.save()
+
+        self.assertEqual(self.get(anterior).status_code, 401)
+        self.assertEqual(self.get(self.token(user, "nova")).status_code, 200)
+
+    @override_settings(JWT_REVOCATION_CHECK=True)
+    def test_token_do_mesmo_segundo_da_revogacao(self):
+        token = self.token(self.admin, "admin")
+        emitido_em = AccessToken(token)["iat"]
+
+        with mock.patch("core.authentication.time.time", return_value=emitido_em + 0.5):
+            self.admin.is_staff = False
+            self.admin.save()
+
+        self.assertEqual(self.get(token).status_code, 401)
+
+
+class LoginTests(ClassroomTestCase):
+    """
+    `/api/auth/token`: limites de tentativas por IP e usuário e só por IP,
+    e hashes antigos refeitos com o hasher preferido no login.
+    """
+
+    def login(self, username, senha="errada", ip="10.0.0.1"):
+        return APIClient().post(
+            "/api/auth/token",
+            {"username": username, "password": senha},
+            format="json",
+            REMOTE_ADDR=ip,
+        )
+
+    @mock.patch.dict(LoginRateThrottle.THROTTLE_RATES, {"login": "2/min"})
+    def test_limite_por_usuario(self):
+        username = self.aluno.user.username
+        for _ in range(2):
+            self.assertEqual(self.login(username).status_code, 401)
+
+        # Recusada antes de verificar a senha, mesmo a correta
+        self.assertEqual(self.login(username, "x").status_code, 429)
+        # Outro usuário no mesmo IP e o mesmo usuário em outro IP seguem
+        self.assertEqual(self.login(self.colega.user.username, "x").status_code, 200)
+        self.assertEqual(self.login(username, "x", ip="10.0.0.2").status_code, 200)
+
+    @mock.patch.dict(LoginIPRateThrottle.THROTTLE_RATES, {"login_ip": "3/min"})
+    def test_limite_por_ip(self):
+        for i in range(3):
+            self.assertEqual(self.login(f"usuario{i}@teste.local").status_code, 401)
+
+        self.assertEqual(self.login(self.aluno.user.username, "x").status_code, 429)
+        response = self.login(self.aluno.user.username, "x", ip="10.0.0.2")
+        self.assertEqual(response.status_code, 200)
+
+    def rehash(self, hashers, algoritmo_antigo):
+        user = self.aluno.user
+        with override_settings(PASSWORD_HASHERS=hashers):
+            User.objects.filter(pk=user.pk).update(
+                password=make_password("x", hasher=algoritmo_antigo)
+            )
+
+            with override_settings(JWT_REVOCATION_CHECK=True):
+                response = self.login(user.username, "x")
+                self.assertEqual(response.status_code, 200)
+                # O rehash não revoga o token que o próprio login emitiu
+                autenticada = APIClient().get(
+                    "/api/turmas/",
+                    HTTP_AUTHORIZATION=f"Bearer {response.data['access']}",
+                )
+                self.assertEqual(autenticada.status_code, 200)
+
+        user.refresh_from_db()
+        return user.password
+
+    def test_rehash_para_o_hasher_preferido(self):
+        senha = self.rehash(
+            [
+                "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+                "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+            ],
+            "pbkdf2_sha1",
+        )
+        self.assertTrue(senha.startswith("pbkdf2_sha256$"))
+
+    @skipUnless(importlib.util.find_spec("argon2"), "argon2-cffi não instalado")
+    def test_rehash_de_pbkdf2_para_argon2(self):
+        senha = self.rehash(
+            [
+                "core.hashers.TunedArgon2PasswordHasher",
+                "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+            ],
+            "pbkdf2_sha256",
+        )
+        self.assertTrue(senha.startswith("argon2$argon2id$"))
+        self.assertIn("m=19456,t=2,p=1", senha)
+
+
+class LogDeRequisicoesTests(ClassroomTestCase):
+    @override_settings(SLOW_REQUEST_MS=0, SLOW_REQUEST_SAMPLE_RATE=1.0)
+    def test_requisicao_lenta_loga_sql_sem_parametros(self):
+        with self.assertLogs("core.requests", "WARNING") as logs:
+            APIClient().post(
+                "/api/auth/token",
+                {"username": "bruno@teste.local", "password": "errada"},
+                format="json",
+            )
+
+        dados = json.loads(logs.records[-1].getMessage())
+        self.assertTrue(dados["sql"])
+        self.assertNotIn("params", dados["sql"][0])
+        # O username e o hash da senha só estariam nos parâmetros
+        self.assertNotIn("bruno@teste.local", logs.output[-1])
+        self.assertNotIn(self.colega.user.password, logs.output[-1])
+
+    async def test_asgi_conta_as_queries_das_threads(self):
+        # Sob ASGI a view síncrona roda numa thread do `sync_to_async`, com
+        # outra conexão que a do event loop
+        token = await sync_to_async(self.token)(self.admin, "admin")
+        with self.assertLogs("core.requests", "INFO") as logs:
+            response = await AsyncClient().get(
+                f"/api/turmas/{self.turma.pk}/",
+                headers={"authorization": f"Bearer {token}"},
+            )
+
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertRegex(response["Server-Timing"], r'desc="[1-9]\d* queries"')
+        dados = json.loads(logs.records[-1].getMessage())
+        self.assertGreater(dados["consultas"], 0)
+        self.assertGreater(dados["db_ms"], 0)
+        self.assertIn("classroom_turma", dados["sql_mais_lenta"])
+
+    @override_settings(REQUEST_METRICS_SERVER_TIMING=False)
+    def test_sem_server_timing(self):
+        response = self.cliente(self.admin).get("/api/turmas/")
+
+        self.assertNotIn("Server-Timing", response)
+
+
+@skipUnless(settings.METRICS_ENABLED, "prometheus_client não instalado")
+class MetricasTests(ClassroomTestCase):
+    url = "/metrics"
+
+    @override_settings(METRICS_TOKEN="", METRICS_PUBLIC=False)
+    def test_sem_token_fecha(self):
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    @override_settings(METRICS_TOKEN="", METRICS_PUBLIC=True)
+    def test_acesso_anonimo_explicito(self):
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+    @override_settings(METRICS_TOKEN="segredo", METRICS_PUBLIC=False)
+    def test_com_token(self):
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+        response = self.client.get(self.url, HTTP_AUTHORIZATION="Bearer segredo")
+        self.assertEqual(response.status_code, 200)
@@ -7,6 +7,9 @@ from .views import (
     TurmaViewSet,
     MatriculaViewSet,
     RecursoViewSet,
+    cache_stats_view,
+    search_view,
+    dashboard_view,
 )
 
 router = DefaultRouter()
@@ -17,5 +20,8 @@ router.register(r"matriculas", MatriculaViewSet, basename="matricula")
 router.register(r"recursos", RecursoViewSet, basename="recurso")
 
 urlpatterns = [
+    path("cache/stats", cache_stats_view, name="cache_stats"),
+    path("search/", search_view, name="search"),
+    path("me/dashboard", dashboard_view, name="dashboard"),
     path("", include(router.urls)),
 ]
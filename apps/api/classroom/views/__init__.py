@@ -3,6 +3,9 @@ from .treinamento import TreinamentoViewSet
 from .turma import TurmaViewSet
 from .matricula import MatriculaViewSet
 from .recurso import RecursoViewSet
+from .cache import cache_stats_view
+from .search import search_view
+from .dashboard import dashboard_view
 
 __all__ = [
     "AlunoViewSet",
@@ -10,4 +13,7 @@ __all__ = [
     "TurmaViewSet",
     "MatriculaViewSet",
     "RecursoViewSet",
+    "cache_stats_view",
+    "search_view",
+    "dashboard_view",
 ]
@@ -1,28 +1,39 @@
+from django.conf import settings
 from django.db import transaction
-from rest_framework import viewsets, status
+from rest_framework import serializers, viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from ..bulk import importar_alunos, ler_linhas, resumo
+from ..cache import CachedResponseMixin
 from ..models import Aluno
-from ..serializers import AlunoSerializer
+from ..serializers import AlunoSerializer, MatriculaSerializer
 from ..permissions import IsOwnerOrAdmin
+from ..search import FullTextSearchFilter
+from .mixins import AsyncListMixin, SparseFieldsViewMixin, ValuesListMixin
 
 
-class AlunoViewSet(viewsets.ModelViewSet):
-    queryset = Aluno.objects.select_related("user").all()
+class AlunoViewSet(
+    SparseFieldsViewMixin,
+    CachedResponseMixin,
+    ValuesListMixin,
+    AsyncListMixin,
+    viewsets.ModelViewSet,
+):
+    queryset = Aluno.objects.all()
     serializer_class = AlunoSerializer
     permission_classes = [IsOwnerOrAdmin]
+    filter_backends = [FullTextSearchFilter]
 
     def get_queryset(self):
         queryset = super().get_queryset()
+        if self.campo_pedido("user_id"):
+            queryset = queryset.select_related("user")
 
         if self.request.user.is_staff:
             return queryset
 
-        try:
-            return queryset.filter(user=self.request.user)
-        except Exception:
-            return queryset.none()
+        return queryset.filter(user_id=self.request.user.pk)
 
     @transaction.atomic
     def create(self, request, *args, **kwargs):
@@ -38,13 +49,23 @@ class AlunoViewSet(viewsets.ModelViewSet):
             status=status.HTTP_201_CREATED,
         )
 
+    @action(detail=False, methods=["post"])
+    def importar(self, request):
+        linhas = ler_linhas(request)
+        if len(linhas) > settings.IMPORTACAO_MAX_LINHAS:
+            raise serializers.ValidationError(
+                f"No máximo {settings.IMPORTACAO_MAX_LINHAS} linhas por requisição. "
+                "Para arquivos maiores, use `python manage.py importar_alunos`."
+            )
+
+        resultados = importar_alunos(linhas)
+        return Response(resumo(resultados))
+
     @action(detail=True, methods=["get"])
     def matriculas(self, request, pk=None):
         aluno = self.get_object()
-        from ..serializers import MatriculaSerializer
+        return self.values_response(aluno.matriculas.all(), MatriculaSerializer)
 
-        matriculas = aluno.matriculas.select_related(
-            "turma", "turma__treinamento"
-        ).all()
-        serializer = MatriculaSerializer(matriculas, many=True)
-        return Response(serializer.data)
+    async def amatriculas(self, request, pk=None):
+        aluno = await self.aget_object()
+        return await self.avalues_response(aluno.matriculas.all(), MatriculaSerializer)
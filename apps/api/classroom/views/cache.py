@@ -0,0 +1,26 @@
+from django.conf import settings
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+
+from ..cache import CACHE_ALIAS, stats
+from ..permissions import IsAdmin
+
+
+@api_view(["GET"])
+@permission_classes([IsAdmin])
+def cache_stats_view(request):
+    """
+    Contadores do cache de respostas deste processo, para dimensionamento.
+    """
+    config = settings.CACHES[CACHE_ALIAS]
+    contadores = stats.as_dict()
+    consultas = contadores["hits"] + contadores["misses"]
+
+    return Response(
+        {
+            **contadores,
+            "hit_ratio": contadores["hits"] / consultas if consultas else None,
+            "timeout": config.get("TIMEOUT"),
+            "max_entries": config.get("OPTIONS", {}).get("MAX_ENTRIES"),
+        }
+    )
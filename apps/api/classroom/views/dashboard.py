@@ -0,0 +1,160 @@
+import hashlib
+from datetime import date
+
+from django.core.cache import caches
+from django.db.models import Count, Max, OuterRef, Prefetch, Subquery
+from django.http import Http404
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from ..cache import CACHE_ALIAS, stats
+from ..models import Aluno, Matricula, Recurso, Turma
+from ..models.matricula import total_alunos
+from ..serializers import (
+    AlunoSerializer,
+    MatriculaSerializer,
+    RecursoSerializer,
+    TurmaSerializer,
+)
+
+# Prefixo das chaves do painel no cache de respostas
+BASENAME = "dashboard"
+
+
+def _alunos_do_usuario(queryset, user):
+    # Claim `aluno_id` do token, quando disponível (ver `do_usuario`)
+    aluno_id = getattr(user, "aluno_id", None)
+    if aluno_id is not None:
+        return queryset.filter(pk=aluno_id)
+
+    return queryset.filter(user_id=user.pk)
+
+
+def _subconsulta(queryset, agregado):
+    return Subquery(queryset.annotate(valor=agregado).values("valor"))
+
+
+def versao_painel(user):
+    """
+    Versão dos dados do painel do aluno de `user`, numa consulta pelos
+    índices do aluno: os campos do aluno, total e último id das matrículas,
+    último `atualizado_em` das turmas (que muda com as matrículas delas e com
+    o nome do treinamento) e total e último `atualizado_em` dos recursos das
+    turmas. `None` se o usuário não for aluno.
+
+    Lida do banco, vale para todos os processos, e só muda com o que o
+    painel deste aluno exibe.
+    """
+    matriculas = (
+        Matricula.objects.filter(aluno=OuterRef("pk")).order_by().values("aluno")
+    )
+    recursos = (
+        Recurso.objects.filter(turma__matriculas__aluno=OuterRef("pk"))
+        .order_by()
+        .values("turma__matriculas__aluno")
+    )
+    versao = (
+        _alunos_do_usuario(Aluno.objects.all(), user)
+        .annotate(
+            total_matriculas=_subconsulta(matriculas, Count("pk")),
+            ultima_matricula=_subconsulta(matriculas, Max("pk")),
+            ultima_turma=_subconsulta(matriculas, Max("turma__atualizado_em")),
+            total_recursos=_subconsulta(recursos, Count("pk")),
+            ultimo_recurso=_subconsulta(recursos, Max("atualizado_em")),
+        )
+        .values_list(
+            "pk",
+            "user_id",
+            "nome",
+            "email",
+            "telefone",
+            "total_matriculas",
+            "ultima_matricula",
+            "ultima_turma",
+            "total_recursos",
+            "ultimo_recurso",
+        )
+        .first()
+    )
+    if versao is None:
+        return None
+
+    return hashlib.md5(repr(versao).encode()).hexdigest()
+
+
+def carregar_aluno(user, hoje):
+    """
+    Aluno de `user` com matrículas, turmas e recursos liberados em `hoje`,
+    em quatro consultas (aluno, matrículas, turmas e recursos), qualquer que
+    seja o número de turmas. `None` se o usuário não for aluno.
+    """
+    recursos = Recurso.objects.liberados(hoje).order_by("-criado_em", "-id")
+    turmas = (
+        Turma.objects.select_related("treinamento")
+        .annotate(total_alunos=total_alunos())
+        .prefetch_related(
+            Prefetch("recursos", queryset=recursos, to_attr="recursos_visiveis")
+        )
+    )
+    matriculas = Matricula.objects.order_by("-data_matricula", "-id")
+
+    alunos = Aluno.objects.select_related("user").prefetch_related(
+        Prefetch("matriculas", queryset=matriculas),
+        Prefetch("matriculas__turma", queryset=turmas),
+    )
+    return _alunos_do_usuario(alunos, user).first()
+
+
+def montar_dashboard(aluno):
+    """
+    Cada lista no formato do endpoint correspondente: turmas na ordem de
+    `/api/turmas/` e recursos na de `/api/turmas/{id}/recursos/`.
+    """
+    matriculas = aluno.matriculas.all()
+    turmas = sorted(
+        (matricula.turma for matricula in matriculas),
+        key=lambda turma: (turma.data_inicio, turma.pk),
+        reverse=True,
+    )
+    recursos = [recurso for turma in turmas for recurso in turma.recursos_visiveis]
+
+    return {
+        "aluno": AlunoSerializer(aluno).data,
+        "matriculas": MatriculaSerializer(matriculas, many=True).data,
+        "turmas": TurmaSerializer(turmas, many=True).data,
+        "recursos": RecursoSerializer(recursos, many=True).data,
+    }
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def dashboard_view(request):
+    """
+    Painel do aluno autenticado numa só requisição: o próprio registro,
+    matrículas, turmas e recursos visíveis. Em cache por aluno, por dia (a
+    visibilidade dos recursos depende da data de início das turmas) e pela
+    versão dos dados do aluno (`versao_painel`): a alteração de uma turma
+    só invalida o painel dos alunos dela.
+    """
+    versao = versao_painel(request.user)
+    if versao is None:
+        raise Http404("Nenhum aluno vinculado a este usuário.")
+
+    hoje = date.today()
+    cache = caches[CACHE_ALIAS]
+    key = f"classroom:resp:{BASENAME}:{versao}:{request.user.pk}:{hoje.isoformat()}"
+
+    data = cache.get(key)
+    if data is not None:
+        stats.incr("hits")
+        return Response(data)
+
+    stats.incr("misses")
+    aluno = carregar_aluno(request.user, hoje)
+    if aluno is None:
+        raise Http404("Nenhum aluno vinculado a este usuário.")
+
+    data = montar_dashboard(aluno)
+    cache.set(key, data)
+    return Response(data)
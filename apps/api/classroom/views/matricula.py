@@ -1,25 +1,46 @@
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
 
+from ..bulk import ler_linhas, matricular_em_lote, resumo
+from ..cache import CachedResponseMixin
+from ..export import exportar_matriculas
+from ..filters import IndexedOrderingFilter, QueryParamFilter
 from ..models import Matricula
-from ..serializers import MatriculaSerializer
+from ..serializers import MatriculaSerializer, MatriculaFiltroSerializer
 from ..permissions import IsOwnerOrAdmin
+from .mixins import SparseFieldsViewMixin, ValuesListMixin
 
 
-class MatriculaViewSet(viewsets.ModelViewSet):
-    queryset = Matricula.objects.select_related(
-        "aluno", "aluno__user", "turma", "turma__treinamento"
-    ).all()
+class MatriculaViewSet(
+    SparseFieldsViewMixin, CachedResponseMixin, ValuesListMixin, viewsets.ModelViewSet
+):
+    queryset = Matricula.objects.all()
     serializer_class = MatriculaSerializer
     permission_classes = [IsOwnerOrAdmin]
+    filter_backends = [IndexedOrderingFilter, QueryParamFilter]
+    filter_serializer_class = MatriculaFiltroSerializer
+    ordering_fields = ("data_matricula",)
 
     def get_queryset(self):
         queryset = super().get_queryset()
+        if self.campo_pedido("turma_nome") or self.expandido("turma"):
+            queryset = queryset.select_related("turma")
 
         if self.request.user.is_staff:
+            if self.campo_pedido("aluno_nome") or self.expandido("aluno"):
+                queryset = queryset.select_related("aluno")
             return queryset
 
-        try:
-            aluno = self.request.user.alunos
-            return queryset.filter(aluno=aluno)
-        except Exception:
-            return queryset.none()
+        # A permissão de objeto lê `aluno.user_id`
+        return queryset.select_related("aluno").do_usuario(self.request.user)
+
+    @action(detail=False, methods=["post"])
+    def lote(self, request):
+        linhas = ler_linhas(request)
+        resultados = matricular_em_lote(linhas)
+        return Response(resumo(resultados))
+
+    @action(detail=False, methods=["get"])
+    def exportar(self, request):
+        return exportar_matriculas(request, self.get_queryset(), "matriculas")
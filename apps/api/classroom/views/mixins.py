@@ -0,0 +1,190 @@
+from django.core.exceptions import ValidationError
+from django.http import Http404
+from rest_framework.response import Response
+
+from core.async_views import AsyncHandlersMixin
+
+from ..serializers.sparse import (
+    EXPAND_PARAM,
+    FIELDS_PARAM,
+    campos_pedidos,
+    fontes,
+    nomes_pedidos,
+)
+from ..serializers.values import values_representation
+
+
+class ValuesListMixin:
+    """
+    `list` serializado direto de `.values()` (ver `ValuesRepresentation`),
+    sem instanciar os modelos. Com `AsyncListMixin`, vale também para o
+    `alist`. `retrieve` e a escrita continuam pelo serializer.
+    """
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        return self.values_response(queryset, self.get_serializer_class())
+
+    async def _alist(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        return await self.avalues_response(queryset, self.get_serializer_class())
+
+    def values_response(self, queryset, serializer_class):
+        """
+        Resposta (paginada, se houver paginação) com as linhas de `queryset`
+        no formato de `serializer_class`, só com os campos de `?fields=` e
+        `?expand=`.
+        """
+        representacao = self._values_representation(serializer_class)
+        rows = representacao.queryset(queryset)
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(representacao.data(page))
+
+        return Response(representacao.data(rows))
+
+    async def avalues_response(self, queryset, serializer_class):
+        representacao = self._values_representation(serializer_class)
+        rows = representacao.queryset(queryset)
+
+        page = await self.apaginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(representacao.data(page))
+
+        return Response(representacao.data([row async for row in rows.aiterator()]))
+
+    def _values_representation(self, serializer_class):
+        fields, expand = campos_pedidos(self.request, serializer_class)
+
+        # Campos de `?ordering=`, lidos pela paginação mesmo fora de `?fields=`;
+        # as listagens aninhadas são de outro modelo, sem `?ordering=`
+        ordenacao = ()
+        if serializer_class.Meta.model is self.queryset.model:
+            ordenacao = tuple(getattr(self, "ordering_fields", None) or ())
+
+        return values_representation(serializer_class, fields, expand, ordenacao)
+
+
+class SparseFieldsViewMixin:
+    """
+    `?fields=` e `?expand=` nas leituras (ver `SparseFieldsMixin`): o
+    serializer recebe só os campos pedidos e, na leitura de um objeto, as
+    colunas do modelo fora da resposta ficam adiadas (`.defer()`). O
+    `get_queryset` de cada view consulta `campo_pedido` para só fazer os
+    JOINs e anotações dos campos pedidos.
+    """
+
+    # Colunas lidas pelas permissões de objeto, nunca adiadas
+    sparse_required_fields = ()
+    # Falso na busca combinada, que usa a queryset com todos os campos
+    sparse_enabled = True
+
+    def campo_pedido(self, nome):
+        """
+        Se `nome` está na resposta: sem `?fields=`, todos estão; uma relação
+        de `?expand=` também conta.
+        """
+        if not self.sparse_enabled:
+            return True
+
+        fields = nomes_pedidos(self.request, FIELDS_PARAM)
+        return not fields or nome in fields or self.expandido(nome)
+
+    def expandido(self, nome):
+        return self.sparse_enabled and nome in nomes_pedidos(self.request, EXPAND_PARAM)
+
+    def sparse_kwargs(self, serializer_class):
+        """
+        `fields` e `expand` de `serializer_class` para a requisição atual.
+        """
+        fields, expand = campos_pedidos(self.request, serializer_class)
+        if fields is None and not expand:
+            return {}
+
+        return {"fields": fields, "expand": expand}
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs = {**self.sparse_kwargs(self.get_serializer_class()), **kwargs}
+        return super().get_serializer(*args, **kwargs)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+
+        # Nas actions (`/turmas/{id}/alunos/`), `?fields=` é do serializer da
+        # listagem aninhada, não do objeto da view
+        if self.action not in ("list", "retrieve"):
+            return queryset
+
+        serializer_class = self.get_serializer_class()
+        fields, _ = campos_pedidos(self.request, serializer_class)
+        if fields is None:
+            return queryset
+
+        origens = fontes(serializer_class)
+        pedidas = {origens[nome] for nome in fields}
+        adiadas = [
+            field.name
+            for field in queryset.model._meta.concrete_fields
+            if not field.is_relation
+            and not field.primary_key
+            and field.name not in pedidas
+            and field.name not in self.sparse_required_fields
+        ]
+        return queryset.defer(*adiadas)
+
+
+class AsyncListMixin(AsyncHandlersMixin):
+    """
+    `list` assíncrono e utilitários para actions assíncronas: `aget_object` e
+    `apaginate_queryset`. O cache de respostas e o ETag entram pelo `alist`
+    de `CachedResponseMixin` e `ConditionalGetMixin`, antes no MRO.
+
+    Os serializers só leem campos já carregados (`select_related` e
+    anotações), então a serialização não volta ao banco.
+    """
+
+    async def alist(self, request, *args, **kwargs):
+        return await self._alist(request, *args, **kwargs)
+
+    async def _alist(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+
+        page = await self.apaginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        objetos = [obj async for obj in queryset.aiterator()]
+        serializer = self.get_serializer(objetos, many=True)
+        return Response(serializer.data)
+
+    async def apaginate_queryset(self, queryset):
+        if self.paginator is None:
+            return None
+
+        return await self.paginator.apaginate_queryset(
+            queryset, self.request, view=self
+        )
+
+    async def aget_object(self):
+        """
+        Versão assíncrona de `get_object`.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        filtro = {self.lookup_field: self.kwargs[lookup_url_kwarg]}
+
+        try:
+            obj = await queryset.filter(**filtro).afirst()
+        except (TypeError, ValueError, ValidationError):
+            obj = None
+
+        if obj is None:
+            raise Http404(
+                f"No {queryset.model._meta.object_name} matches the given query."
+            )
+
+        self.check_object_permissions(self.request, obj)
+        return obj
@@ -1,26 +1,55 @@
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
 
+from ..cache import CachedResponseMixin
+from ..conditional import ConditionalGetMixin
+from ..filters import IndexedOrderingFilter, QueryParamFilter
 from ..models import Recurso
-from ..serializers import RecursoSerializer
+from ..serializers import (
+    RecursoSerializer,
+    RecursoFiltroSerializer,
+    SincronizacaoSerializer,
+)
 from ..permissions import IsEnrolledAndResourceAccessible
+from ..search import FullTextSearchFilter
+from ..sync import alteracoes_recursos
+from .mixins import AsyncListMixin, SparseFieldsViewMixin, ValuesListMixin
 
 
-class RecursoViewSet(viewsets.ModelViewSet):
-    queryset = Recurso.objects.select_related("turma", "turma__treinamento").all()
+class RecursoViewSet(
+    SparseFieldsViewMixin,
+    CachedResponseMixin,
+    ConditionalGetMixin,
+    ValuesListMixin,
+    AsyncListMixin,
+    viewsets.ModelViewSet,
+):
+    queryset = Recurso.objects.all()
     serializer_class = RecursoSerializer
     permission_classes = [IsEnrolledAndResourceAccessible]
+    filter_backends = [IndexedOrderingFilter, FullTextSearchFilter, QueryParamFilter]
+    filter_serializer_class = RecursoFiltroSerializer
+    ordering_fields = ("criado_em",)
+    etag_fields = ("atualizado_em", "turma__atualizado_em")
+    sparse_required_fields = ("draft", "acesso_previo")
 
     def get_queryset(self):
         queryset = super().get_queryset()
-        
+
         if self.request.user.is_staff:
+            if self.campo_pedido("turma_nome") or self.expandido("turma"):
+                queryset = queryset.select_related("turma")
             return queryset
 
-        try:
-            aluno = self.request.user.alunos
-            return queryset.filter(
-                draft=False,
-                turma__matriculas__aluno=aluno,
-            ).distinct()
-        except Exception:
-            return queryset.none()
+        # A permissão de objeto lê `turma.data_inicio`
+        return queryset.select_related("turma").visible_to(self.request.user)
+
+    @action(detail=False, methods=["get"], url_path="changes", url_name="changes")
+    def alteracoes(self, request):
+        """
+        Sincronização incremental: `?since=<cursor>` (e `?turma=<id>`).
+        """
+        parametros = SincronizacaoSerializer(data=request.query_params)
+        parametros.is_valid(raise_exception=True)
+        return Response(alteracoes_recursos(request, **parametros.validated_data))
@@ -0,0 +1,45 @@
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from ..search import buscar
+from ..serializers import BuscaSerializer
+from ..serializers.values import values_representation
+from .aluno import AlunoViewSet
+from .recurso import RecursoViewSet
+from .turma import TurmaViewSet
+
+GRUPOS = {
+    "alunos": AlunoViewSet,
+    "turmas": TurmaViewSet,
+    "recursos": RecursoViewSet,
+}
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def search_view(request):
+    """
+    Busca em alunos, turmas e recursos (`?q=`, `?limite=` por grupo), pela
+    relevância. Cada grupo parte da queryset da listagem correspondente, com
+    a mesma visibilidade para o aluno.
+    """
+    parametros = BuscaSerializer(data=request.query_params)
+    parametros.is_valid(raise_exception=True)
+    q, limite = parametros.validated_data["q"], parametros.validated_data["limite"]
+
+    resultado = {}
+    for grupo, viewset_class in GRUPOS.items():
+        viewset = viewset_class(
+            request=request,
+            action="list",
+            args=(),
+            kwargs={},
+            format_kwarg=None,
+            sparse_enabled=False,
+        )
+        representacao = values_representation(viewset.get_serializer_class())
+        queryset = buscar(viewset.get_queryset(), q).order_by("-relevancia", "id")
+        resultado[grupo] = representacao.data(representacao.queryset(queryset)[:limite])
+
+    return Response(resultado)
@@ -2,19 +2,49 @@ from rest_framework import viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from ..cache import CachedResponseMixin
+from ..conditional import ConditionalGetMixin
 from ..models import Treinamento
+from ..models.matricula import total_alunos
+from ..models.turma import total_turmas
 from ..serializers import TreinamentoSerializer, TurmaSerializer
 from ..permissions import IsAdminOrReadOnly
+from .mixins import SparseFieldsViewMixin
 
 
-class TreinamentoViewSet(viewsets.ModelViewSet):
-    queryset = Treinamento.objects.prefetch_related("turmas").all()
+class TreinamentoViewSet(
+    SparseFieldsViewMixin,
+    CachedResponseMixin,
+    ConditionalGetMixin,
+    viewsets.ModelViewSet,
+):
+    queryset = Treinamento.objects.all()
     serializer_class = TreinamentoSerializer
     permission_classes = [IsAdminOrReadOnly]
 
+    def get_etag_queryset(self):
+        # Sem o JOIN das turmas: `total_turmas` já move o `atualizado_em`
+        return Treinamento.objects.all()
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.campo_pedido("total_turmas"):
+            queryset = queryset.annotate(total_turmas=total_turmas())
+
+        return queryset
+
     @action(detail=True, methods=["get"])
     def turmas(self, request, pk=None):
         treinamento = self.get_object()
         turmas = treinamento.turmas.all()
-        serializer = TurmaSerializer(turmas, many=True)
+        if self.campo_pedido("total_alunos"):
+            turmas = turmas.annotate(total_alunos=total_alunos())
+
+        campos = self.sparse_kwargs(TurmaSerializer)
+        page = self.paginate_queryset(turmas)
+        if page is not None:
+            serializer = TurmaSerializer(page, many=True, **campos)
+            return self.get_paginated_response(serializer.data)
+
+        serializer = TurmaSerializer(turmas, many=True, **campos)
         return Response(serializer.data)
@@ -1,43 +1,85 @@
 from rest_framework import viewsets
 from rest_framework.decorators import action
-from rest_framework.response import Response
 
+from ..cache import CachedResponseMixin
+from ..conditional import ConditionalGetMixin
+from ..export import exportar_matriculas
+from ..filters import IndexedOrderingFilter, QueryParamFilter
 from ..models import Turma
-from ..serializers import TurmaSerializer, MatriculaSerializer, RecursoSerializer
-from ..permissions import IsEnrolledStudentOrAdmin
+from ..models.matricula import total_alunos
+from ..serializers import (
+    TurmaSerializer,
+    TurmaFiltroSerializer,
+    MatriculaSerializer,
+    MatriculaColegaSerializer,
+    RecursoSerializer,
+)
+from ..permissions import IsEnrolledStudentOrAdmin, matriculado_na_turma
+from ..search import FullTextSearchFilter
+from .mixins import AsyncListMixin, SparseFieldsViewMixin, ValuesListMixin
 
 
-class TurmaViewSet(viewsets.ModelViewSet):
-    queryset = (
-        Turma.objects.select_related("treinamento")
-        .prefetch_related("matriculas", "recursos")
-        .all()
-    )
+class TurmaViewSet(
+    SparseFieldsViewMixin,
+    CachedResponseMixin,
+    ConditionalGetMixin,
+    ValuesListMixin,
+    AsyncListMixin,
+    viewsets.ModelViewSet,
+):
+    queryset = Turma.objects.all()
     serializer_class = TurmaSerializer
     permission_classes = [IsEnrolledStudentOrAdmin]
+    filter_backends = [IndexedOrderingFilter, FullTextSearchFilter, QueryParamFilter]
+    filter_serializer_class = TurmaFiltroSerializer
+    ordering_fields = ("data_inicio", "nome")
+    etag_fields = ("atualizado_em", "treinamento__atualizado_em")
 
     def get_queryset(self):
         queryset = super().get_queryset()
+        if self.campo_pedido("treinamento_nome") or self.expandido("treinamento"):
+            queryset = queryset.select_related("treinamento")
+        if self.campo_pedido("total_alunos"):
+            queryset = queryset.annotate(total_alunos=total_alunos())
 
+        return self._visiveis(queryset)
+
+    def get_etag_queryset(self):
+        # Sem a contagem das matrículas: `total_alunos` já move o `atualizado_em`
+        return self._visiveis(Turma.objects.all())
+
+    def _visiveis(self, queryset):
         if self.request.user.is_staff:
             return queryset
 
-        try:
-            aluno = self.request.user.alunos
-            return queryset.filter(matriculas__aluno=aluno).distinct()
-        except Exception:
-            return queryset.none()
+        return queryset.filter(matriculado_na_turma(self.request, "pk"))
 
     @action(detail=True, methods=["get"])
     def alunos(self, request, pk=None):
         turma = self.get_object()
-        matriculas = turma.matriculas.select_related("aluno", "aluno__user").all()
-        serializer = MatriculaSerializer(matriculas, many=True)
-        return Response(serializer.data)
+        if request.user.is_staff:
+            serializer_class = MatriculaSerializer
+        else:
+            serializer_class = MatriculaColegaSerializer
+
+        return self.values_response(turma.matriculas.all(), serializer_class)
+
+    @action(detail=True, methods=["get"], url_path="alunos/exportar")
+    def exportar_alunos(self, request, pk=None):
+        turma = self.get_object()
+        return exportar_matriculas(
+            request, turma.matriculas.all(), f"turma-{turma.pk}-alunos"
+        )
 
     @action(detail=True, methods=["get"])
     def recursos(self, request, pk=None):
         turma = self.get_object()
         recursos = turma.recursos.all()
-        serializer = RecursoSerializer(recursos, many=True)
-        return Response(serializer.data)
+        if not request.user.is_staff:
+            recursos = recursos.visible_to(request.user)
+
+        return self.etag_response(
+            recursos,
+            ("atualizado_em", "turma__atualizado_em"),
+            lambda: self.values_response(recursos, RecursoSerializer),
+        )
@@ -0,0 +1,14 @@
+from django.apps import AppConfig
+
+
+class CoreConfig(AppConfig):
+    name = "core"
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+
+        from .middleware import instalar_medicao
+
+        connection_created.connect(
+            instalar_medicao, dispatch_uid="core-metricas-requisicao"
+        )
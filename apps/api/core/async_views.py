@@ -0,0 +1,112 @@
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+
+# Pool limitado para trabalho bloqueante e pesado de CPU (hash de senha) nas
+# views assíncronas: um login não ocupa o event loop e a quantidade de hashes
+# simultâneos fica limitada ao número de núcleos.
+blocking_pool = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("DJANGO_BLOCKING_THREADS", os.cpu_count())),
+    thread_name_prefix="blocking",
+)
+
+
+def _fechando_conexoes(func, *args, **kwargs):
+    try:
+        return func(*args, **kwargs)
+    finally:
+        close_old_connections()
+
+
+async def run_blocking(func, *args, **kwargs):
+    """
+    Executa `func` no `blocking_pool`. As conexões com o banco abertas na
+    thread são liberadas ao final, como ao fim de uma requisição.
+    """
+    return await sync_to_async(
+        _fechando_conexoes, thread_sensitive=False, executor=blocking_pool
+    )(func, *args, **kwargs)
+
+
+class AsyncHandlersMixin:
+    """
+    Handlers assíncronos para views do DRF, servidas por ASGI.
+
+    Um handler `a<nome>` (`alist`, `amatriculas`, `aget`, `apost`) é a
+    variante assíncrona da action/método `<nome>`. Com `ASYNC_VIEWS` ativo,
+    `as_view()` devolve uma view assíncrona: as requisições com variante
+    assíncrona rodam no event loop e as demais seguem pela view síncrona em
+    uma thread, como o Django faz com qualquer view síncrona sob ASGI. Sem
+    `ASYNC_VIEWS` (WSGI), nada muda.
+
+    A autenticação (claims do JWT) e as permissões de `has_permission` não
+    consultam o banco, mas `initial()` ainda lê o cache (limites de
+    requisição, revogação de tokens), bloqueante no Redis/Memcached: roda
+    numa thread, fora do event loop.
+    """
+
+    @classmethod
+    def as_view(cls, *args, **initkwargs):
+        view = super().as_view(*args, **initkwargs)
+        if not settings.ASYNC_VIEWS:
+            return view
+
+        actions = getattr(view, "actions", None)
+
+        async def async_view(request, *args, **kwargs):
+            handler_name = cls._async_handler_name(actions, request.method)
+            if handler_name is None:
+                return await sync_to_async(view)(request, *args, **kwargs)
+
+            self = cls(**view.initkwargs)
+            if actions is not None:
+                self.action_map = actions
+                for method, action in actions.items():
+                    setattr(self, method, getattr(self, action))
+                if "get" in actions and "head" not in actions:
+                    self.head = self.get
+
+            self.setup(request, *args, **kwargs)
+            return await self.adispatch(handler_name, request, *args, **kwargs)
+
+        functools.update_wrapper(async_view, view)
+        return markcoroutinefunction(async_view)
+
+    @classmethod
+    def _async_handler_name(cls, actions, method):
+        method = method.lower()
+        if actions is not None:
+            name = actions.get(method)
+            if name is None and method == "head":
+                name = actions.get("get")
+        else:
+            name = "get" if method == "head" else method
+
+        if name is None or not hasattr(cls, f"a{name}"):
+            return None
+
+        return f"a{name}"
+
+    async def adispatch(self, handler_name, request, *args, **kwargs):
+        """
+        Equivalente assíncrono de `APIView.dispatch`.
+        """
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            handler = getattr(self, handler_name)
+            response = await handler(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
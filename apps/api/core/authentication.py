@@ -0,0 +1,62 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+
+class ClaimsUser(TokenUser):
+    """
+    Usuário montado apenas com as claims do token (`user_id`, `is_staff` e
+    `aluno_id`), sem consultar o banco.
+    """
+
+    @cached_property
+    def id(self):
+        user_id = self.token[api_settings.USER_ID_CLAIM]
+        return get_user_model()._meta.pk.to_python(user_id)
+
+    @cached_property
+    def aluno_id(self):
+        return self.token.get("aluno_id")
+
+
+def _revogacao_key(user_id):
+    return f"auth:revogado:{user_id}"
+
+
+def revogar_tokens(user_id):
+    """
+    Invalida os tokens emitidos até agora para o usuário. Só tem efeito com
+    `JWT_REVOCATION_CHECK` ativo.
+    """
+    lifetime = settings.SIMPLE_JWT["ACCESS_TOKEN_LIFETIME"]
+    cache.set(_revogacao_key(user_id), int(time.time()), lifetime.total_seconds())
+
+
+class StatelessJWTAuthentication(JWTStatelessUserAuthentication):
+    """
+    Autenticação JWT sem buscar o `User` no banco a cada requisição.
+
+    Com `JWT_REVOCATION_CHECK`, tokens emitidos antes de uma revogação
+    (usuário desativado, removido, promovido/rebaixado ou com senha trocada)
+    são rejeitados consultando apenas o cache.
+    """
+
+    def get_user(self, validated_token):
+        user = super().get_user(validated_token)
+
+        if settings.JWT_REVOCATION_CHECK:
+            revogado_em = cache.get(_revogacao_key(user.pk))
+            # `iat` é em segundos inteiros: um token do mesmo segundo da
+            # revogação pode ser anterior a ela, e também é rejeitado
+            if revogado_em is not None and validated_token["iat"] <= revogado_em:
+                raise InvalidToken(_("Token has been revoked"))
+
+        return user
@@ -0,0 +1,18 @@
+from django.contrib.auth.hashers import Argon2PasswordHasher
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """
+    Argon2id com os parâmetros mínimos recomendados pela OWASP (19 MiB, 2
+    iterações, 1 thread).
+
+    O padrão do Django (100 MiB, 8 threads) limita quantos logins simultâneos
+    cabem em um worker; com estes parâmetros cada verificação usa um núcleo e
+    pouca memória, e o custo continua muito acima de um ataque offline viável.
+    Hashes com outros parâmetros (ou de outro algoritmo) são refeitos no
+    próximo login.
+    """
+
+    time_cost = 2
+    memory_cost = 19456
+    parallelism = 1
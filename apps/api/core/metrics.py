@@ -0,0 +1,120 @@
+import functools
+import os
+import time
+
+from django.conf import settings
+
+# Métricas agregadas no formato do Prometheus, expostas em `/metrics`.
+#
+# Com `PROMETHEUS_MULTIPROC_DIR` definido (gunicorn com vários workers), cada
+# processo grava seus valores em arquivos mmap nesse diretório e o endpoint
+# soma todos eles; sem ele, os valores ficam na memória do processo. Sem o
+# `prometheus_client` (ou com `DJANGO_METRICS=False`) as funções abaixo não
+# fazem nada.
+
+if settings.METRICS_ENABLED:
+    from prometheus_client import Counter, Histogram
+
+    REQUEST_DURATION = Histogram(
+        "api_request_duration_seconds",
+        "Duração das requisições por rota (action do ViewSet).",
+        ["view", "method", "status"],
+        buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+    )
+    REQUEST_QUERIES = Histogram(
+        "api_request_db_queries",
+        "Queries ao banco por requisição.",
+        ["view"],
+        buckets=(0, 1, 2, 3, 5, 8, 13, 21, 50, 100),
+    )
+    REQUEST_DB_DURATION = Histogram(
+        "api_request_db_duration_seconds",
+        "Tempo total no banco por requisição.",
+        ["view"],
+        buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5),
+    )
+    TOKEN_REQUESTS = Counter(
+        "api_token_requests_total",
+        "Pedidos de token em /api/auth/token, por resultado.",
+        ["result"],
+    )
+    TOKEN_DURATION = Histogram(
+        "api_token_duration_seconds",
+        "Duração da emissão de token (verificação de senha e claims).",
+        ["result"],
+        buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+    )
+    PERMISSION_DURATION = Histogram(
+        "api_permission_check_seconds",
+        "Duração das verificações de permissão da classroom.",
+        ["permission", "check"],
+        buckets=(0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05),
+    )
+    CACHE_EVENTS = Counter(
+        "api_response_cache_events_total",
+        "Eventos do cache de respostas (hits, misses, invalidations).",
+        ["event"],
+    )
+
+
+def observe_request(view, method, status, duracao, consultas, tempo_db):
+    """
+    Registra uma requisição (chamado pelo `RequestMetricsMiddleware`).
+    """
+    if not settings.METRICS_ENABLED:
+        return
+
+    view = view or "unmatched"
+    REQUEST_DURATION.labels(view, method, status).observe(duracao)
+    REQUEST_QUERIES.labels(view).observe(consultas)
+    REQUEST_DB_DURATION.labels(view).observe(tempo_db)
+
+
+def observe_token(result, duracao):
+    if not settings.METRICS_ENABLED:
+        return
+
+    TOKEN_REQUESTS.labels(result).inc()
+    TOKEN_DURATION.labels(result).observe(duracao)
+
+
+def count_cache_event(event, valor=1):
+    if settings.METRICS_ENABLED:
+        CACHE_EVENTS.labels(event).inc(valor)
+
+
+def timed_permission(check):
+    """
+    Decorator para `has_permission`/`has_object_permission`: mede cada
+    verificação, rotulada pela classe de permissão.
+    """
+    if not settings.METRICS_ENABLED:
+        return check
+
+    permission, nome = check.__qualname__.rsplit(".", 1)
+    histograma = PERMISSION_DURATION.labels(permission, nome)
+
+    @functools.wraps(check)
+    def wrapper(*args, **kwargs):
+        inicio = time.perf_counter()
+        try:
+            return check(*args, **kwargs)
+        finally:
+            histograma.observe(time.perf_counter() - inicio)
+
+    return wrapper
+
+
+def registry():
+    """
+    Registro a ser exposto: a soma dos arquivos de todos os workers no modo
+    multiprocesso, ou o registro global do processo.
+    """
+    from prometheus_client import REGISTRY, CollectorRegistry, multiprocess
+
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return REGISTRY
+
+    registro = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registro)
+    return registro
@@ -0,0 +1,222 @@
+import contextvars
+import json
+import logging
+import random
+import time
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from . import metrics
+
+logger = logging.getLogger("core.requests")
+
+# Limite de queries guardadas por requisição para a captura de SQL completa
+MAX_SQL_CAPTURADO = 200
+
+# Métricas da requisição em andamento. As conexões do Django são por thread,
+# e sob ASGI as queries rodam nas threads do `sync_to_async`, que recebem uma
+# cópia do contexto: cada conexão tem o mesmo wrapper (`medir_query`), que
+# soma na requisição do contexto atual.
+_metricas_atuais = contextvars.ContextVar("metricas_requisicao", default=None)
+
+
+def medir_query(execute, sql, params, many, context):
+    metricas = _metricas_atuais.get()
+    if metricas is None:
+        return execute(sql, params, many, context)
+
+    return metricas(execute, sql, params, many, context)
+
+
+def instalar_medicao(sender, connection, **kwargs):
+    """
+    Receptor de `connection_created` (ver `core/apps.py`): instala
+    `medir_query` em cada conexão aberta, em qualquer thread.
+    """
+    if medir_query not in connection.execute_wrappers:
+        # No início da lista: `connection.execute_wrapper()` remove o último
+        connection.execute_wrappers.insert(0, medir_query)
+
+
+class MetricasRequisicao:
+    """
+    Métricas de uma requisição. Chamada por `medir_query` em cada query
+    feita durante `coletar()`: conta as queries, soma o tempo no banco e
+    guarda a mais lenta.
+    """
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.consultas = 0
+        self.tempo_db = 0.0
+        self.mais_lenta = (0.0, None)
+        self.sql = []
+        self.inicio_render = None
+        self.tempo_render = 0.0
+        self.tamanho = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duracao = time.perf_counter() - inicio
+            self.consultas += 1
+            self.tempo_db += duracao
+            if duracao > self.mais_lenta[0]:
+                self.mais_lenta = (duracao, sql)
+            if len(self.sql) < MAX_SQL_CAPTURADO:
+                # Só o texto com os placeholders: os parâmetros trazem dados
+                # dos usuários (e-mails, hashes de senha)
+                self.sql.append((duracao, sql))
+
+    @contextmanager
+    def coletar(self):
+        """
+        Mede as queries do contexto atual (e das threads que o copiarem)
+        enquanto o bloco durar.
+        """
+        anterior = _metricas_atuais.get()
+        _metricas_atuais.set(self)
+        try:
+            yield
+        finally:
+            # `set` e não `reset(token)`: o corpo de um streaming pode
+            # terminar de ser lido em outro contexto
+            _metricas_atuais.set(anterior)
+
+    def fim_render(self, response):
+        if self.inicio_render is not None:
+            self.tempo_render = time.perf_counter() - self.inicio_render
+        return response
+
+
+class RequestMetricsMiddleware:
+    """
+    Mede cada requisição: rota, número de queries, tempo total no banco, a
+    query mais lenta, tempo de renderização (serialização da resposta) e
+    tamanho da resposta.
+
+    As queries são medidas por um `execute_wrapper` em cada conexão, sem
+    depender de DEBUG, também nas threads em que o ASGI roda o ORM. O resultado vai no header `Server-Timing` e em uma linha de log
+    JSON (`core.requests`). Requisições acima de `SLOW_REQUEST_MS` são
+    amostradas (`SLOW_REQUEST_SAMPLE_RATE`) com o SQL de cada query, sem os
+    parâmetros.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        metricas = request._metricas = MetricasRequisicao()
+        with metricas.coletar():
+            response = self.get_response(request)
+
+        return self._finalizar(request, response, metricas)
+
+    async def __acall__(self, request):
+        metricas = request._metricas = MetricasRequisicao()
+        with metricas.coletar():
+            response = await self.get_response(request)
+
+        return self._finalizar(request, response, metricas)
+
+    def process_template_response(self, request, response):
+        # Respostas do DRF são renderizadas depois da view: mede o render.
+        metricas = getattr(request, "_metricas", None)
+        if metricas is not None:
+            metricas.inicio_render = time.perf_counter()
+            response.add_post_render_callback(metricas.fim_render)
+        return response
+
+    def _finalizar(self, request, response, metricas):
+        if settings.REQUEST_METRICS_SERVER_TIMING:
+            response["Server-Timing"] = (
+                f"db;dur={_ms(metricas.tempo_db)};"
+                f'desc="{metricas.consultas} queries", '
+                f"render;dur={_ms(metricas.tempo_render)}, "
+                f"total;dur={_ms(time.perf_counter() - metricas.inicio)}"
+            )
+
+        if not response.streaming:
+            metricas.tamanho = len(response.content)
+            self._registrar(request, response, metricas)
+        elif response.is_async:
+            response.streaming_content = self._acompanhar_async(
+                request, response, metricas, response.streaming_content
+            )
+        else:
+            response.streaming_content = self._acompanhar(
+                request, response, metricas, response.streaming_content
+            )
+
+        return response
+
+    def _acompanhar(self, request, response, metricas, conteudo):
+        """
+        Nos exports (streaming) as queries rodam enquanto o corpo é enviado:
+        continua medindo até o fim e só então registra a requisição.
+        """
+        with metricas.coletar():
+            for parte in conteudo:
+                metricas.tamanho += len(parte)
+                yield parte
+        self._registrar(request, response, metricas)
+
+    async def _acompanhar_async(self, request, response, metricas, conteudo):
+        with metricas.coletar():
+            async for parte in conteudo:
+                metricas.tamanho += len(parte)
+                yield parte
+        self._registrar(request, response, metricas)
+
+    def _registrar(self, request, response, metricas):
+        total = time.perf_counter() - metricas.inicio
+        match = getattr(request, "resolver_match", None)
+
+        metrics.observe_request(
+            match.view_name if match else None,
+            request.method,
+            response.status_code,
+            total,
+            metricas.consultas,
+            metricas.tempo_db,
+        )
+
+        dados = {
+            "metodo": request.method,
+            "rota": match.view_name if match else None,
+            "caminho": request.path,
+            "status": response.status_code,
+            "duracao_ms": _ms(total),
+            "consultas": metricas.consultas,
+            "db_ms": _ms(metricas.tempo_db),
+            "render_ms": _ms(metricas.tempo_render),
+            "tamanho": metricas.tamanho,
+        }
+        if metricas.mais_lenta[1] is not None:
+            dados["sql_mais_lenta_ms"] = _ms(metricas.mais_lenta[0])
+            dados["sql_mais_lenta"] = metricas.mais_lenta[1]
+
+        lenta = total * 1000 >= settings.SLOW_REQUEST_MS
+        if lenta and random.random() < settings.SLOW_REQUEST_SAMPLE_RATE:
+            dados["sql"] = [
+                {"ms": _ms(duracao), "sql": sql} for duracao, sql in metricas.sql
+            ]
+            logger.warning(json.dumps(dados, ensure_ascii=False, default=str))
+        else:
+            logger.info(json.dumps(dados, ensure_ascii=False, default=str))
+
+
+def _ms(segundos):
+    return round(segundos * 1000, 2)
@@ -0,0 +1,34 @@
+import orjson
+from rest_framework.renderers import JSONRenderer
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    `JSONRenderer` com orjson.
+
+    Gera os mesmos bytes do renderer do DRF: JSON compacto e UTF-8, datas
+    (`date`/`datetime`) em ISO 8601 com `Z` para UTC e U+2028/U+2029
+    escapados. Tipos que o orjson não conhece (`Decimal`, textos lazy,
+    querysets) passam pelo `JSONEncoder` do DRF. Saída indentada (API
+    navegável, `; indent=`) e configurações não compactas usam o renderer
+    padrão.
+    """
+
+    options = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent is not None or not self.compact or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(
+            data, default=self.encoder_class().default, option=self.options
+        )
+
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028")
+            ret = ret.replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
@@ -0,0 +1,45 @@
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class LoginRateThrottle(SimpleRateThrottle):
+    """
+    Limita as tentativas de login por IP e usuário.
+
+    O IP vem de `get_ident`: o `REMOTE_ADDR` ou, atrás de `NUM_PROXIES`
+    proxies, o endereço que o último deles incluiu no `X-Forwarded-For` (o
+    restante do cabeçalho é escolhido pelo cliente).
+
+    A chave inclui o `username` para que uma turma inteira atrás do mesmo IP
+    consiga entrar ao mesmo tempo, enquanto tentativas repetidas contra uma
+    conta são recusadas antes de verificar a senha.
+    """
+
+    scope = "login"
+
+    def get_cache_key(self, request, view):
+        username = ""
+        if hasattr(request.data, "get"):
+            username = str(request.data.get("username", "")).strip().lower()
+
+        return self.cache_format % {
+            "scope": self.scope,
+            "ident": f"{self.get_ident(request)}:{username}",
+        }
+
+
+class LoginIPRateThrottle(SimpleRateThrottle):
+    """
+    Limita as tentativas de login por IP, quaisquer que sejam os usuários.
+
+    Sem ele, trocar o `username` a cada tentativa escaparia do limite por
+    IP e usuário. O limite é maior, para uma turma entrando atrás do mesmo
+    IP.
+    """
+
+    scope = "login_ip"
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            "scope": self.scope,
+            "ident": self.get_ident(request),
+        }
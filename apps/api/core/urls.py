@@ -15,6 +15,7 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
+from django.conf import settings
 from django.contrib import admin
 from django.urls import include, path
 
@@ -28,3 +29,8 @@ urlpatterns = [
     # API da aplicação classroom
     path("api/", include("classroom.urls")),
 ]
+
+if settings.METRICS_ENABLED:
+    from .views.metrics import metrics_view
+
+    urlpatterns.append(path("metrics", metrics_view, name="metrics"))
@@ -1,14 +1,29 @@
-from rest_framework.decorators import api_view
+import time
+
+from rest_framework.exceptions import AuthenticationFailed, ValidationError
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework_simplejwt.views import TokenObtainPairView
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
+from classroom.models import Aluno
+
+from .. import metrics
+from ..async_views import AsyncHandlersMixin, run_blocking
+from ..throttling import LoginIPRateThrottle, LoginRateThrottle
+
 
 class AccessTokenOnlySerializer(TokenObtainPairSerializer):
     @classmethod
     def get_token(cls, user):
         token = super().get_token(user)
 
+        # Claims usadas pela autenticação stateless (core/authentication.py)
+        token["is_staff"] = user.is_staff
+        token["aluno_id"] = (
+            Aluno.objects.filter(user=user).values_list("id", flat=True).first()
+        )
+
         return token
 
     def validate(self, attrs):
@@ -20,11 +35,40 @@ class AccessTokenOnlySerializer(TokenObtainPairSerializer):
         return data
 
 
-class AccessTokenOnlyView(TokenObtainPairView):
+class AccessTokenOnlyView(AsyncHandlersMixin, TokenObtainPairView):
     serializer_class = AccessTokenOnlySerializer
+    throttle_classes = (LoginRateThrottle, LoginIPRateThrottle)
+
+    def post(self, request, *args, **kwargs):
+        # Taxa e latência da emissão de tokens, por resultado (/metrics)
+        inicio = time.perf_counter()
+        result = "error"
+        try:
+            response = super().post(request, *args, **kwargs)
+            result = "issued"
+            return response
+        except AuthenticationFailed:
+            result = "rejected"
+            raise
+        except ValidationError:
+            result = "invalid"
+            raise
+        finally:
+            metrics.observe_token(result, time.perf_counter() - inicio)
+
+    async def apost(self, request, *args, **kwargs):
+        # Verificação de senha (e rehash) no pool limitado, fora do event loop
+        return await run_blocking(self.post, request, *args, **kwargs)
+
+
+class IsAdminView(AsyncHandlersMixin, APIView):
+    def get(self, request):
+        is_admin = request.user.is_authenticated and request.user.is_staff
+        return Response({"is_admin": is_admin})
+
+    async def aget(self, request):
+        # Só lê as claims do token: nada bloqueia o event loop
+        return self.get(request)
 
 
-@api_view(["GET"])
-def is_admin_view(request):
-    is_admin = request.user.is_authenticated and request.user.is_staff
-    return Response({"is_admin": is_admin})
+is_admin_view = IsAdminView.as_view()
@@ -0,0 +1,30 @@
+import secrets
+
+from django.conf import settings
+from django.http import HttpResponse
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+from ..metrics import registry
+
+
+def metrics_view(request):
+    """
+    Métricas no formato de texto do Prometheus.
+
+    Com `DJANGO_METRICS_TOKEN`, o scraper precisa enviar
+    `Authorization: Bearer <token>`. Sem o token, o endpoint responde 403,
+    a não ser que `DJANGO_METRICS_PUBLIC=True` libere a leitura anônima.
+    """
+    if settings.METRICS_TOKEN:
+        esperado = f"Bearer {settings.METRICS_TOKEN}"
+        recebido = request.headers.get("Authorization", "")
+        if not secrets.compare_digest(recebido.encode(), esperado.encode()):
+            return HttpResponse(status=401)
+    elif not settings.METRICS_PUBLIC:
+        return HttpResponse(
+            "Defina DJANGO_METRICS_TOKEN (ou DJANGO_METRICS_PUBLIC=True).",
+            status=403,
+            content_type="text/plain; charset=utf-8",
+        )
+
+    return HttpResponse(generate_latest(registry()), content_type=CONTENT_TYPE_LATEST)
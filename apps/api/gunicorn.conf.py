@@ -0,0 +1,18 @@
+# Configuração do gunicorn, carregada automaticamente do diretório atual.
+import os
+import shutil
+
+
+def on_starting(server):
+    # Descarta as métricas de execuções anteriores (e do `migrate`)
+    diretorio = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if diretorio:
+        shutil.rmtree(diretorio, ignore_errors=True)
+        os.makedirs(diretorio, exist_ok=True)
+
+
+def child_exit(server, worker):
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
@@ -1,7 +1,7 @@
 import { z } from "zod";
-import { apiFetch } from "./client";
+import { apiFetch, apiFetchAll } from "./client";
 
-const getAlunoSchema = z.object({
+export const getAlunoSchema = z.object({
 	id: z.number(),
 	user_id: z.number(),
 	nome: z.string(),
@@ -18,7 +18,7 @@ export type CreateAlunoSchema = z.infer<typeof createAlunoSchema>;
 export type GetAlunoSchema = z.infer<typeof getAlunoSchema>;
 
 export async function getAlunos() {
-	const data = await apiFetch("/api/alunos");
+	const data = await apiFetchAll("/api/alunos");
 
 	return getAlunoSchema.array().parse(data);
 }
@@ -6,7 +6,11 @@ export async function apiFetch<T>(
 ): Promise<T> {
 	const token = localStorage.getItem("access_token");
 
-	const response = await fetch(`${ENV.VITE_APP_URL_API}${path}`, {
+	const url = path.startsWith("http")
+		? path
+		: `${ENV.VITE_APP_URL_API}${path}`;
+
+	const response = await fetch(url, {
 		...options,
 		headers: {
 			"Content-Type": "application/json",
@@ -25,3 +29,22 @@ export async function apiFetch<T>(
 
 	return response.json();
 }
+
+type Paginated<T> = {
+	next: string | null;
+	previous: string | null;
+	results: T[];
+};
+
+export async function apiFetchAll<T>(path: string): Promise<T[]> {
+	const results: T[] = [];
+	let next: string | null = path;
+
+	while (next) {
+		const page: Paginated<T> = await apiFetch<Paginated<T>>(next);
+		results.push(...page.results);
+		next = page.next;
+	}
+
+	return results;
+}
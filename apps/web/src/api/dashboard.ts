@@ -0,0 +1,20 @@
+import { z } from "zod";
+import { getAlunoSchema } from "./aluno";
+import { apiFetch } from "./client";
+import { getMatriculaSchema } from "./matricula";
+import { getRecursoTurmaSchema, getTurmaSchema } from "./turmas";
+
+const getDashboardSchema = z.object({
+	aluno: getAlunoSchema,
+	matriculas: getMatriculaSchema.array(),
+	turmas: getTurmaSchema.array(),
+	recursos: getRecursoTurmaSchema.array(),
+});
+
+export type GetDashboardSchema = z.infer<typeof getDashboardSchema>;
+
+export async function getDashboard() {
+	const data = await apiFetch("/api/me/dashboard");
+
+	return getDashboardSchema.parse(data);
+}
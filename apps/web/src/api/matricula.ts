@@ -1,7 +1,7 @@
 import { z } from "zod";
-import { apiFetch } from "./client";
+import { apiFetch, apiFetchAll } from "./client";
 
-const getMatriculaSchema = z.object({
+export const getMatriculaSchema = z.object({
 	id: z.number(),
 	aluno: z.number(),
 	aluno_nome: z.string(),
@@ -21,7 +21,7 @@ export type CreateMatriculaSchema = z.infer<typeof createMatriculaSchema>;
 export type GetMatriculaSchema = z.infer<typeof getMatriculaSchema>;
 
 export async function getMatriculas() {
-	const data = await apiFetch("/api/matriculas/");
+	const data = await apiFetchAll("/api/matriculas/");
 
 	return getMatriculaSchema.array().parse(data);
 }
@@ -1,5 +1,5 @@
 import { z } from "zod";
-import { apiFetch } from "./client";
+import { apiFetch, apiFetchAll } from "./client";
 
 const getRecursoSchema = z.object({
 	id: z.number(),
@@ -27,7 +27,7 @@ export type CreateRecursoSchema = z.infer<typeof createRecursoSchema>;
 export type GetRecursoSchema = z.infer<typeof getRecursoSchema>;
 
 export async function getRecursos() {
-	const data = await apiFetch("/api/recursos");
+	const data = await apiFetchAll("/api/recursos");
 
 	return getRecursoSchema.array().parse(data);
 }
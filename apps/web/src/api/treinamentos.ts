@@ -1,5 +1,5 @@
 import { z } from "zod";
-import { apiFetch } from "./client";
+import { apiFetch, apiFetchAll } from "./client";
 
 const getTreinamentoSchema = z.object({
 	id: z.number(),
@@ -17,7 +17,7 @@ export type CreateTreinamentoSchema = z.infer<typeof createTreinamentoSchema>;
 export type GetTreinamentoSchema = z.infer<typeof getTreinamentoSchema>;
 
 export async function getTreinamentos() {
-	const data = await apiFetch("/api/treinamentos/");
+	const data = await apiFetchAll("/api/treinamentos/");
 
 	return getTreinamentoSchema.array().parse(data);
 }
@@ -1,8 +1,8 @@
 import { z } from "zod";
 import { formatDate } from "@/utils/format-date";
-import { apiFetch } from "./client";
+import { apiFetch, apiFetchAll } from "./client";
 
-const getRecursoTurmaSchema = z.object({
+export const getRecursoTurmaSchema = z.object({
 	id: z.number(),
 	turma: z.number(),
 	turma_nome: z.string(),
@@ -18,7 +18,7 @@ const getRecursoTurmaSchema = z.object({
 
 export type GetRecursoTurmaSchema = z.infer<typeof getRecursoTurmaSchema>;
 
-const getTurmaSchema = z.object({
+export const getTurmaSchema = z.object({
 	id: z.number(),
 	treinamento: z.number(),
 	treinamento_nome: z.string(),
@@ -42,7 +42,7 @@ export type CreateTurmaSchema = z.infer<typeof createTurmaSchema>;
 export type GetTurmaSchema = z.infer<typeof getTurmaSchema>;
 
 export async function getTurmas() {
-	const data = await apiFetch("/api/turmas/");
+	const data = await apiFetchAll("/api/turmas/");
 
 	return getTurmaSchema.array().parse(data);
 }
@@ -90,7 +90,7 @@ export async function updateTurma(
 }
 
 export async function getRecursoTurma(turmaId: number) {
-	const data = await apiFetch(`/api/turmas/${turmaId}/recursos/`);
+	const data = await apiFetchAll(`/api/turmas/${turmaId}/recursos/`);
 
 	return getRecursoTurmaSchema.array().parse(data);
 }
@@ -3,7 +3,7 @@ import { createFileRoute, useNavigate } from "@tanstack/react-router";
 import { addDays, isAfter, isWithinInterval, parse } from "date-fns";
 import { ptBR } from "date-fns/locale";
 import { Calendar, ExternalLink, GraduationCap, LogOut } from "lucide-react";
-import { getTurmas } from "@/api/turmas";
+import { getDashboard } from "@/api/dashboard";
 import { Badge } from "@/components/ui/badge";
 import { Button } from "@/components/ui/button";
 import {
@@ -23,9 +23,9 @@ interface StudentClass {
 	endDate: string | null;
 }
 
-const turmaQueryOptions = queryOptions({
-	queryKey: ["studentClasses"],
-	queryFn: getTurmas,
+const dashboardQueryOptions = queryOptions({
+	queryKey: ["studentDashboard"],
+	queryFn: getDashboard,
 });
 
 export const Route = createFileRoute("/student/dashboard/")({
@@ -33,16 +33,27 @@ export const Route = createFileRoute("/student/dashboard/")({
 	loader: async ({ context }) => {
 		const { queryClient } = context;
 
-		await queryClient.ensureQueryData(turmaQueryOptions);
+		const { turmas, recursos } =
+			await queryClient.ensureQueryData(dashboardQueryOptions);
+
+		// Turmas e recursos já vêm no painel: a página da turma
+		// (`/student/turma/$id`) abre sem novas requisições
+		for (const turma of turmas) {
+			queryClient.setQueryData(["turmaById", turma.id], turma);
+			queryClient.setQueryData(
+				["recursoTurma", turma.id],
+				recursos.filter((recurso) => recurso.turma === turma.id),
+			);
+		}
 	},
 });
 
 function RouteComponent() {
-	const { data } = useSuspenseQuery(turmaQueryOptions);
+	const { data } = useSuspenseQuery(dashboardQueryOptions);
 
 	const navigate = useNavigate();
 
-	const studentClasses: StudentClass[] = data.map((turma) => {
+	const studentClasses: StudentClass[] = data.turmas.map((turma) => {
 		const initialDate = parse(turma.data_inicio, "dd/MM/yyyy", new Date(), {
 			locale: ptBR,
 		});